@@ -0,0 +1,283 @@
+"""
+Benchmark suite for generation, loading and query hot paths.
+
+Runs offline against stub Airflow modules and reports the best wall time
+and the peak traced memory of each case, plus the memory still held by
+what the case returns (a loaded config, a variable store). The import/*
+cases time a fresh interpreter (startup included) executing one generated
+config.
+
+Usage:
+    python run_benchmarks.py                  # full suite
+    python run_benchmarks.py --quick          # skip the 100k-variable cases
+    python run_benchmarks.py --only load      # run cases whose name contains "load"
+    python run_benchmarks.py --json out.json  # also save results for comparison
+"""
+import os
+import sys
+import gc
+import json
+import time
+import types
+import shutil
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+sys.path.insert(0, SRC_DIR)
+
+
+def install_airflow_stub():
+    """Register minimal airflow modules so generated configs import offline"""
+    airflow = types.ModuleType("airflow")
+    models = types.ModuleType("airflow.models")
+
+    class Variable:
+        @staticmethod
+        def get(key, default_var=None):
+            return default_var
+
+    models.Variable = Variable
+    airflow.models = models
+    sys.modules["airflow"] = airflow
+    sys.modules["airflow.models"] = models
+
+
+install_airflow_stub()
+
+from airflow_config import AirflowConfig, TemplateGenerator, diff_directories, generate_configs  # noqa: E402
+from airflow_config.index import IndexedVariables  # noqa: E402
+from airflow_config.sections import split_sections  # noqa: E402
+
+VARIABLE_COUNTS = [10, 1_000, 100_000]
+SECTION_COUNTS = [1, 100, 1_000]
+PIPELINE_COUNTS = [100]
+DIFF_FILE_COUNTS = [200]
+IMPORT_SECTIONS = 10
+
+# Header every generated config had before imports were derived from the rendered variables
+LEGACY_HEADER = '''"""
+Airflow Configuration
+Auto-generated configuration file
+"""
+
+import os
+import logging
+import json
+from airflow.models import Variable
+
+logger = logging.getLogger("airflow.task")
+
+'''
+
+# Executes a config in a fresh interpreter with only a stub airflow.models, as a DAG file import would
+IMPORT_SCRIPT = (
+    "import sys, types\n"
+    "models = types.ModuleType('airflow.models')\n"
+    "models.Variable = type('Variable', (), {'get': staticmethod(lambda key, default_var=None: default_var)})\n"
+    "sys.modules['airflow'] = types.ModuleType('airflow')\n"
+    "sys.modules['airflow.models'] = models\n"
+    "with open(sys.argv[1]) as f:\n"
+    "    exec(compile(f.read(), sys.argv[1], 'exec'), {'__name__': 'config'})\n"
+)
+VARIABLES_PER_SECTION = 10
+
+
+def write_synthetic_config(path, n_variables):
+    """Write a config with n_variables Variable.get lines in sections of 10"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("from airflow.models import Variable\n")
+        for i in range(n_variables):
+            section, k = divmod(i, VARIABLES_PER_SECTION)
+            if k == 0:
+                f.write(f"\n# SECTION: SEC{section} (SYNTHETIC)\n")
+            if k == 1:
+                f.write(f'SEC{section}_VAR{k} = int(Variable.get("sec{section}_var{k}", default_var="{k}"))\n')
+            else:
+                f.write(f'SEC{section}_VAR{k} = Variable.get("sec{section}_var{k}", default_var="value{k}")\n')
+
+
+def synthetic_sections(n_sections):
+    """Section name -> template type, cycling through every template"""
+    templates = TemplateGenerator().get_available_templates()
+    return {f"section{i}": templates[i % len(templates)] for i in range(n_sections)}
+
+
+def measure(func, repeat):
+    """Return (best seconds, peak traced bytes, traced bytes still held by the result) of calling func"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return min(timings), peak, retained
+
+
+def build_cases(work_dir, variable_counts, section_counts):
+    """Yield (name, size, setup) for every case; setup() prepares and returns the timed callable"""
+    generator = TemplateGenerator()
+    for n_sections in section_counts:
+        def setup(n_sections=n_sections):
+            sections = synthetic_sections(n_sections)
+            output = os.path.join(work_dir, f"generated_{n_sections}.py")
+            return lambda: generator.create_config(sections, output)
+        yield "generate/create_config", f"{n_sections} sections", setup
+
+    for n_pipelines in PIPELINE_COUNTS:
+        def setup(n_pipelines=n_pipelines):
+            manifest = {f"pipeline_{i}": synthetic_sections(2) for i in range(n_pipelines)}
+            output_dir = os.path.join(work_dir, f"pipelines_{n_pipelines}")
+            return lambda: generate_configs(manifest, output_dir, template_generator=generator)
+        yield "generate/generate_configs", f"{n_pipelines} pipelines", setup
+
+    for n_files in DIFF_FILE_COUNTS:
+        def setup(n_files=n_files):
+            old_dir = os.path.join(work_dir, f"diff_old_{n_files}")
+            new_dir = os.path.join(work_dir, f"diff_new_{n_files}")
+            generate_configs({f"pipeline_{i}": synthetic_sections(10) for i in range(n_files)}, old_dir,
+                             template_generator=generator)
+            shutil.copytree(old_dir, new_dir)
+            generator.create_config({"section0": "redis"}, os.path.join(new_dir, "pipeline_0.py"), incremental=True)
+            return lambda: diff_directories(old_dir, new_dir)
+        yield "diff/diff_directories", f"{n_files} files", setup
+
+    yield from import_cases(work_dir, generator)
+
+    for n_variables in variable_counts:
+        yield from variable_cases(work_dir, n_variables)
+
+
+def import_cases(work_dir, generator):
+    """Cold import of one generated config with the legacy and the slim header"""
+    slim = os.path.join(work_dir, "import_slim.py")
+    legacy = os.path.join(work_dir, "import_legacy.py")
+
+    def import_module(path):
+        def setup():
+            if not os.path.exists(slim):
+                generator.create_config(synthetic_sections(IMPORT_SECTIONS), slim)
+                with open(slim, encoding="utf-8") as f:
+                    _, sections = split_sections(f.read())
+                with open(legacy, "w", encoding="utf-8") as f:
+                    f.write(LEGACY_HEADER + "".join(section.text for section in sections.values()))
+            command = [sys.executable, "-S", "-c", IMPORT_SCRIPT, path]
+            return lambda: subprocess.run(command, check=True)
+        return setup
+
+    size = f"{IMPORT_SECTIONS} sections"
+    yield "import/config (legacy header)", size, import_module(legacy)
+    yield "import/config (slim header)", size, import_module(slim)
+
+    def import_package(statement):
+        def setup():
+            env = dict(os.environ, PYTHONPATH=SRC_DIR)
+            command = [sys.executable, "-S", "-c", statement]
+            return lambda: subprocess.run(command, check=True, env=env)
+        return setup
+
+    yield "import/airflow_config package", "cold", import_package("import airflow_config")
+    yield "import/all submodules", "cold", import_package(
+        "import airflow_config.core, airflow_config.bulk, airflow_config.registry")
+
+
+def variable_cases(work_dir, n_variables):
+    """Loading and query cases over a synthetic config of n_variables"""
+    path = os.path.join(work_dir, f"synthetic_{n_variables}.py")
+    size = f"{n_variables} vars"
+    section = f"sec{n_variables // VARIABLES_PER_SECTION // 2}"
+
+    def ensure_file():
+        if not os.path.exists(path):
+            write_synthetic_config(path, n_variables)
+
+    def load_exec():
+        ensure_file()
+        return lambda: AirflowConfig(path)
+
+    def load_static():
+        ensure_file()
+        return lambda: AirflowConfig(path, static=True, snapshot=False)
+
+    def load_snapshot_hit():
+        ensure_file()
+        AirflowConfig(path, static=True)
+        return lambda: AirflowConfig(path, static=True)
+
+    def variable_store():
+        names = [f"SEC{i // VARIABLES_PER_SECTION}_VAR{i % VARIABLES_PER_SECTION}" for i in range(n_variables)]
+        values = dict.fromkeys(names, "value")
+        # The peak column is the memory of the store itself: the names and values already exist
+        return lambda: IndexedVariables(values)
+
+    def query(method, *args, warm=True):
+        def setup():
+            ensure_file()
+            config = AirflowConfig(path, static=True, snapshot=False)
+            if warm:
+                getattr(config, method)(*args)
+                return lambda: getattr(config, method)(*args)
+            # Drop the section tallies on every call, so the timing includes building them
+            return lambda: (config.variables.tallies.clear(), getattr(config, method)(*args))
+        return setup
+
+    yield "load/exec", size, load_exec
+    yield "load/static", size, load_static
+    yield "load/static (snapshot hit)", size, load_snapshot_hit
+    yield "memory/variable store", size, variable_store
+    yield "query/get_connection_params", size, query("get_connection_params", section)
+    yield "query/validate_section", size, query("validate_section", section)
+    yield "query/get_config_summary", size, query("get_config_summary")
+    yield "query/get_config_summary (first)", size, query("get_config_summary", warm=False)
+
+
+def format_bytes(n):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TiB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="skip the 100k-variable cases")
+    parser.add_argument("--only", default="", help="run only cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions per case")
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    variable_counts = [n for n in VARIABLE_COUNTS if not (args.quick and n >= 100_000)]
+    results = []
+
+    print(f"{'case':<32} {'size':<16} {'best time':>12} {'peak memory':>14} {'retained':>12}")
+    print("-" * 90)
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name, size, setup in build_cases(work_dir, variable_counts, SECTION_COUNTS):
+            if args.only not in name:
+                continue
+            func = setup()
+            repeat = 1 if "100000" in size else args.repeat
+            seconds, peak, retained = measure(func, repeat)
+            results.append({"case": name, "size": size, "seconds": seconds, "peak_bytes": peak,
+                            "retained_bytes": retained})
+            print(f"{name:<32} {size:<16} {seconds * 1000:>10.3f}ms {format_bytes(peak):>14} "
+                  f"{format_bytes(retained):>12}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
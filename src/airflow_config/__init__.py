@@ -2,22 +2,63 @@
 airflow-config - Configuration management for Apache Airflow
 """
 
-from .core import AirflowConfig
-from .utils import TemplateGenerator
-from .scaffold import create_project_structure
+from importlib import import_module
+
 from .exceptions import (
     AirflowConfigError, ConfigFileError, VariableNotFoundError,
     TemplateGenerationError, TemplateNotFoundError,
     VariableTypeError, FileWriteError, ConfigurationError
 )
 
+# typing cuesta más que el resto del paquete; los type checkers reconocen este nombre igualmente
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .core import AirflowConfig
+    from .registry import ConfigRegistry
+    from .watch import ConfigWatcher
+    from .bulk import generate_configs, load_configs
+    from .diff import diff_directories, diff_files
+    from .schema import validate_configs
+    from .utils import TemplateGenerator
+    from .scaffold import create_project_structure
+
 __version__ = "1.0.0"
 __author__ = "farley"
 __email__ = "farleyberruecosg@gmail.com"
 
+# Nombres públicos que se importan en el primer acceso (PEP 562): importar el
+# paquete desde un DAG o un archivo generado no carga core, utils ni bulk
+_LAZY_IMPORTS = {
+    'AirflowConfig': '.core',
+    'ConfigRegistry': '.registry',
+    'ConfigWatcher': '.watch',
+    'generate_configs': '.bulk',
+    'load_configs': '.bulk',
+    'diff_files': '.diff',
+    'diff_directories': '.diff',
+    'validate_configs': '.schema',
+    'TemplateGenerator': '.utils',
+    'create_project_structure': '.scaffold',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 # Factory function para crear un pipeline ETL
 def create_etl_pipeline(source: str, destination: str, config_file: str = "config.py"):
     """Factory function para crear pipeline ETL"""
+    from .core import AirflowConfig
+
     config = AirflowConfig(config_file)
     config.create_etl_pipeline(source, destination)
     return config
@@ -25,13 +66,22 @@ def create_etl_pipeline(source: str, destination: str, config_file: str = "confi
 # Otra función de fachada para obtener plantillas disponibles
 def get_available_templates():
     """Obtener la lista de plantillas disponibles"""
+    from .utils import TemplateGenerator
+
     return TemplateGenerator().get_available_templates()
 
 # Definir __all__ para controlar las importaciones con *
 __all__ = [
     'AirflowConfig',
+    'ConfigRegistry',
+    'ConfigWatcher',
     'TemplateGenerator',
     'create_etl_pipeline',
+    'load_configs',
+    'generate_configs',
+    'diff_files',
+    'diff_directories',
+    'validate_configs',
     'create_project_structure',
     'get_available_templates',
     'AirflowConfigError',
@@ -0,0 +1,206 @@
+"""
+Concurrent loading of many configuration files
+"""
+
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from .core import AirflowConfig
+from .exceptions import ConfigFileError, ConfigurationError
+from .snapshot import content_digest, snapshot_cache
+from .sections import section_templates
+from .static import decode_config_source, parse_config_source, read_config_bytes
+from .utils import TemplateGenerator
+
+logger = logging.getLogger(__name__)
+
+# Below this many files a process pool costs more to start than it saves
+PROCESS_POOL_MIN_FILES = 16
+
+
+class BulkLoadResult(NamedTuple):
+    """Outcome of load_configs"""
+
+    configs: Dict[str, AirflowConfig]
+    errors: Dict[str, Exception]
+
+
+class GeneratedFile(NamedTuple):
+    """One file written by generate_configs"""
+
+    path: str
+    bytes: int
+    seconds: float
+    written: bool
+
+
+class BulkGenerateResult(NamedTuple):
+    """Outcome of generate_configs"""
+
+    files: Dict[str, GeneratedFile]
+    errors: Dict[str, Exception]
+    seconds: float
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(generated.bytes for generated in self.files.values())
+
+
+def load_configs(paths: Iterable[str], static: bool = False, snapshot: Optional[bool] = None,
+                 max_workers: Optional[int] = None, use_processes: Optional[bool] = None,
+                 template_generator: Optional[TemplateGenerator] = None) -> BulkLoadResult:
+    """
+    Load many configuration files concurrently.
+
+    Executed loads run in a thread pool, since their cost is file I/O and
+    ``Variable.get`` round trips. Static loads are CPU-bound AST parsing and
+    run in a process pool once there are enough files to amortize it; files
+    with a valid snapshot are served from it without reaching the pool.
+
+    Args:
+        paths: Config files to load.
+        static: Parse files statically instead of executing them.
+        snapshot: Snapshot option, as in AirflowConfig.
+        max_workers: Pool size. Defaults to the executor's own default.
+        use_processes: Force (True) or forbid (False) the process pool for static loads.
+        template_generator: Generator shared by every loaded AirflowConfig.
+
+    Returns:
+        BulkLoadResult with path -> AirflowConfig for the files that loaded and
+        path -> exception for those that failed. A failure never aborts the batch.
+    """
+    paths = list(dict.fromkeys(paths))
+    template_generator = template_generator or TemplateGenerator()
+    configs: Dict[str, AirflowConfig] = {}
+    errors: Dict[str, Exception] = {}
+
+    for path in paths:
+        if not os.path.exists(path):
+            errors[path] = ConfigFileError(f"Config file '{path}' does not exist")
+    pending = [path for path in paths if path not in errors]
+
+    if static:
+        use_snapshot = True if snapshot is None else snapshot
+        if use_snapshot:
+            for path in list(pending):
+                cached = snapshot_cache.load_with_sections(path, "static")
+                if cached is not None:
+                    configs[path] = AirflowConfig.from_variables(path, cached[0], template_generator,
+                                                                 static=True, sections=cached[1])
+                    pending.remove(path)
+
+        if use_processes is None:
+            use_processes = len(pending) >= PROCESS_POOL_MIN_FILES
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+        with executor_class(max_workers=max_workers) as executor:
+            futures = {executor.submit(_parse_static, path): path for path in pending}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    variables, sections, digest = future.result()
+                except Exception as e:
+                    errors[path] = e
+                    continue
+                if use_snapshot:
+                    snapshot_cache.store(path, "static", variables, sections, digest)
+                configs[path] = AirflowConfig.from_variables(path, variables, template_generator,
+                                                             static=True, sections=sections)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(AirflowConfig, path, template_generator, snapshot=snapshot): path
+                for path in pending
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    configs[path] = future.result()
+                except Exception as e:
+                    errors[path] = e
+
+    for path, error in errors.items():
+        logger.warning(f"⚠️  Could not load '{path}': {error}")
+
+    # Keep the caller's order
+    ordered = {path: configs[path] for path in paths if path in configs}
+    return BulkLoadResult(ordered, {path: errors[path] for path in paths if path in errors})
+
+
+def _parse_static(path: str) -> Tuple[Dict[str, Any], Dict[str, str], str]:
+    """
+    Worker: parse one file statically (top-level so process pools can pickle it).
+
+    Returns the variables, the sections and the content_digest of the bytes parsed.
+    """
+    data = read_config_bytes(path)
+    source = decode_config_source(data, path)
+    variables = {name: spec.value for name, spec in parse_config_source(source, path).items()}
+    return variables, section_templates(source), content_digest(data)
+
+
+def generate_configs(manifest: Dict[str, Dict[str, str]], output_dir: str = ".",
+                     max_workers: Optional[int] = None, incremental: bool = False,
+                     template_generator: Optional[TemplateGenerator] = None) -> BulkGenerateResult:
+    """
+    Generate the config files of many pipelines concurrently.
+
+    Each pipeline is written to ``<output_dir>/<name>.py`` with
+    TemplateGenerator.create_config. Unlike AirflowConfig.create_data_pipeline
+    the files are not loaded back after writing, and one template generator
+    (with its compiled templates) is shared by every file.
+
+    Args:
+        manifest: Pipeline name -> sections (section name -> template type).
+        output_dir: Directory the files are written to; created if missing.
+        max_workers: Thread pool size. Defaults to the executor's own default.
+        incremental: Update existing files section by section, as in create_config.
+        template_generator: Generator used for every file.
+
+    Returns:
+        BulkGenerateResult with pipeline name -> GeneratedFile for the files
+        that were generated, pipeline name -> exception for those that failed,
+        and the wall time of the whole batch. A failure never aborts the batch.
+    """
+    template_generator = template_generator or TemplateGenerator()
+    files: Dict[str, GeneratedFile] = {}
+    errors: Dict[str, Exception] = {}
+    start = time.perf_counter()
+
+    pending = {}
+    for name in manifest:
+        if not name or os.path.basename(name) != name or name in (".", ".."):
+            errors[name] = ConfigurationError(f"Invalid pipeline name '{name}'")
+            continue
+        filename = name if name.endswith(".py") else f"{name}.py"
+        pending[name] = os.path.join(output_dir, filename)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_generate_file, template_generator, manifest[name], path, incremental): name
+            for name, path in pending.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                files[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+
+    for name, error in errors.items():
+        logger.warning(f"⚠️  Could not generate '{name}': {error}")
+
+    ordered = {name: files[name] for name in manifest if name in files}
+    return BulkGenerateResult(ordered, {name: errors[name] for name in manifest if name in errors},
+                              time.perf_counter() - start)
+
+
+def _generate_file(template_generator: TemplateGenerator, sections: Dict[str, str],
+                   path: str, incremental: bool) -> GeneratedFile:
+    """Worker: write one pipeline file and measure it"""
+    start = time.perf_counter()
+    written = template_generator.create_config(sections, path, incremental=incremental)
+    return GeneratedFile(path, os.path.getsize(path), time.perf_counter() - start, written)
@@ -0,0 +1,154 @@
+"""
+Process-wide TTL cache for Airflow Variable lookups
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .exceptions import ConfigurationError
+
+DEFAULT_TTL = float(os.environ.get("AIRFLOW_CONFIG_CACHE_TTL", 300))
+DEFAULT_MAXSIZE = int(os.environ.get("AIRFLOW_CONFIG_CACHE_MAXSIZE", 1024))
+
+
+class VariableCache:
+    """
+    LRU cache of raw Airflow Variable values with a time-to-live.
+
+    Missing variables are cached as ``None`` so repeated lookups of unset keys
+    do not hit the metadata database either; the caller's default is applied
+    on the way out, never stored.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid. 0 disables caching.
+            maxsize: Maximum number of entries before least recently used ones are evicted.
+            clock: Time source, injectable for tests.
+        """
+        self._entries: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.configure(ttl, maxsize)
+
+    def configure(self, ttl: Optional[float] = None, maxsize: Optional[int] = None) -> None:
+        """Change TTL and/or max size; existing entries are trimmed to the new size."""
+        if ttl is not None:
+            if ttl < 0:
+                raise ConfigurationError(f"Cache TTL must be >= 0, got {ttl}")
+            self.ttl = ttl
+        if maxsize is not None:
+            if maxsize < 1:
+                raise ConfigurationError(f"Cache maxsize must be >= 1, got {maxsize}")
+            self.maxsize = maxsize
+            with self._lock:
+                self._evict()
+
+    def get(self, key: str, default_var: Any = None) -> Any:
+        """Drop-in replacement for ``Variable.get`` that goes through the cache."""
+        found, missing = self.get_many([key])
+        if missing:
+            value = self._fetch(key)
+            self.set(key, value)
+        else:
+            value = found[key]
+        return default_var if value is None else value
+
+    def get_many(self, keys: Iterable[str]) -> Tuple[Dict[str, Optional[str]], List[str]]:
+        """
+        Look up several keys at once.
+
+        Returns:
+            Tuple of (cached key -> raw value, keys that must be fetched).
+        """
+        found = {}
+        missing = []
+        now = self._clock()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    found[key] = entry[0]
+                    self.hits += 1
+                else:
+                    if entry is not None:
+                        del self._entries[key]
+                    missing.append(key)
+                    self.misses += 1
+        return found, missing
+
+    def set(self, key: str, value: Optional[str]) -> None:
+        """Store a raw value (``None`` meaning the variable does not exist)."""
+        self.set_many({key: value})
+
+    def set_many(self, values: Dict[str, Optional[str]]) -> None:
+        """Store several raw values at once."""
+        if not self.ttl:
+            return
+        expires_at = self._clock() + self.ttl
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            self._evict()
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Forget one key, or every key when none is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every entry and reset the counters."""
+        self.invalidate()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+        }
+
+    def _evict(self) -> None:
+        """Drop least recently used entries above maxsize (lock must be held)."""
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _fetch(self, key: str) -> Optional[str]:
+        """Read a single variable from Airflow."""
+        from airflow.models import Variable
+
+        return Variable.get(key, default_var=None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"VariableCache(ttl={self.ttl}, maxsize={self.maxsize}, size={len(self._entries)})"
+
+
+# Shared by every generated config module imported in this process
+variable_cache = VariableCache()
+
+
+def configure_cache(ttl: Optional[float] = None, maxsize: Optional[int] = None) -> VariableCache:
+    """Configure the process-wide variable cache and return it."""
+    variable_cache.configure(ttl, maxsize)
+    return variable_cache
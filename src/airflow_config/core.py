@@ -3,83 +3,258 @@ Main AirflowConfig class - Configuration Management
 """
 
 import os
-import importlib.util
 import sys
-from typing import Any, Dict, List, Optional
+import types
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 from pathlib import Path
 
+from .diff import ConfigDiff, diff_variables
 from .exceptions import ConfigFileError, VariableNotFoundError
+from .freeze import Resolver, parse_frozen_json, resolve_specs, split_frozen_json, write_frozen
+from .index import IndexedVariables
+from .query import AirflowConfigQueryMixin
+from .sections import section_templates, split_sections
+from .snapshot import content_digest, snapshot_cache
+from .static import decode_config_source, parse_config_source, read_config_bytes
 from .utils import TemplateGenerator
+from .watch import ConfigChange, ConfigWatcher
 
+if TYPE_CHECKING:
+    from .schema import ValidationResult
 
-class AirflowConfig:
+
+class AirflowConfig(AirflowConfigQueryMixin):
     """
     Main configuration manager for Airflow variables.
     Handles configuration lifecycle: creation, loading, validation, and access.
     """
 
-    def __init__(self, config_file: str = "config.py", template_generator: Optional[TemplateGenerator] = None):
+    def __init__(self, config_file: str = "config.py", template_generator: Optional[TemplateGenerator] = None,
+                 static: bool = False, snapshot: Optional[bool] = None):
         """
         Initialize configuration manager.
 
         Args:
             config_file: Path to the Python configuration file.
             template_generator: Instance of TemplateGenerator. If not provided, a new one is created.
+            static: Read the file with ``ast`` instead of executing it. Variables take
+                their default values and neither Airflow nor the metadata DB is touched.
+            snapshot: Reuse an on-disk snapshot of the parsed variables while the file
+                content is unchanged. Defaults to on for static loads only, since
+                executed files read Airflow Variables that may change between loads.
+        """
+        self._init_state(config_file, template_generator, static, snapshot)
+        self._load_existing_config()
+
+    @classmethod
+    def from_variables(cls, config_file: str, variables: Dict[str, Any],
+                       template_generator: Optional[TemplateGenerator] = None,
+                       static: bool = False, sections: Optional[Dict[str, str]] = None) -> "AirflowConfig":
+        """
+        Build a configuration from variables that were already parsed, without reading the file.
+
+        Args:
+            config_file: Path of the configuration file the variables come from.
+            variables: Parsed variables.
+            template_generator: Instance of TemplateGenerator. If not provided, a new one is created.
+            static: Whether the variables were parsed statically.
+            sections: Section name -> template type of the file, if known.
         """
+        config = cls.__new__(cls)
+        config._init_state(config_file, template_generator, static, None)
+        config.variables.update(variables)
+        config.sections = sections
+        return config
+
+    def _init_state(self, config_file: str, template_generator: Optional[TemplateGenerator],
+                    static: bool, snapshot: Optional[bool]) -> None:
+        """Set instance attributes shared by every constructor."""
         self.config_file = config_file
-        self.variables: Dict[str, Any] = {}
+        self.static = static
+        self.snapshot = static if snapshot is None else snapshot
+        self.variables: Dict[str, Any] = IndexedVariables()
+        # Section name -> template type, from the markers of the file as loaded
+        self.sections: Optional[Dict[str, str]] = None
         self._template_generator = template_generator or TemplateGenerator()
-        self._load_existing_config()
 
     def _load_existing_config(self) -> None:
         """Load existing configuration from file if it exists."""
         if os.path.exists(self.config_file):
-            self._parse_config_file()
+            mode = "static" if self.static else "exec"
+            # The file is read once: the snapshot is looked up and stored under the
+            # hash of the very bytes that are parsed, even if the file is replaced meanwhile
+            data = read_config_bytes(self.config_file)
+            digest = content_digest(data) if self.snapshot else None
+            if self.snapshot:
+                cached = snapshot_cache.load_with_sections(self.config_file, mode, digest)
+                if cached is not None:
+                    self.variables.update(cached[0])
+                    self.sections = cached[1]
+                    return
+
+            self._parse_config_file(decode_config_source(data, self.config_file))
+            if self.snapshot:
+                snapshot_cache.store(self.config_file, mode, self.variables, self.sections, digest)
+
+    def _parse_config_file(self, source: str) -> None:
+        """Parse the content read from the configuration file safely."""
+        if self.config_file.endswith(".json"):
+            variables, self.sections = split_frozen_json(source, self.config_file)
+            self.variables.update(variables)
+            return
 
-    def _parse_config_file(self) -> None:
-        """Parse configuration file safely."""
+        self.sections = section_templates(source)
         try:
-            # Load module safely using importlib
-            spec = importlib.util.spec_from_file_location("airflow_config_module", self.config_file)
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)
-                sys.modules["airflow_config_module"] = module
-                spec.loader.exec_module(module)
-                
-                # Extract configuration variables
-                for key, value in module.__dict__.items():
-                    if key.isupper() and not key.startswith('_'):
-                        self.variables[key] = value
-            else:
-                 raise ConfigFileError(f"Could not load config file '{self.config_file}'")
+            self.variables.update(self._parse_source(source))
+        except ConfigFileError:
+            raise
+        except Exception as e:
+            raise ConfigFileError(f"Error parsing config file '{self.config_file}': {e}")
 
+    def _parse_source(self, source: str) -> Dict[str, Any]:
+        """
+        Parse configuration source that was already read, such as some sections of the file.
+
+        Uses the same mode as loading the file: JSON for frozen ``.json``
+        configs, the AST parser when static, otherwise executing the source.
+        """
+        if self.config_file.endswith(".json"):
+            return parse_frozen_json(source, self.config_file)
+        if self.static:
+            return {name: spec.value for name, spec in parse_config_source(source, self.config_file).items()}
+
+        try:
+            module = types.ModuleType("airflow_config_module")
+            module.__file__ = self.config_file
+            sys.modules["airflow_config_module"] = module
+            exec(compile(source, self.config_file, "exec"), module.__dict__)
+            return _module_variables(module)
         except Exception as e:
             raise ConfigFileError(f"Error parsing config file '{self.config_file}': {e}")
 
-    def create_etl_pipeline(self, source: str, destination: str) -> None:
+    def watch(self, callback: Optional[Callable[[ConfigChange], Any]] = None, interval: float = 1.0,
+              use_inotify: Optional[bool] = None, start: bool = True) -> ConfigWatcher:
+        """
+        Keep the variables up to date while the file changes on disk.
+
+        Only the ``# SECTION:`` blocks whose text changed are parsed again,
+        and the new variables replace ``self.variables`` in one assignment.
+
+        Args:
+            callback: Called with a ConfigChange listing the changed keys after each reload.
+            interval: Seconds between polls when inotify is not used.
+            use_inotify: Use inotify instead of polling; defaults to whenever it is available.
+            start: Start the watch thread right away.
+
+        Returns:
+            The ConfigWatcher; call stop() on it, or use it as a context manager.
+        """
+        watcher = ConfigWatcher(self, interval=interval, use_inotify=use_inotify)
+        if callback is not None:
+            watcher.add_callback(callback)
+        return watcher.start() if start else watcher
+
+    def create_etl_pipeline(self, source: str, destination: str, incremental: bool = False) -> None:
         """
         Create ETL pipeline configuration.
 
         Args:
             source: Source database type.
             destination: Destination database type.
+            incremental: Only rewrite the sections that changed in an existing file.
         """
         sections = {"source": source, "destination": destination}
-        self._create_configuration(sections)
+        self._create_configuration(sections, incremental)
 
-    def create_data_pipeline(self, sections: Dict[str, str]) -> None:
+    def create_data_pipeline(self, sections: Dict[str, str], incremental: bool = False) -> None:
         """
         Create complex data pipeline configuration.
 
         Args:
             sections: Dictionary of section_name -> template_type.
+            incremental: Only rewrite the sections that changed in an existing file.
         """
-        self._create_configuration(sections)
+        self._create_configuration(sections, incremental)
 
-    def _create_configuration(self, sections: Dict[str, str]) -> None:
+    def _create_configuration(self, sections: Dict[str, str], incremental: bool = False) -> None:
         """Internal method to create configuration using template generator."""
-        self._template_generator.create_config(sections, self.config_file)
-        self._load_existing_config()  # Reload after creation
+        written = self._template_generator.create_config(sections, self.config_file, incremental=incremental)
+        if written:
+            self._load_existing_config()  # Reload after creation
+
+    def freeze(self, output_file: str, resolver: Optional[Resolver] = None,
+               output_format: Optional[str] = None) -> None:
+        """
+        Write a frozen copy of the configuration file.
+
+        The file is read statically, every variable is resolved once with a
+        single resolver call, and the values are written as constants (a .py
+        module keeping the ``# SECTION:`` markers) or as a compact JSON object.
+        Importing the frozen file needs neither Airflow nor the metadata DB.
+
+        Args:
+            output_file: Frozen file to write; a .json extension selects JSON.
+            resolver: Function mapping keys to raw values. Defaults to the
+                process-wide SecretResolver (``Variable.get`` per key).
+            output_format: "py" or "json", overriding the extension.
+        """
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except OSError as e:
+            raise ConfigFileError(f"Error reading config file '{self.config_file}': {e}")
+
+        preamble, sections = split_sections(content)
+        block_specs = [(None, parse_config_source(preamble, self.config_file))]
+        block_specs.extend(
+            (f"# SECTION: {section.name} ({section.template_type.upper()})",
+             parse_config_source(section.text, self.config_file))
+            for section in sections.values()
+        )
+
+        values = resolve_specs((spec for _, specs in block_specs for spec in specs.values()), resolver)
+        blocks = [(marker, {name: values[name] for name in specs}) for marker, specs in block_specs]
+        write_frozen(output_file, blocks, output_format)
+
+    def diff(self, other: "AirflowConfig") -> ConfigDiff:
+        """
+        Compare the loaded variables with another configuration.
+
+        Args:
+            other: Newer configuration, e.g. the repository copy of a deployed config.
+
+        Returns:
+            ConfigDiff with the variables added, removed and changed in other.
+            Use diff_files to compare files without loading them.
+        """
+        return diff_variables(self.variables, other.variables, self.config_file, other.config_file)
+
+    def validate(self, sections: Optional[Dict[str, str]] = None, raise_errors: bool = False) -> "ValidationResult":
+        """
+        Check the variables against the templates their sections were generated from.
+
+        Every template variable must exist with the type its template declares
+        (int, bool, json, secret...) and numeric values must be in range.
+
+        Args:
+            sections: Section name -> template type. Defaults to the ``# SECTION:``
+                markers of the file when it was loaded (or the section map of
+                a frozen JSON config).
+            raise_errors: Raise VariableTypeError instead of returning errors.
+
+        Returns:
+            ValidationResult with structured errors. Use validate_configs to
+            check many configs at once.
+
+        Raises:
+            ConfigFileError: If the file has no sections to validate against.
+        """
+        from .schema import default_schema
+
+        result = default_schema.validate(self, sections)
+        if raise_errors:
+            result.raise_for_errors()
+        return result
 
     def get_connection_params(self, section: str) -> Dict[str, Any]:
         """
@@ -91,15 +266,11 @@ class AirflowConfig:
         Returns:
             Dictionary of connection parameters (with section prefix removed and in lowercase).
         """
-        section_vars = {}
         prefix = f"{section.upper()}_"
-
-        for key, value in self.variables.items():
-            if key.startswith(prefix):
-                param_name = key.replace(prefix, "").lower()
-                section_vars[param_name] = value
-
-        return section_vars
+        return {
+            key[len(prefix):].lower(): self.variables[key]
+            for key in self._keys_with_prefix(prefix)
+        }
 
     def validate_section(self, section: str) -> bool:
         """
@@ -111,8 +282,10 @@ class AirflowConfig:
         Returns:
             True if section has at least one variable, False otherwise.
         """
-        section_vars = self.get_connection_params(section)
-        return len(section_vars) > 0
+        prefix = f"{section.upper()}_"
+        if isinstance(self.variables, IndexedVariables):
+            return self.variables.has_prefix(prefix)
+        return bool(self._keys_with_prefix(prefix))
 
     # Basic variable access methods
     def get_variable(self, key: str, default: Any = None) -> Any:
@@ -134,4 +307,11 @@ class AirflowConfig:
         return self._template_generator.get_available_templates()
 
     def __repr__(self) -> str:
-        return f"AirflowConfig(file='{self.config_file}', variables={len(self.variables)})"
\ No newline at end of file
+        return f"AirflowConfig(file='{self.config_file}', variables={len(self.variables)})"
+
+
+def _module_variables(module: types.ModuleType) -> Dict[str, Any]:
+    """Upper-case variables of an executed config module (dir() also lists lazily resolved ones)"""
+    names = list(module.__dict__)
+    names.extend(name for name in dir(module) if name not in module.__dict__)
+    return {key: getattr(module, key) for key in names if key.isupper() and not key.startswith('_')}
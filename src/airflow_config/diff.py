@@ -0,0 +1,283 @@
+"""
+Structural diffs between configurations and configuration files
+"""
+
+import os
+import glob
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from .exceptions import ConfigFileError
+from .freeze import parse_frozen_json
+from .sections import split_sections
+from .static import parse_config_source
+
+logger = logging.getLogger(__name__)
+
+# Files whose fingerprints are kept; the least recently used are dropped first
+FINGERPRINT_CACHE_SIZE = 1024
+
+
+class ConfigDiff(NamedTuple):
+    """
+    Variables that differ between an old and a new configuration.
+
+    Diffs of loaded configs hold variable values. Diffs of ``.py`` files hold
+    the VariableSpec of each side, so a new Airflow Variable key or type shows
+    up even when the default value is the same. Diffs involving a frozen
+    config hold values.
+    """
+
+    old_file: Optional[str]
+    new_file: Optional[str]
+    added: Dict[str, Any]
+    removed: Dict[str, Any]
+    changed: Dict[str, Tuple[Any, Any]]
+    sections: List[str]
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any variable was added, removed or changed."""
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def keys(self) -> List[str]:
+        """Every added, removed or changed variable name."""
+        return list(self.added) + list(self.removed) + list(self.changed)
+
+
+class BulkDiffResult(NamedTuple):
+    """Outcome of diff_many and diff_directories"""
+
+    diffs: Dict[str, ConfigDiff]
+    errors: Dict[str, Exception]
+
+    @property
+    def changed(self) -> Dict[str, ConfigDiff]:
+        """Diffs with at least one added, removed or changed variable."""
+        return {name: diff for name, diff in self.diffs.items() if diff.has_changes}
+
+
+class _Fingerprint(NamedTuple):
+    """SHA-1 of a file and of its preamble and ``# SECTION:`` blocks, valid for one stat signature"""
+
+    signature: Tuple[int, int, int]
+    digest: str
+    preamble: str
+    sections: Dict[str, str]
+
+
+def diff_variables(old: Mapping[str, Any], new: Mapping[str, Any],
+                   old_file: Optional[str] = None, new_file: Optional[str] = None,
+                   sections: Optional[List[str]] = None) -> ConfigDiff:
+    """
+    Compare two variable mappings.
+
+    Values are equal when they have the same type and compare equal, so
+    ``1`` and ``True`` or ``5432`` and ``"5432"`` are reported as changed.
+
+    Returns:
+        ConfigDiff in the order of the new mapping, then removed names.
+    """
+    added = {}
+    changed = {}
+    for key, value in new.items():
+        if key not in old:
+            added[key] = value
+        elif not same_value(old[key], value):
+            changed[key] = (old[key], value)
+    removed = {key: value for key, value in old.items() if key not in new}
+    return ConfigDiff(old_file, new_file, added, removed, changed, sections or [])
+
+
+def diff_files(old_file: str, new_file: str) -> ConfigDiff:
+    """
+    Compare two configuration files without executing them.
+
+    Each file is fingerprinted by hashing its preamble and every
+    ``# SECTION:`` block. Fingerprints are cached per file until its mtime,
+    size or inode change. Identical files are settled by their digests
+    alone. Otherwise only the blocks whose hashes differ are parsed and
+    compared. Frozen configs (``.json``, or ``.py`` without any Airflow
+    Variable key) are compared by value, and the other file then uses the
+    default value of each variable.
+
+    Args:
+        old_file: Baseline file, such as the deployed config.
+        new_file: File to compare with it, such as the config in the repository.
+
+    Returns:
+        ConfigDiff of the two files; ``sections`` lists the blocks that differed.
+    """
+    if old_file.endswith(".json") or new_file.endswith(".json"):
+        return diff_variables(_read_values(old_file, specs=False), _read_values(new_file, specs=False),
+                              old_file, new_file)
+
+    old_print = _fingerprint(old_file)
+    new_print = _fingerprint(new_file)
+    if old_print.digest == new_print.digest:
+        return ConfigDiff(old_file, new_file, {}, {}, {}, [])
+
+    names = list(old_print.sections)
+    names.extend(name for name in new_print.sections if name not in old_print.sections)
+    differing = [name for name in names
+                 if old_print.sections.get(name) != new_print.sections.get(name)]
+    preamble_differs = old_print.preamble != new_print.preamble
+
+    old_specs = _read_specs(old_file, differing, preamble_differs)
+    new_specs = _read_specs(new_file, differing, preamble_differs)
+    if _is_frozen(old_specs) or _is_frozen(new_specs):
+        # Every spec of a frozen module has key None, so specs would all differ
+        old_specs = {name: spec.value for name, spec in old_specs.items()}
+        new_specs = {name: spec.value for name, spec in new_specs.items()}
+    return diff_variables(old_specs, new_specs, old_file, new_file, differing)
+
+
+def diff_many(pairs: Mapping[str, Tuple[Optional[str], Optional[str]]],
+              max_workers: Optional[int] = None) -> BulkDiffResult:
+    """
+    Diff many pairs of files concurrently.
+
+    Hashing and file reads dominate when most files are unchanged, and both
+    release the GIL, so the pairs run in a thread pool.
+
+    Args:
+        pairs: Name -> (old file, new file). A None or missing side counts as an
+            empty config, so every variable of the other side is added or removed.
+        max_workers: Pool size. Defaults to the executor's own default.
+
+    Returns:
+        BulkDiffResult with name -> ConfigDiff and name -> exception for pairs
+        that could not be compared. A failure never aborts the batch.
+    """
+    diffs: Dict[str, ConfigDiff] = {}
+    errors: Dict[str, Exception] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_diff_pair, old, new): name for name, (old, new) in pairs.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                diffs[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+                logger.warning(f"⚠️  Could not diff '{name}': {e}")
+
+    # Keep the caller's order
+    return BulkDiffResult({name: diffs[name] for name in pairs if name in diffs},
+                          {name: errors[name] for name in pairs if name in errors})
+
+
+def diff_directories(old_dir: str, new_dir: str, pattern: str = "*.py",
+                     max_workers: Optional[int] = None) -> BulkDiffResult:
+    """
+    Diff every config file of two directories, matched by file name.
+
+    ``__init__.py`` files are skipped. Files present on one side only are
+    diffed against an empty config.
+
+    Returns:
+        BulkDiffResult keyed by file name, in sorted order.
+    """
+    for directory in (old_dir, new_dir):
+        if not os.path.isdir(directory):
+            raise ConfigFileError(f"Config directory '{directory}' does not exist")
+
+    names = set()
+    for directory in (old_dir, new_dir):
+        names.update(os.path.basename(path) for path in glob.glob(os.path.join(directory, pattern)))
+    names.discard("__init__.py")
+
+    pairs = {}
+    for name in sorted(names):
+        old_file = os.path.join(old_dir, name)
+        new_file = os.path.join(new_dir, name)
+        pairs[name] = (old_file if os.path.exists(old_file) else None,
+                       new_file if os.path.exists(new_file) else None)
+    return diff_many(pairs, max_workers=max_workers)
+
+
+def same_value(old: Any, new: Any) -> bool:
+    """Whether two variable values are the same, type included."""
+    return old is new or (type(old) is type(new) and old == new)
+
+
+def _diff_pair(old_file: Optional[str], new_file: Optional[str]) -> ConfigDiff:
+    if old_file is not None and new_file is not None:
+        return diff_files(old_file, new_file)
+    old = _read_values(old_file) if old_file is not None else {}
+    new = _read_values(new_file) if new_file is not None else {}
+    return diff_variables(old, new, old_file, new_file)
+
+
+_fingerprints: "OrderedDict[str, _Fingerprint]" = OrderedDict()
+_fingerprints_lock = threading.Lock()
+
+
+def _fingerprint(path: str) -> _Fingerprint:
+    """Fingerprint of a file, reusing the cached one while the file is unchanged"""
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(key)
+    except OSError as e:
+        raise ConfigFileError(f"Error reading config file '{path}': {e}")
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    with _fingerprints_lock:
+        cached = _fingerprints.get(key)
+        if cached is not None and cached.signature == signature:
+            _fingerprints.move_to_end(key)
+            return cached
+
+    content = _read(path)
+    preamble, sections = split_sections(content)
+    fingerprint = _Fingerprint(
+        signature,
+        _digest(content),
+        _digest(preamble),
+        {name: _digest(section.text) for name, section in sections.items()},
+    )
+    with _fingerprints_lock:
+        _fingerprints[key] = fingerprint
+        _fingerprints.move_to_end(key)
+        while len(_fingerprints) > FINGERPRINT_CACHE_SIZE:
+            _fingerprints.popitem(last=False)
+    return fingerprint
+
+
+def _read_specs(path: str, section_names: Iterable[str], preamble: bool) -> Dict[str, Any]:
+    """VariableSpecs defined by some sections of a file (and by its preamble)"""
+    content_preamble, sections = split_sections(_read(path))
+    source = content_preamble if preamble else ""
+    source += "".join(sections[name].text for name in section_names if name in sections)
+    return dict(parse_config_source(source, path)) if source else {}
+
+
+def _is_frozen(specs: Mapping[str, Any]) -> bool:
+    """Whether specs come from a frozen module: constants only, no Airflow Variable key"""
+    return bool(specs) and all(spec.key is None for spec in specs.values())
+
+
+def _read_values(path: str, specs: bool = True) -> Dict[str, Any]:
+    """Every variable of a file: frozen JSON values, or VariableSpecs (their defaults unless specs)"""
+    if path.endswith(".json"):
+        return parse_frozen_json(_read(path), path)
+    parsed = parse_config_source(_read(path), path)
+    if specs:
+        return dict(parsed)
+    return {name: spec.value for name, spec in parsed.items()}
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return f.read()
+    except OSError as e:
+        raise ConfigFileError(f"Error reading config file '{path}': {e}")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
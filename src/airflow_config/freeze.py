@@ -0,0 +1,161 @@
+"""
+Frozen configuration files: every variable resolved once and written as a constant
+"""
+
+import json
+import math
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .exceptions import ConfigFileError, ConfigurationError, FileWriteError
+from .runtime import convert_value
+from .sections import SECTION_MARKER
+from .static import VariableSpec
+from .writer import file_lock, write_chunks
+
+logger = logging.getLogger(__name__)
+
+FREEZE_FORMATS = ("py", "json")
+
+# Key of the section name -> template type map in JSON frozen configs (never a variable name)
+SECTIONS_KEY = "__sections__"
+
+# keys -> raw string values of the keys that exist, like load_variables or SecretResolver.resolve
+Resolver = Callable[[List[str]], Dict[str, str]]
+
+# A section marker (or None for variables outside any section) and its name -> value pairs
+FrozenBlock = Tuple[Optional[str], Dict[str, Any]]
+
+
+def default_resolver(keys: List[str]) -> Dict[str, str]:
+    """
+    Resolve keys through the process-wide SecretResolver.
+
+    Unless configured otherwise that means ``Variable.get`` per key, run
+    concurrently, so environment variables, Airflow's secrets backends and
+    the metadata DB are all consulted as they would be at parse time.
+    """
+    from .secrets import secret_resolver
+
+    return secret_resolver.resolve(keys)
+
+
+def resolve_specs(specs: Iterable[VariableSpec], resolver: Optional[Resolver] = None) -> Dict[str, Any]:
+    """
+    Resolve every variable with a single resolver call.
+
+    Args:
+        specs: Variables to resolve. Specs without a key are literals and keep their value.
+        resolver: Function mapping keys to raw values. Defaults to default_resolver.
+
+    Returns:
+        Dictionary of variable name -> final (converted) value.
+    """
+    specs = list(specs)
+    keys = list(dict.fromkeys(spec.key for spec in specs if spec.key is not None))
+    raw_values = (resolver or default_resolver)(keys) if keys else {}
+
+    values = {}
+    for spec in specs:
+        if spec.key is None:
+            values[spec.name] = spec.default
+            continue
+        raw_value = raw_values.get(spec.key, spec.default)
+        values[spec.name] = None if raw_value is None else convert_value(raw_value, spec.var_type)
+    return values
+
+
+def freeze_format(output_file: str, output_format: Optional[str] = None) -> str:
+    """Output format, taken from the file extension when not given."""
+    if output_format is None:
+        output_format = "json" if output_file.endswith(".json") else "py"
+    if output_format not in FREEZE_FORMATS:
+        raise ConfigurationError(f"Invalid freeze format '{output_format}', expected one of {FREEZE_FORMATS}")
+    return output_format
+
+
+def write_frozen(output_file: str, blocks: List[FrozenBlock], output_format: Optional[str] = None) -> None:
+    """
+    Write resolved variables as a constant-only module or a compact JSON object.
+
+    Neither form imports anything, so loading it in the scheduler does no
+    Airflow imports and no metadata-DB or secrets-backend round trips. JSON
+    has no room for ``# SECTION:`` markers, so the section -> template map is
+    kept under SECTIONS_KEY instead.
+    """
+    output_format = freeze_format(output_file, output_format)
+    if output_format == "json":
+        sections = {}
+        values = {}
+        for marker, block_values in blocks:
+            match = SECTION_MARKER.match(marker) if marker else None
+            if match:
+                sections[match.group("name")] = match.group("template").lower()
+            values.update(block_values)
+        if sections:
+            values = {SECTIONS_KEY: sections, **values}
+        chunks = [json.dumps(values, ensure_ascii=False, separators=(",", ":")), "\n"]
+    else:
+        chunks = _iter_frozen_module(blocks)
+
+    try:
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(output_file):
+            write_chunks(output_file, chunks)
+    except FileWriteError:
+        raise
+    except Exception as e:
+        raise FileWriteError(f"Error writing frozen config '{output_file}': {e}")
+    logger.info(f"✅ Frozen configuration file created: {output_file}")
+
+
+def load_frozen_json(config_file: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Read variables and the section -> template map from a config frozen as JSON."""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except OSError as e:
+        raise ConfigFileError(f"Error reading frozen config '{config_file}': {e}")
+    return split_frozen_json(content, config_file)
+
+
+def parse_frozen_json(content: str, config_file: str = "<config>") -> Dict[str, Any]:
+    """Variables of a config frozen as JSON, from its content."""
+    return split_frozen_json(content, config_file)[0]
+
+
+def split_frozen_json(content: str, config_file: str = "<config>") -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Variables and section -> template map (empty for older files) of a config frozen as JSON."""
+    try:
+        values = json.loads(content)
+    except ValueError as e:
+        raise ConfigFileError(f"Error reading frozen config '{config_file}': {e}")
+    if not isinstance(values, dict):
+        raise ConfigFileError(f"Frozen config '{config_file}' must contain a JSON object")
+    sections = values.pop(SECTIONS_KEY, None) or {}
+    if not isinstance(sections, dict):
+        raise ConfigFileError(f"'{SECTIONS_KEY}' of frozen config '{config_file}' must be a JSON object")
+    return values, sections
+
+
+def _iter_frozen_module(blocks: List[FrozenBlock]) -> Iterator[str]:
+    yield (
+        '"""\n'
+        'Airflow Configuration\n'
+        'Frozen configuration file: values were resolved when it was generated\n'
+        '"""\n'
+    )
+    for marker, values in blocks:
+        if not marker and not values:
+            continue
+        lines = [f"\n{marker}\n"] if marker else [""]
+        lines.extend(f"{name} = {_format_literal(value)}" for name, value in values.items())
+        yield "\n".join(lines) + "\n"
+
+
+def _format_literal(value: Any) -> str:
+    """Python literal for a resolved value"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return f"float({str(value)!r})"
+    return repr(value)
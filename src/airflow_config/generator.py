@@ -2,11 +2,14 @@
 Configuration file generator
 """
 
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterator, Tuple
 from pathlib import Path
 from datetime import timedelta
 
 from .exceptions import ConfigFileError
+from .index import DOC_PREFIX, IndexedVariables, SectionClassifier
+from .writer import file_lock, write_chunks
 
 class AirflowConfigGeneratorMixin:
     """Mixin with methods for generating configuration files"""
@@ -17,78 +20,80 @@ class AirflowConfigGeneratorMixin:
         
         try:
             Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_file, 'w', encoding='utf-8') as file:
-                self._write_header(file)
-                self._write_imports(file)
-                self._write_variables(file)
-                self._write_footer(file)
-                
+            with file_lock(output_file):
+                write_chunks(output_file, self._iter_file_content())
             print(f"✅ Configuration saved to: {output_file}")
                 
         except Exception as e:
             raise ConfigFileError(f"Error saving Airflow config file: {e}")
     
-    def _write_header(self, file) -> None:
-        """Write file header"""
-        file.write('"""\n')
-        file.write('Airflow Variables Configuration\n')
-        file.write('Generated by AirflowConfig\n')
-        file.write('"""\n\n')
-        
-        file.write('# flake8: noqa\n')
-        file.write('# type: ignore\n\n')
+    def _iter_file_content(self) -> Iterator[str]:
+        """Yield the file content in chunks, at most one section at a time"""
+        yield self._header()
+        yield self._imports()
+        yield from self._iter_variables()
+        yield self._footer()
+    
+    def _header(self) -> str:
+        """File header"""
+        return (
+            '"""\n'
+            'Airflow Variables Configuration\n'
+            'Generated by AirflowConfig\n'
+            '"""\n\n'
+            '# flake8: noqa\n'
+            '# type: ignore\n\n'
+        )
     
-    def _write_imports(self, file) -> None:
-        """Write necessary imports for Airflow"""
-        file.write('import os\n')
-        file.write('from datetime import timedelta\n')
-        file.write('from airflow.models import Variable\n')
-        file.write('\n')
-        file.write('from airflow import DAG\n')
-        file.write('from airflow.operators.python import PythonOperator\n')
-        file.write('from airflow.operators.bash import BashOperator\n')
-        file.write('\n')
+    def _imports(self) -> str:
+        """Imports used by the saved values and the footer helpers (no Airflow imports needed)"""
+        return (
+            'from datetime import timedelta\n'
+            'from typing import Any\n'
+            '\n'
+        )
     
-    def _write_variables(self, file) -> None:
-        """Write all variables with their default values"""
+    def _iter_variables(self) -> Iterator[str]:
+        """Yield every section's variables with their default values, one section per chunk"""
         sections = self._organize_variables_by_section()
         
         for section_name, section_vars in sections.items():
             if section_vars:
-                file.write(f'\n# {self._default_sections.get(section_name, section_name.upper())}\n')
-                file.write('#' + '=' * 50 + '\n')
+                lines = [
+                    f'\n# {self._default_sections.get(section_name, section_name.upper())}',
+                    '#' + '=' * 50,
+                ]
                 
                 for var_name, var_value in section_vars.items():
-                    if not var_name.startswith('__DOC_'):
-                        doc_key = f'__DOC_{var_name}'
-                        if doc_key in self.variables:
-                            file.write(f'# {self.variables[doc_key]}\n')
-                        
-                        formatted_value = self._format_value_for_py(var_value)
-                        file.write(f'{var_name} = {formatted_value}\n')
+                    doc = self._variable_doc(var_name)
+                    if doc is not None:
+                        lines.append(f'# {doc}')
+                    
+                    formatted_value = self._format_value_for_py(var_value)
+                    lines.append(f'{var_name} = {formatted_value}')
+                
+                yield '\n'.join(lines) + '\n'
     
     def _organize_variables_by_section(self) -> Dict[str, Dict[str, Any]]:
-        """Organize variables by sections"""
+        """Organize variables by sections (longest matching section prefix, case-insensitive)"""
         sections = {section: {} for section in self._default_sections.keys()}
         sections['custom'] = {}
         
+        classify = _section_classifier(tuple(self._default_sections)).classify
+        legacy_docs = not isinstance(self.variables, IndexedVariables)
         for var_name, var_value in self.variables.items():
-            if var_name.startswith('__DOC_'):
+            if legacy_docs and var_name.startswith(DOC_PREFIX):
                 continue
-                
-            section_found = False
-            for section in self._default_sections.keys():
-                if var_name.lower().startswith(section):
-                    sections[section][var_name] = var_value
-                    section_found = True
-                    break
-            
-            if not section_found:
-                sections['custom'][var_name] = var_value
+            sections[classify(var_name)][var_name] = var_value
         
         return sections
     
+    def _variable_doc(self, var_name: str) -> Optional[str]:
+        """Documentation of a variable, from the doc table or a plain dict's __DOC_<NAME> key"""
+        if isinstance(self.variables, IndexedVariables):
+            return self.variables.get_doc(var_name)
+        return self.variables.get(f'{DOC_PREFIX}{var_name}')
+    
     def _format_value_for_py(self, value: Any) -> str:
         """Format values for Python"""
         if value is None:
@@ -110,44 +115,49 @@ class AirflowConfigGeneratorMixin:
         else:
             return repr(value)
     
-    def _write_footer(self, file) -> None:
-        """Write file footer with utility functions"""
-        file.write('\n\n')
-        file.write('def get_dag_default_args() -> dict:\n')
-        file.write('    """Returns default arguments for DAGs"""\n')
-        file.write('    return {\n')
-        file.write("        'owner': AIRFLOW__DEFAULT__DAG_OWNER,\n")
-        file.write("        'retries': AIRFLOW__CORE__DEFAULT_RETRIES,\n")
-        file.write("        'retry_delay': timedelta(minutes=AIRFLOW__CORE__DEFAULT_RETRY_DELAY_MINUTES),\n")
-        file.write("        'email_on_failure': True,\n")
-        file.write("        'email_on_retry': False,\n")
-        file.write("        'email': AIRFLOW__EMAIL__DEFAULT_EMAIL\n")
-        file.write('    }\n')
-        
-        file.write('\n')
-        file.write('def get_database_config() -> dict:\n')
-        file.write('    """Returns database configuration"""\n')
-        file.write('    return {\n')
-        file.write("        'conn_id': AIRFLOW_DB_CONN_ID,\n")
-        file.write("        'host': AIRFLOW_DB_HOST,\n")
-        file.write("        'port': AIRFLOW_DB_PORT,\n")
-        file.write("        'schema': AIRFLOW_DB_SCHEMA\n")
-        file.write('    }\n')
-        
-        file.write('\n')
-        file.write('def get_smtp_config() -> dict:\n')
-        file.write('    """Returns SMTP configuration"""\n')
-        file.write('    return {\n')
-        file.write("        'smtp_host': AIRFLOW__SMTP__SMTP_HOST,\n")
-        file.write("        'smtp_port': AIRFLOW__SMTP__SMTP_PORT,\n")
-        file.write("        'smtp_user': AIRFLOW__SMTP__SMTP_USER,\n")
-        file.write("        'smtp_password': AIRFLOW__SMTP__SMTP_PASSWORD\n")
-        file.write('    }\n')
-        
-        file.write('\n')
-        file.write('def get_variable_safely(var_name: str, default: Any = None) -> Any:\n')
-        file.write('    """Safely get a variable with fallback to default"""\n')
-        file.write('    try:\n')
-        file.write('        return globals().get(var_name, default)\n')
-        file.write('    except NameError:\n')
-        file.write('        return default\n')
\ No newline at end of file
+    def _footer(self) -> str:
+        """File footer with utility functions"""
+        return (
+            '\n\n'
+            'def get_dag_default_args() -> dict:\n'
+            '    """Returns default arguments for DAGs"""\n'
+            '    return {\n'
+            "        'owner': AIRFLOW__DEFAULT__DAG_OWNER,\n"
+            "        'retries': AIRFLOW__CORE__DEFAULT_RETRIES,\n"
+            "        'retry_delay': timedelta(minutes=AIRFLOW__CORE__DEFAULT_RETRY_DELAY_MINUTES),\n"
+            "        'email_on_failure': True,\n"
+            "        'email_on_retry': False,\n"
+            "        'email': AIRFLOW__EMAIL__DEFAULT_EMAIL\n"
+            '    }\n'
+            '\n'
+            'def get_database_config() -> dict:\n'
+            '    """Returns database configuration"""\n'
+            '    return {\n'
+            "        'conn_id': AIRFLOW_DB_CONN_ID,\n"
+            "        'host': AIRFLOW_DB_HOST,\n"
+            "        'port': AIRFLOW_DB_PORT,\n"
+            "        'schema': AIRFLOW_DB_SCHEMA\n"
+            '    }\n'
+            '\n'
+            'def get_smtp_config() -> dict:\n'
+            '    """Returns SMTP configuration"""\n'
+            '    return {\n'
+            "        'smtp_host': AIRFLOW__SMTP__SMTP_HOST,\n"
+            "        'smtp_port': AIRFLOW__SMTP__SMTP_PORT,\n"
+            "        'smtp_user': AIRFLOW__SMTP__SMTP_USER,\n"
+            "        'smtp_password': AIRFLOW__SMTP__SMTP_PASSWORD\n"
+            '    }\n'
+            '\n'
+            'def get_variable_safely(var_name: str, default: Any = None) -> Any:\n'
+            '    """Safely get a variable with fallback to default"""\n'
+            '    try:\n'
+            '        return globals().get(var_name, default)\n'
+            '    except NameError:\n'
+            '        return default\n'
+        )
+
+
+@lru_cache(maxsize=None)
+def _section_classifier(sections: Tuple[str, ...]) -> SectionClassifier:
+    """One classifier per section layout, so its prefix table is built once"""
+    return SectionClassifier({section: section for section in sections}, default='custom', ignore_case=True)
@@ -0,0 +1,311 @@
+"""
+Prefix index over configuration variable names
+"""
+
+import itertools
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+# Prefix of the documentation entries older code stored next to each variable
+DOC_PREFIX = "__DOC_"
+
+# Updates with at least this many names (and a quarter of the current size) rebuild the index
+_BULK_UPDATE_MIN = 64
+
+
+class PrefixIndex:
+    """
+    Sorted index of variable names for prefix queries.
+
+    Lookups by prefix cost O(log n + k) through bisection over the sorted
+    names. Every underscore-terminated leading segment of a name
+    (``MAIN_``, ``MAIN_DB_``, ``MAIN_DB_POSTGRES_`` ...) is also counted, so
+    checking whether a section has any variable is a dictionary lookup.
+    Results keep insertion order, like the variables dict itself: the
+    insertion ordinal of each name sits in an unsigned array column
+    parallel to the sorted names, 8 bytes per name instead of a dict entry
+    and an int object.
+    """
+
+    __slots__ = ('_keys', '_ordinals', '_segments', '_counter')
+
+    def __init__(self, keys: Iterable[str] = ()):
+        # Bulk load: one sort instead of an insertion into the sorted lists per name
+        keys = list(keys if isinstance(keys, dict) else dict.fromkeys(keys))
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys: List[str] = [keys[i] for i in order]
+        self._ordinals = array('Q', order)
+        self._segments: Dict[str, int] = {}
+        self._counter = itertools.count(len(keys))
+        for key in keys:
+            self._count_segments(key, 1)
+
+    def add(self, key: str) -> None:
+        """Index a name; already indexed names keep their position."""
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return
+        self._keys.insert(i, key)
+        self._ordinals.insert(i, next(self._counter))
+        self._count_segments(key, 1)
+
+    def discard(self, key: str) -> None:
+        """Remove a name if it is indexed."""
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            return
+        del self._keys[i]
+        del self._ordinals[i]
+        self._count_segments(key, -1)
+
+    def clear(self) -> None:
+        """Remove every name."""
+        self._keys.clear()
+        del self._ordinals[:]
+        self._segments.clear()
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """Names starting with prefix, in insertion order."""
+        keys = self._keys
+        start = end = bisect_left(keys, prefix)
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        if end - start < 2:
+            return keys[start:end]
+        return [key for _, key in sorted(zip(self._ordinals[start:end], keys[start:end]))]
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Whether any name starts with prefix."""
+        if prefix.endswith('_'):
+            return prefix in self._segments
+        i = bisect_left(self._keys, prefix)
+        return i < len(self._keys) and self._keys[i].startswith(prefix)
+
+    def _count_segments(self, key: str, delta: int) -> None:
+        pos = key.find('_')
+        while pos != -1:
+            segment = key[:pos + 1]
+            count = self._segments.get(segment, 0) + delta
+            if count:
+                self._segments[segment] = count
+            else:
+                del self._segments[segment]
+            pos = key.find('_', pos + 1)
+
+    def __contains__(self, key: str) -> bool:
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class SectionClassifier:
+    """
+    Longest-prefix classification of variable names into sections.
+
+    Prefixes are kept in a table keyed by prefix and probed from the longest
+    prefix length down, so classifying a name costs one dictionary lookup
+    per distinct prefix length, however many sections there are. Build one
+    per section layout and reuse it: IndexedVariables keeps a SectionTally
+    per classifier.
+    """
+
+    __slots__ = ('default', 'ignore_case', '_prefixes', '_lengths')
+
+    def __init__(self, prefixes: Mapping[str, str], default: str = 'custom', ignore_case: bool = False):
+        """
+        Args:
+            prefixes: Name prefix -> section.
+            default: Section of names that match no prefix.
+            ignore_case: Match prefixes regardless of case.
+        """
+        self.default = default
+        self.ignore_case = ignore_case
+        self._prefixes = {(prefix.lower() if ignore_case else prefix): section
+                          for prefix, section in prefixes.items()}
+        self._lengths = sorted({len(prefix) for prefix in self._prefixes}, reverse=True)
+
+    def classify(self, name: str) -> str:
+        """Section of the longest prefix of name, or the default section."""
+        if self.ignore_case:
+            name = name.lower()
+        for length in self._lengths:
+            section = self._prefixes.get(name[:length])
+            if section is not None:
+                return section
+        return self.default
+
+
+class SectionTally:
+    """
+    Number of variables per section, kept up to date by IndexedVariables.
+
+    Only the counts are stored: the section of a removed name is classified
+    again rather than remembered, so a tally costs one entry per section
+    instead of one per variable.
+    """
+
+    __slots__ = ('classifier', 'counts')
+
+    def __init__(self, classifier: SectionClassifier, names: Iterable[str] = ()):
+        self.classifier = classifier
+        self.counts: Dict[str, int] = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        """Count a name that was inserted."""
+        section = self.classifier.classify(name)
+        self.counts[section] = self.counts.get(section, 0) + 1
+
+    def discard(self, name: str) -> None:
+        """Uncount a name that was removed; it must have been counted."""
+        section = self.classifier.classify(name)
+        count = self.counts[section] - 1
+        if count:
+            self.counts[section] = count
+        else:
+            del self.counts[section]
+
+    def clear(self) -> None:
+        self.counts.clear()
+
+
+class IndexedVariables(dict):
+    """
+    Variables dict that keeps a PrefixIndex in sync with every mutation.
+
+    Documentation lives in the sparse ``docs`` table (name -> text) rather
+    than in the dict, so iterating the variables never has to skip
+    non-variable entries. Assigning a legacy ``__DOC_<NAME>`` key stores the
+    text in ``docs`` instead.
+    """
+
+    __slots__ = ('index', 'docs', 'tallies')
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.index = PrefixIndex(self)
+        self.docs: Dict[str, str] = {}
+        self.tallies: Dict[SectionClassifier, SectionTally] = {}
+        self._move_legacy_docs()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key.startswith(DOC_PREFIX):
+            self.docs[key[len(DOC_PREFIX):]] = value
+            return
+        if self.tallies and key not in self:
+            for tally in self.tallies.values():
+                tally.add(key)
+        super().__setitem__(key, value)
+        self.index.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._forget(key)
+
+    def __ior__(self, other: Any) -> "IndexedVariables":
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),), self.docs or None)
+
+    def __setstate__(self, docs: Dict[str, str]) -> None:
+        self.docs.update(docs)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        items = dict(*args, **kwargs)
+        if len(items) < _BULK_UPDATE_MIN or len(items) * 4 < len(self):
+            for key, value in items.items():
+                self[key] = value
+            return
+
+        # Large updates (loads, snapshot hits, reloads) rebuild the index with one
+        # sort; the dict order already is the insertion order the index keeps
+        if self.tallies:
+            added = [key for key in items if key not in self and not key.startswith(DOC_PREFIX)]
+        super().update(items)
+        self.index = PrefixIndex(self)
+        self._move_legacy_docs()
+        if self.tallies:
+            for tally in self.tallies.values():
+                for key in added:
+                    tally.add(key)
+
+    def _move_legacy_docs(self) -> None:
+        """Move ``__DOC_<NAME>`` entries into docs"""
+        # Legacy doc keys sort together, so finding them is a bisection rather than a scan
+        for key in self.index.keys_with_prefix(DOC_PREFIX):
+            # Never counted by the tallies, so only the index has to forget them
+            self.docs[key[len(DOC_PREFIX):]] = super().pop(key)
+            self.index.discard(key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key not in self:
+            return super().pop(key, *default)
+        value = super().pop(key)
+        self._forget(key)
+        return value
+
+    def popitem(self) -> tuple:
+        key, value = super().popitem()
+        self._forget(key)
+        return key, value
+
+    def clear(self) -> None:
+        super().clear()
+        self.index.clear()
+        self.docs.clear()
+        for tally in self.tallies.values():
+            tally.clear()
+
+    def _forget(self, key: str) -> None:
+        """Drop a removed name from the index, docs and tallies"""
+        self.index.discard(key)
+        self.docs.pop(key, None)
+        for tally in self.tallies.values():
+            tally.discard(key)
+
+    def copy(self) -> "IndexedVariables":
+        variables = self.__class__(self)
+        variables.docs.update(self.docs)
+        return variables
+
+    def tally(self, classifier: SectionClassifier) -> SectionTally:
+        """
+        Sections of the variables under a classifier.
+
+        The first call classifies every variable once; after that, inserts
+        and deletes update the counts, so reading them costs nothing per call.
+        """
+        tally = self.tallies.get(classifier)
+        if tally is None:
+            tally = self.tallies[classifier] = SectionTally(classifier, self)
+        return tally
+
+    def get_doc(self, key: str) -> Optional[str]:
+        """Documentation of a variable, or None."""
+        return self.docs.get(key)
+
+    def set_doc(self, key: str, doc: Optional[str]) -> None:
+        """Document a variable; None removes its documentation."""
+        if doc is None:
+            self.docs.pop(key, None)
+        else:
+            self.docs[key] = doc
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """Variable names starting with prefix, in insertion order."""
+        return self.index.keys_with_prefix(prefix)
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Whether any variable name starts with prefix."""
+        return self.index.has_prefix(prefix)
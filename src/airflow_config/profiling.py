@@ -0,0 +1,158 @@
+"""
+Import-time instrumentation for generated configuration modules
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# udp://host:port, file:///path or a plain file path; unset disables emission
+STATSD_TARGET_ENV = "AIRFLOW_CONFIG_STATSD"
+STATSD_PREFIX = os.environ.get("AIRFLOW_CONFIG_STATSD_PREFIX", "airflow_config")
+
+_METRIC_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class LoadProfiler:
+    """
+    Records how long a generated config module takes to import and to fetch each variable.
+
+    A profiled module creates one LoadProfiler as its first statement, wraps
+    the object its lines read variables from with instrument, and calls
+    finish as its last statement. get_load_stats() in the module returns stats.
+    """
+
+    def __init__(self, module_name: str, statsd_target: Optional[str] = None,
+                 clock=time.perf_counter):
+        """
+        Args:
+            module_name: ``__name__`` of the generated module.
+            statsd_target: Where finish emits StatsD lines. Defaults to AIRFLOW_CONFIG_STATSD.
+            clock: Time source, injectable for tests.
+        """
+        self.module_name = module_name
+        self.statsd_target = statsd_target if statsd_target is not None else os.environ.get(STATSD_TARGET_ENV)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._started = clock()
+        self.import_time: Optional[float] = None
+        self.variables: Dict[str, List[float]] = {}
+        self.batches: Dict[str, float] = {}
+
+    def instrument(self, source: Any) -> "_TimedSource":
+        """Wrap an object with a ``get(key, ...)`` method so each call is timed per key."""
+        return _TimedSource(source, self)
+
+    def record(self, key: str, seconds: float) -> None:
+        """Record one variable fetch."""
+        with self._lock:
+            timing = self.variables.setdefault(key, [0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Time a batch operation, such as the single load_variables call of a batched module."""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.batches[name] = self.batches.get(name, 0.0) + self._clock() - start
+
+    def finish(self) -> None:
+        """Mark the end of the module import and emit StatsD lines if configured."""
+        self.import_time = self._clock() - self._started
+        if self.statsd_target:
+            try:
+                emit_statsd(self.statsd_lines(), self.statsd_target)
+            except Exception as e:
+                logger.warning(f"⚠️  Could not emit config load stats to '{self.statsd_target}': {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Load statistics of the module.
+
+        Returns:
+            Dictionary with the module name, import_time (None until the import
+            finished), fetch_time and lookups over every variable, per-key
+            ``{'count', 'time'}`` and per-batch times.
+        """
+        with self._lock:
+            variables = {key: {'count': count, 'time': seconds}
+                         for key, (count, seconds) in self.variables.items()}
+        return {
+            'module': self.module_name,
+            'import_time': self.import_time,
+            'fetch_time': sum(v['time'] for v in variables.values()) + sum(self.batches.values()),
+            'lookups': sum(v['count'] for v in variables.values()),
+            'variables': variables,
+            'batches': dict(self.batches),
+        }
+
+    def statsd_lines(self) -> List[str]:
+        """Stats in StatsD line format (timers in milliseconds)."""
+        stats = self.stats()
+        prefix = f"{STATSD_PREFIX}.{_metric_name(self.module_name)}"
+        lines = []
+        if stats['import_time'] is not None:
+            lines.append(f"{prefix}.import_time:{stats['import_time'] * 1000:.3f}|ms")
+        lines.append(f"{prefix}.fetch_time:{stats['fetch_time'] * 1000:.3f}|ms")
+        lines.append(f"{prefix}.lookups:{stats['lookups']}|c")
+        for key, timing in stats['variables'].items():
+            lines.append(f"{prefix}.variable.{_metric_name(key)}:{timing['time'] * 1000:.3f}|ms")
+        for name, seconds in stats['batches'].items():
+            lines.append(f"{prefix}.batch.{_metric_name(name)}:{seconds * 1000:.3f}|ms")
+        return lines
+
+
+class _TimedSource:
+    """Proxy timing ``get`` calls and forwarding everything else"""
+
+    def __init__(self, source: Any, profiler: LoadProfiler):
+        self._source = source
+        self._profiler = profiler
+
+    def get(self, key: str, *args, **kwargs) -> Any:
+        start = self._profiler._clock()
+        try:
+            return self._source.get(key, *args, **kwargs)
+        finally:
+            self._profiler.record(key, self._profiler._clock() - start)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._source, name)
+
+
+def emit_statsd(lines: List[str], target: str) -> None:
+    """
+    Send StatsD lines to a UDP socket or append them to a file.
+
+    Args:
+        lines: Lines such as ``name:12.5|ms``.
+        target: ``udp://host:port``, ``file:///path`` or a plain file path.
+    """
+    if not lines:
+        return
+    # Imported here so profiled modules only pay for them when emission is enabled
+    import socket
+    from urllib.parse import urlparse
+
+    parsed = urlparse(target)
+    if parsed.scheme == "udp":
+        payload = "\n".join(lines).encode("utf-8")
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(payload, (parsed.hostname or "127.0.0.1", parsed.port or 8125))
+    else:
+        path = parsed.path if parsed.scheme == "file" else target
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def _metric_name(name: str) -> str:
+    return _METRIC_UNSAFE.sub("_", name)
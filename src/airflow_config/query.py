@@ -5,6 +5,20 @@ Query methods for Airflow configuration
 from datetime import timedelta
 from typing import Dict, Any, List, Optional
 
+from .index import DOC_PREFIX, IndexedVariables, SectionClassifier
+
+SUMMARY_SECTIONS = ('database', 'email', 'scheduling', 'monitoring', 'dags', 'custom')
+
+_SUMMARY_CLASSIFIER = SectionClassifier({
+    'AIRFLOW_DB': 'database',
+    'AIRFLOW__SMTP': 'email',
+    'AIRFLOW__EMAIL': 'email',
+    'AIRFLOW__CORE': 'scheduling',
+    'AIRFLOW__LOGGING': 'monitoring',
+    'AIRFLOW__METRICS': 'monitoring',
+    'AIRFLOW__DEFAULT': 'dags',
+}, default='custom')
+
 class AirflowConfigQueryMixin:
     """Mixin with query methods for AirflowConfig"""
     
@@ -68,37 +82,25 @@ class AirflowConfigQueryMixin:
     
     def get_variables_by_prefix(self, prefix: str) -> Dict[str, Any]:
         """Get all variables that start with the given prefix"""
-        return {
-            key: value for key, value in self.variables.items() 
-            if key.startswith(prefix) and not key.startswith('__DOC_')
-        }
+        return {key: self.variables[key] for key in self._keys_with_prefix(prefix)}
+    
+    def _keys_with_prefix(self, prefix: str) -> List[str]:
+        """Variable names starting with prefix, from the name index when variables keep one"""
+        if isinstance(self.variables, IndexedVariables):
+            return self.variables.keys_with_prefix(prefix)
+        return [
+            key for key in self.variables
+            if key.startswith(prefix) and not key.startswith(DOC_PREFIX)
+        ]
     
     def get_config_summary(self) -> Dict[str, int]:
-        """Get summary of configuration by section"""
-        sections = {
-            'database': 0,
-            'email': 0,
-            'scheduling': 0,
-            'monitoring': 0,
-            'dags': 0,
-            'custom': 0
-        }
-        
-        for key in self.variables.keys():
-            if key.startswith('__DOC_'):
-                continue
-                
-            if key.startswith('AIRFLOW_DB'):
-                sections['database'] += 1
-            elif key.startswith('AIRFLOW__SMTP') or key.startswith('AIRFLOW__EMAIL'):
-                sections['email'] += 1
-            elif key.startswith('AIRFLOW__CORE'):
-                sections['scheduling'] += 1
-            elif key.startswith('AIRFLOW__LOGGING') or key.startswith('AIRFLOW__METRICS'):
-                sections['monitoring'] += 1
-            elif key.startswith('AIRFLOW__DEFAULT'):
-                sections['dags'] += 1
-            else:
-                sections['custom'] += 1
-        
-        return sections
\ No newline at end of file
+        """Get summary of configuration by section (counts are kept up to date as variables change)"""
+        if isinstance(self.variables, IndexedVariables):
+            counts = self.variables.tally(_SUMMARY_CLASSIFIER).counts
+        else:
+            counts = {}
+            for key in self.variables:
+                if not key.startswith(DOC_PREFIX):
+                    section = _SUMMARY_CLASSIFIER.classify(key)
+                    counts[section] = counts.get(section, 0) + 1
+        return {section: counts.get(section, 0) for section in SUMMARY_SECTIONS}
\ No newline at end of file
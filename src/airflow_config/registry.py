@@ -0,0 +1,158 @@
+"""
+Registry of many configuration files loaded together
+"""
+
+import os
+import sys
+import glob
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .core import AirflowConfig
+from .exceptions import ConfigFileError
+from .utils import TemplateGenerator
+
+# Immutable types whose equal values can safely share one object
+_INTERNABLE_TYPES = (int, float, bool, bytes)
+
+
+class ConfigRegistry:
+    """
+    Holds the AirflowConfig of many configuration files.
+
+    Variable names and equal immutable values (hosts, ports, defaults) are
+    interned across files, so memory grows with unique content instead of
+    file count. A name -> files index answers cross-file lookups without
+    scanning every config.
+    """
+
+    def __init__(self, static: bool = False, snapshot: Optional[bool] = None,
+                 template_generator: Optional[TemplateGenerator] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            static: Load files with the static (AST) parser instead of executing them.
+            snapshot: Snapshot option passed to every AirflowConfig.
+            template_generator: Generator shared by every loaded AirflowConfig.
+        """
+        self.static = static
+        self.snapshot = snapshot
+        self._template_generator = template_generator or TemplateGenerator()
+        self._configs: Dict[str, AirflowConfig] = {}
+        self._files_by_name: Dict[str, List[str]] = {}
+        self._value_pool: Dict[Tuple[type, Any], Any] = {}
+
+    def load_directory(self, directory: str, pattern: str = "*.py",
+                       max_workers: Optional[int] = None) -> List[AirflowConfig]:
+        """
+        Load every config file in a directory matching pattern.
+
+        ``__init__.py`` files are skipped. Files are loaded in sorted order.
+
+        Args:
+            directory: Directory holding the config files.
+            pattern: Glob pattern of the files to load.
+            max_workers: Load files concurrently with load_configs using this many workers.
+                Files that load are registered even if others fail.
+
+        Returns:
+            The loaded configurations.
+        """
+        if not os.path.isdir(directory):
+            raise ConfigFileError(f"Config directory '{directory}' does not exist")
+
+        paths = sorted(glob.glob(os.path.join(directory, pattern)))
+        paths = [path for path in paths if os.path.basename(path) != "__init__.py"]
+        if not max_workers:
+            return [self.add(path) for path in paths]
+
+        from .bulk import load_configs
+
+        result = load_configs(paths, static=self.static, snapshot=self.snapshot,
+                              max_workers=max_workers, template_generator=self._template_generator)
+        configs = [self.register(config) for config in result.configs.values()]
+        if result.errors:
+            raise ConfigFileError(f"Could not load config files: {sorted(result.errors)}")
+        return configs
+
+    def add(self, config_file: str) -> AirflowConfig:
+        """Load a config file into the registry, replacing a previous load of the same file."""
+        if not os.path.exists(config_file):
+            raise ConfigFileError(f"Config file '{config_file}' does not exist")
+
+        config = AirflowConfig(config_file, self._template_generator, static=self.static, snapshot=self.snapshot)
+        return self.register(config)
+
+    def register(self, config: AirflowConfig) -> AirflowConfig:
+        """Add an already loaded AirflowConfig, deduplicating its variables."""
+        path = os.path.abspath(config.config_file)
+        self.remove(path)
+
+        for name, value in list(config.variables.items()):
+            config.variables[name] = self._intern_value(value)
+            self._files_by_name.setdefault(sys.intern(name), []).append(path)
+
+        self._configs[path] = config
+        return config
+
+    def remove(self, config_file: str) -> None:
+        """Drop a config file from the registry if present."""
+        path = os.path.abspath(config_file)
+        config = self._configs.pop(path, None)
+        if config is None:
+            return
+        for name in config.variables:
+            files = self._files_by_name.get(name)
+            if files:
+                files.remove(path)
+                if not files:
+                    del self._files_by_name[name]
+
+    def get_config(self, config_file: str) -> AirflowConfig:
+        """Get the AirflowConfig of a loaded file."""
+        path = os.path.abspath(config_file)
+        if path not in self._configs:
+            raise ConfigFileError(f"Config file '{config_file}' is not loaded")
+        return self._configs[path]
+
+    def find(self, name: str) -> Dict[str, Any]:
+        """Value of a variable in every file that defines it (path -> value)."""
+        return {path: self._configs[path].variables[name] for path in self._files_by_name.get(name, [])}
+
+    def find_prefix(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        """Variables starting with prefix, grouped by file (path -> {name: value})."""
+        matches = {}
+        for path, config in self._configs.items():
+            names = config.variables.keys_with_prefix(prefix)
+            if names:
+                matches[path] = {name: config.variables[name] for name in names}
+        return matches
+
+    def files_with_variable(self, name: str) -> List[str]:
+        """Paths of the files that define a variable."""
+        return list(self._files_by_name.get(name, []))
+
+    def list_variables(self) -> List[str]:
+        """Unique variable names across all files."""
+        return list(self._files_by_name)
+
+    def _intern_value(self, value: Any) -> Any:
+        """Return a shared object for equal immutable values."""
+        if type(value) is str:
+            return sys.intern(value)
+        if isinstance(value, _INTERNABLE_TYPES):
+            # The type is part of the key so 1, 1.0 and True stay distinct
+            return self._value_pool.setdefault((type(value), value), value)
+        return value
+
+    def __contains__(self, config_file: str) -> bool:
+        return os.path.abspath(config_file) in self._configs
+
+    def __iter__(self) -> Iterator[AirflowConfig]:
+        return iter(self._configs.values())
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def __repr__(self) -> str:
+        return f"ConfigRegistry(files={len(self._configs)}, variables={len(self._files_by_name)})"
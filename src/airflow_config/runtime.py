@@ -0,0 +1,218 @@
+"""
+Runtime helpers imported by generated configuration files
+"""
+
+import os
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .cache import VariableCache
+    from .profiling import LoadProfiler
+    from .secrets import SecretResolver
+
+logger = logging.getLogger(__name__)
+
+_CONVERTERS = {
+    "int": int,
+    "float": float,
+    "json": json.loads,
+    "bool": lambda value: value.lower() == "true",
+}
+
+
+def convert_value(value: str, var_type: str) -> Any:
+    """Apply the same conversion a generated ``SECTION_VAR = ...`` line does"""
+    converter = _CONVERTERS.get(var_type)
+    return converter(value) if converter else value
+
+
+ENV_PREFIX = "AIRFLOW_VAR_"
+
+
+class EnvVariables:
+    """
+    ``AIRFLOW_VAR_*`` environment variables, read once when a config module is imported.
+
+    Lookups are answered from this snapshot and only fall back to fetch (the
+    metadata DB, directly or through the cache) for keys the environment does
+    not set. Counters record where every lookup was served from.
+    """
+
+    def __init__(self, fetch: Callable[..., Any], environ: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            fetch: ``Variable.get``-compatible function used on a miss.
+            environ: Environment to snapshot; defaults to ``os.environ``.
+        """
+        environ = os.environ if environ is None else environ
+        self._values = {name[len(ENV_PREFIX):]: value for name, value in environ.items()
+                        if name.startswith(ENV_PREFIX)}
+        self._fetch = fetch
+        self.env_lookups = 0
+        self.db_lookups = 0
+
+    def get(self, key: str, default_var: Any = None) -> Any:
+        """Drop-in replacement for ``Variable.get`` that checks the snapshot first."""
+        value = self._values.get(key.upper())
+        if value is not None:
+            self.env_lookups += 1
+            return value
+        self.db_lookups += 1
+        return self._fetch(key, default_var=default_var)
+
+    def split(self, keys: Iterable[str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Separate keys set in the environment from those that must be fetched.
+
+        Returns:
+            Tuple of (key -> environment value, keys to fetch), counted as lookups.
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            value = self._values.get(key.upper())
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+        self.env_lookups += len(found)
+        self.db_lookups += len(missing)
+        return found, missing
+
+    def stats(self) -> Dict[str, int]:
+        """Number of lookups served from the environment and from the DB (or cache)."""
+        return {'env': self.env_lookups, 'db': self.db_lookups}
+
+
+def load_variables(keys: Iterable[str], cache: Optional["VariableCache"] = None,
+                   env: Optional[EnvVariables] = None) -> Dict[str, str]:
+    """
+    Fetch many Airflow Variables with a single metadata-DB query.
+
+    Values set through ``AIRFLOW_VAR_<KEY>`` environment variables take
+    precedence, as they do for ``Variable.get``. Custom secrets backends are
+    not consulted; use the eager fetch mode if variables live there.
+
+    Args:
+        keys: Variable keys needed by the configuration file.
+        cache: Optional VariableCache; only keys it does not hold are queried.
+        env: Optional EnvVariables snapshot; keys it holds are not queried at all.
+
+    Returns:
+        Dictionary of key -> raw string value for the keys that exist.
+        Missing keys are left out so callers fall back to their defaults.
+    """
+    keys = list(dict.fromkeys(keys))
+    env_values, query_keys = env.split(keys) if env is not None else ({}, keys)
+    values, to_fetch = cache.get_many(query_keys) if cache is not None else ({}, query_keys)
+
+    if to_fetch:
+        try:
+            fetched = _query_variables(to_fetch)
+        except Exception as e:
+            logger.debug(f"Bulk variable query unavailable ({e}), using Variable.get per key")
+            fetched = _get_variables_one_by_one(to_fetch)
+        if cache is not None:
+            cache.set_many({key: fetched.get(key) for key in to_fetch})
+        values.update(fetched)
+
+    values = {key: value for key, value in values.items() if value is not None}
+
+    if env is not None:
+        values.update(env_values)
+        return values
+
+    for key in keys:
+        env_value = os.environ.get(f"AIRFLOW_VAR_{key.upper()}")
+        if env_value is not None:
+            values[key] = env_value
+
+    return values
+
+
+def _query_variables(keys: list) -> Dict[str, str]:
+    """Read all keys from the metadata database in one query"""
+    from airflow.models import Variable
+    from airflow.utils.session import create_session
+
+    with create_session() as session:
+        rows = session.query(Variable).filter(Variable.key.in_(keys)).all()
+        return {row.key: row.val for row in rows}
+
+
+def _get_variables_one_by_one(keys: list) -> Dict[str, str]:
+    """Fallback when the metadata database cannot be queried directly"""
+    from airflow.models import Variable
+
+    values = {}
+    for key in keys:
+        value = Variable.get(key, default_var=None)
+        if value is not None:
+            values[key] = value
+    return values
+
+
+def lazy_module(namespace: Dict[str, Any], specs: Dict[str, Tuple[str, str, str]],
+                cache: Optional["VariableCache"] = None,
+                secrets: Optional["SecretResolver"] = None,
+                env: Optional[EnvVariables] = None,
+                profiler: Optional["LoadProfiler"] = None) -> Tuple[Callable, Callable]:
+    """
+    Build module-level ``__getattr__``/``__dir__`` functions (PEP 562).
+
+    Each variable is fetched with ``Variable.get`` the first time it is
+    referenced and then stored in the module globals, so later accesses are
+    plain attribute lookups.
+
+    Args:
+        namespace: ``globals()`` of the generated module.
+        specs: Variable name -> (key, default, type), filled by the module body.
+        cache: Optional VariableCache used instead of calling ``Variable.get`` directly.
+        secrets: Optional SecretResolver. The first access to a ``secret`` variable
+            resolves every secret of the module in one batch.
+        env: Optional EnvVariables snapshot checked before the cache or ``Variable.get``.
+        profiler: Optional LoadProfiler recording the time of every fetch.
+
+    Returns:
+        Tuple of (``__getattr__``, ``__dir__``) to assign in the module.
+    """
+    def __getattr__(name: str) -> Any:
+        try:
+            var_key, default_val, var_type = specs[name]
+        except KeyError:
+            raise AttributeError(f"module {namespace.get('__name__')!r} has no attribute {name!r}") from None
+
+        if secrets is not None and var_type == "secret":
+            if profiler is None:
+                return _resolve_secrets(name)
+            with profiler.measure("secrets"):
+                return _resolve_secrets(name)
+
+        start = profiler._clock() if profiler is not None else 0.0
+        if env is not None:
+            raw_value = env.get(var_key, default_var=default_val)
+        elif cache is not None:
+            raw_value = cache.get(var_key, default_var=default_val)
+        else:
+            from airflow.models import Variable
+            raw_value = Variable.get(var_key, default_var=default_val)
+        if profiler is not None:
+            profiler.record(var_key, profiler._clock() - start)
+
+        value = convert_value(raw_value, var_type)
+        namespace[name] = value
+        return value
+
+    def _resolve_secrets(name: str) -> Any:
+        secret_specs = {n: spec for n, spec in specs.items() if spec[2] == "secret" and n not in namespace}
+        values = secrets.resolve(spec[0] for spec in secret_specs.values())
+        for secret_name, (var_key, default_val, _) in secret_specs.items():
+            namespace[secret_name] = values.get(var_key, default_val)
+        return namespace[name]
+
+    def __dir__() -> list:
+        return sorted(set(namespace) | set(specs))
+
+    return __getattr__, __dir__
@@ -0,0 +1,252 @@
+"""
+Validation of loaded configurations against the template definitions
+"""
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from .exceptions import ConfigFileError, TemplateNotFoundError, VariableTypeError
+from .utils import DatabaseTemplateStrategy
+
+if TYPE_CHECKING:
+    from .core import AirflowConfig
+
+logger = logging.getLogger(__name__)
+
+# (low, high) bounds of numeric variables; None leaves a side open
+Range = Tuple[Optional[float], Optional[float]]
+
+# Bounds of template variables by the end of their name
+DEFAULT_RANGES: Dict[str, Range] = {
+    "_PORT": (1, 65535),
+    "_TIMEOUT": (1, None),
+    "_RETRIES": (0, None),
+    "_RETRY_DELAY_MINUTES": (0, None),
+    "REDIS_DB": (0, 15),
+}
+
+_JSON_TYPES = (dict, list, str, int, float, bool, type(None))
+
+# Python types accepted for each template type (bool, a subclass of int, is rejected for numbers)
+_TYPE_CHECKS = {
+    "str": (str,),
+    "secret": (str,),
+    "int": (int,),
+    "float": (int, float),
+    "bool": (bool,),
+    "json": _JSON_TYPES,
+}
+
+_MISSING = object()
+
+
+class VariableError(NamedTuple):
+    """One variable that failed validation"""
+
+    variable: str
+    code: str
+    message: str
+    expected: str
+    value: Any = None
+
+    def exception(self) -> VariableTypeError:
+        """This error as a raisable VariableTypeError."""
+        return VariableTypeError(self.message)
+
+
+class ValidationResult(NamedTuple):
+    """Outcome of validating one configuration"""
+
+    config_file: Optional[str]
+    sections: Dict[str, str]
+    errors: List[VariableError]
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """Raise VariableTypeError listing every error, if there is any."""
+        if self.errors:
+            details = "; ".join(error.message for error in self.errors)
+            raise VariableTypeError(f"{len(self.errors)} invalid variables in '{self.config_file}': {details}")
+
+
+class BatchValidationResult(NamedTuple):
+    """Outcome of validate_configs"""
+
+    results: Dict[str, ValidationResult]
+    errors: Dict[str, Exception]
+
+    @property
+    def invalid(self) -> Dict[str, ValidationResult]:
+        """Results with at least one error."""
+        return {path: result for path, result in self.results.items() if not result.valid}
+
+
+class _Check(NamedTuple):
+    """Precomputed check of one template variable"""
+
+    suffix: str
+    var_type: str
+    types: Tuple[type, ...]
+    reject_bool: bool
+    low: Optional[float]
+    high: Optional[float]
+
+
+class TemplateValidator:
+    """
+    Checks of one template type, compiled once from its definition.
+
+    Every variable of the template is required. Its value must have the
+    Python type its declared type converts to. Numeric variables must fall
+    in their range, and ``secret`` variables can be required to be non-empty.
+    """
+
+    __slots__ = ('template_type', 'checks', 'require_secrets')
+
+    def __init__(self, template_type: str, definition: Mapping[str, tuple],
+                 ranges: Mapping[str, Range], require_secrets: bool = False):
+        """
+        Args:
+            template_type: Name of the template.
+            definition: Suffix -> (key, default[, type]), as in TEMPLATES.
+            ranges: Name ending -> (low, high) bounds for numeric variables.
+            require_secrets: Report ``secret`` variables left empty.
+        """
+        self.template_type = template_type
+        self.require_secrets = require_secrets
+        checks = []
+        for suffix, var_config in definition.items():
+            var_type = var_config[2] if len(var_config) > 2 else "str"
+            low = high = None
+            if var_type in ("int", "float"):
+                # The longest matching ending wins, e.g. REDIS_DB over a generic _DB
+                matches = [ending for ending in ranges if suffix.endswith(ending)]
+                if matches:
+                    low, high = ranges[max(matches, key=len)]
+            checks.append(_Check(suffix, var_type, _TYPE_CHECKS.get(var_type, (object,)),
+                                 var_type in ("int", "float"), low, high))
+        self.checks = tuple(checks)
+
+    def validate(self, variables: Mapping[str, Any], section: str) -> List[VariableError]:
+        """Errors of one section of a config, whose variables are named ``<SECTION>_<SUFFIX>``."""
+        prefix = f"{section.upper()}_"
+        errors = []
+        for check in self.checks:
+            name = prefix + check.suffix
+            value = variables.get(name, _MISSING)
+            if value is _MISSING:
+                errors.append(VariableError(name, "missing", f"{name} is required by template "
+                                            f"'{self.template_type}'", check.var_type))
+                continue
+            if not isinstance(value, check.types) or (check.reject_bool and type(value) is bool):
+                errors.append(VariableError(name, "type", f"{name} must be {check.var_type}, "
+                                            f"got {type(value).__name__} {value!r}", check.var_type, value))
+                continue
+            if check.var_type == "secret" and self.require_secrets and not value:
+                errors.append(VariableError(name, "empty", f"{name} is a secret and must not be empty",
+                                            check.var_type, value))
+            elif ((check.low is not None and value < check.low)
+                    or (check.high is not None and value > check.high)):
+                errors.append(VariableError(name, "range", f"{name} must be between {check.low} and "
+                                            f"{check.high}, got {value!r}", check.var_type, value))
+        return errors
+
+
+class ConfigSchema:
+    """
+    Validators for every template type of a strategy, each compiled on first use.
+
+    A config is validated section by section: the ``# SECTION: NAME (TEMPLATE)``
+    markers of its file, recorded when it was loaded, say which template each
+    section was generated from.
+    """
+
+    def __init__(self, templates: Optional[Mapping[str, Mapping[str, tuple]]] = None,
+                 ranges: Optional[Mapping[str, Range]] = None, require_secrets: bool = False):
+        """
+        Args:
+            templates: Template definitions. Defaults to DatabaseTemplateStrategy.TEMPLATES.
+            ranges: Name ending -> (low, high) bounds. Defaults to DEFAULT_RANGES.
+            require_secrets: Report ``secret`` variables left empty.
+        """
+        self.templates = templates if templates is not None else DatabaseTemplateStrategy.TEMPLATES
+        self.ranges = dict(DEFAULT_RANGES if ranges is None else ranges)
+        self.require_secrets = require_secrets
+        self._validators: Dict[str, TemplateValidator] = {}
+        self._lock = threading.Lock()
+
+    def validator(self, template_type: str) -> TemplateValidator:
+        """Compiled validator of a template type."""
+        validator = self._validators.get(template_type)
+        if validator is not None:
+            return validator
+        if template_type not in self.templates:
+            raise TemplateNotFoundError(f"Template '{template_type}' not found")
+        with self._lock:
+            validator = self._validators.get(template_type)
+            if validator is None:
+                validator = TemplateValidator(template_type, self.templates[template_type],
+                                              self.ranges, self.require_secrets)
+                self._validators[template_type] = validator
+        return validator
+
+    def validate(self, config: "AirflowConfig", sections: Optional[Dict[str, str]] = None) -> ValidationResult:
+        """
+        Validate one loaded configuration.
+
+        Args:
+            config: Configuration to check.
+            sections: Section name -> template type. Defaults to the sections
+                recorded when the config was loaded.
+
+        Returns:
+            ValidationResult with every error found.
+
+        Raises:
+            ConfigFileError: If there are no sections to validate against.
+        """
+        if sections is None:
+            sections = config.sections
+        if not sections:
+            raise ConfigFileError(f"Config '{config.config_file}' has no sections to validate against; "
+                                  f"pass sections explicitly")
+        errors = []
+        for section, template_type in sections.items():
+            errors.extend(self.validator(template_type.lower()).validate(config.variables, section))
+        return ValidationResult(config.config_file, dict(sections), errors)
+
+    def validate_many(self, configs: Iterable["AirflowConfig"]) -> BatchValidationResult:
+        """
+        Validate many loaded configurations.
+
+        The checks are a few dictionary lookups and isinstance calls per
+        variable against sections recorded at load time, with no I/O, so the
+        configs are validated in a plain loop.
+
+        Returns:
+            BatchValidationResult with config file -> ValidationResult, and
+            config file -> exception for configs that could not be validated
+            (no sections, unknown template). A failure never aborts the batch.
+        """
+        results: Dict[str, ValidationResult] = {}
+        errors: Dict[str, Exception] = {}
+        for config in configs:
+            try:
+                results[config.config_file] = self.validate(config)
+            except Exception as e:
+                errors[config.config_file] = e
+                logger.warning(f"⚠️  Could not validate '{config.config_file}': {e}")
+        return BatchValidationResult(results, errors)
+
+
+# Shared by AirflowConfig.validate and validate_configs
+default_schema = ConfigSchema()
+
+
+def validate_configs(configs: Iterable["AirflowConfig"], schema: Optional[ConfigSchema] = None) -> BatchValidationResult:
+    """Validate many loaded configurations with the default schema."""
+    return (schema or default_schema).validate_many(configs)
@@ -0,0 +1,220 @@
+"""
+Batched, concurrent resolution of secret variables through a pluggable backend
+"""
+
+import os
+import json
+import logging
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from .cache import VariableCache
+from .exceptions import ConfigFileError, ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SECRETS_TTL = float(os.environ.get("AIRFLOW_CONFIG_SECRETS_TTL", 300))
+DEFAULT_SECRETS_MAX_WORKERS = int(os.environ.get("AIRFLOW_CONFIG_SECRETS_MAX_WORKERS", 8))
+
+
+class SecretsBackend(ABC):
+    """Source of secret values, looked up one key at a time"""
+
+    @abstractmethod
+    def get_secret(self, key: str) -> Optional[str]:
+        """Raw value of a secret, or None if it does not exist."""
+
+
+class VariableSecretsBackend(SecretsBackend):
+    """Reads secrets with ``Variable.get``, i.e. through Airflow's configured secrets backends"""
+
+    def get_secret(self, key: str) -> Optional[str]:
+        from airflow.models import Variable
+
+        return Variable.get(key, default_var=None)
+
+
+class LocalFileSecretsBackend(SecretsBackend):
+    """
+    Reads secrets from a local JSON object of key -> value.
+
+    Meant for tests and local development. The file is read on first use and
+    again whenever its modification time changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._secrets: Dict[str, str] = {}
+
+    def get_secret(self, key: str) -> Optional[str]:
+        value = self._load().get(key)
+        return None if value is None else str(value)
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError as e:
+            raise ConfigFileError(f"Secrets file '{self.path}' is not readable: {e}")
+
+        with self._lock:
+            if mtime != self._mtime:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        secrets = json.load(f)
+                except (OSError, ValueError) as e:
+                    raise ConfigFileError(f"Error reading secrets file '{self.path}': {e}")
+                if not isinstance(secrets, dict):
+                    raise ConfigFileError(f"Secrets file '{self.path}' must contain a JSON object")
+                self._secrets, self._mtime = secrets, mtime
+            return self._secrets
+
+    def __repr__(self) -> str:
+        return f"LocalFileSecretsBackend({self.path!r})"
+
+
+class SecretResolver:
+    """
+    Resolves the secret variables of a config module in one batch.
+
+    Keys not held by the TTL cache are fetched concurrently from the backend
+    by a bounded thread pool, shared by every caller so the number of
+    simultaneous backend connections never exceeds max_workers. Failed
+    lookups are logged and left out (callers fall back to their defaults),
+    and are not cached so the next resolve retries them.
+
+    A forked child (Airflow's DAG processor, Celery workers) starts with no
+    pool: the parent's worker threads do not exist after fork, so the child
+    builds its own on first use.
+    """
+
+    def __init__(self, backend: Optional[SecretsBackend] = None, max_workers: int = DEFAULT_SECRETS_MAX_WORKERS,
+                 ttl: float = DEFAULT_SECRETS_TTL, cache: Optional[VariableCache] = None):
+        """
+        Initialize the resolver.
+
+        Args:
+            backend: Where secrets are read from. Defaults to LocalFileSecretsBackend when
+                AIRFLOW_CONFIG_SECRETS_FILE is set, VariableSecretsBackend otherwise.
+            max_workers: Maximum concurrent backend lookups.
+            ttl: Seconds a resolved secret is cached. 0 disables caching.
+            cache: Cache instance to use instead of a private one.
+        """
+        self.backend = backend or _default_backend()
+        self._cache = cache if cache is not None else VariableCache(ttl=ttl)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.max_workers = DEFAULT_SECRETS_MAX_WORKERS
+        self.configure(max_workers=max_workers)
+        _resolvers.add(self)
+
+    def configure(self, backend: Optional[SecretsBackend] = None, max_workers: Optional[int] = None,
+                  ttl: Optional[float] = None) -> None:
+        """Change backend, pool size and/or TTL. Changing the backend clears the cache."""
+        if max_workers is not None:
+            if max_workers < 1:
+                raise ConfigurationError(f"Secrets max_workers must be >= 1, got {max_workers}")
+            self.max_workers = max_workers
+            self.close()
+        if ttl is not None:
+            self._cache.configure(ttl=ttl)
+        if backend is not None:
+            self.backend = backend
+            self._cache.clear()
+
+    def resolve(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Fetch many secrets at once.
+
+        Args:
+            keys: Secret keys needed by the configuration file.
+
+        Returns:
+            Dictionary of key -> raw string value for the secrets that exist.
+        """
+        keys = list(dict.fromkeys(keys))
+        values, missing = self._cache.get_many(keys)
+
+        if missing:
+            fetched = self._fetch(missing)
+            self._cache.set_many(fetched)
+            values.update(fetched)
+
+        return {key: value for key, value in values.items() if value is not None}
+
+    def _fetch(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """Look up keys in the backend; failed keys are left out"""
+        if len(keys) == 1 or self.max_workers == 1:
+            results = [self._fetch_one(key) for key in keys]
+        else:
+            results = list(self._get_executor().map(self._fetch_one, keys))
+        return {key: value for key, (ok, value) in zip(keys, results) if ok}
+
+    def _fetch_one(self, key: str):
+        try:
+            return True, self.backend.get_secret(key)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not resolve secret '{key}': {e}")
+            return False, None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="airflow-config-secrets")
+            return self._executor
+
+    def _after_fork(self) -> None:
+        """Drop the pool inherited from the parent without joining its threads."""
+        self._executor_lock = threading.Lock()
+        self._executor = None
+
+    def close(self) -> None:
+        """Shut down the worker threads; they are started again on demand."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache hit/miss counters and current size."""
+        return self._cache.stats()
+
+    def clear(self) -> None:
+        """Forget every cached secret."""
+        self._cache.clear()
+
+    def __repr__(self) -> str:
+        return f"SecretResolver(backend={self.backend!r}, max_workers={self.max_workers}, ttl={self._cache.ttl})"
+
+
+_resolvers: "weakref.WeakSet[SecretResolver]" = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for resolver in list(_resolvers):
+        resolver._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _default_backend() -> SecretsBackend:
+    path = os.environ.get("AIRFLOW_CONFIG_SECRETS_FILE")
+    return LocalFileSecretsBackend(path) if path else VariableSecretsBackend()
+
+
+# Shared by every generated config module imported in this process
+secret_resolver = SecretResolver()
+
+
+def configure_secrets(backend: Optional[SecretsBackend] = None, max_workers: Optional[int] = None,
+                      ttl: Optional[float] = None) -> SecretResolver:
+    """Configure the process-wide secret resolver and return it."""
+    secret_resolver.configure(backend, max_workers, ttl)
+    return secret_resolver
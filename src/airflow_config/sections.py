@@ -0,0 +1,55 @@
+"""
+Splitting generated configuration files on their ``# SECTION:`` markers
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Tuple
+
+SECTION_MARKER = re.compile(r"^# SECTION: (?P<name>[^\s(]+) \((?P<template>[^)]*)\)[ \t]*\r?$", re.MULTILINE)
+
+
+class ConfigSection(NamedTuple):
+    """A ``# SECTION:`` block of a generated configuration file"""
+
+    name: str
+    template_type: str
+    text: str
+
+
+def split_sections(content: str) -> Tuple[str, "OrderedDict[str, ConfigSection]"]:
+    """
+    Split generated file content into its preamble and section blocks.
+
+    Each block runs from the blank line before its marker up to the blank
+    line before the next marker, so joining the preamble and every block
+    text gives back the original content.
+
+    Args:
+        content: Content of a file written by TemplateGenerator.
+
+    Returns:
+        Tuple of (preamble, upper-case section name -> ConfigSection), in file order.
+    """
+    starts = []
+    for match in SECTION_MARKER.finditer(content):
+        start = match.start()
+        # The block owns the newline that TemplateStrategy.generate_section puts before the marker
+        if content[start - 1:start] == "\n":
+            start -= 2 if content[start - 2:start] == "\r\n" else 1
+        starts.append((start, match.group("name"), match.group("template")))
+
+    if not starts:
+        return content, OrderedDict()
+
+    sections = OrderedDict()
+    for i, (start, name, template) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(content)
+        sections[name] = ConfigSection(name, template.lower(), content[start:end])
+
+    return content[:starts[0][0]], sections
+
+
+def section_templates(content: str) -> Dict[str, str]:
+    """Upper-case section name -> lower-case template type, from the ``# SECTION:`` markers of content."""
+    return {match.group("name"): match.group("template").lower() for match in SECTION_MARKER.finditer(content)}
@@ -0,0 +1,194 @@
+"""
+On-disk snapshots of loaded configuration files
+"""
+
+import os
+import stat
+import marshal
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 3
+
+
+class ConfigSnapshotCache:
+    """
+    Cache of parsed variables (and the section -> template map of the file)
+    keyed by config path, load mode and content hash.
+
+    Snapshots are marshalled into a ``__pycache__`` directory next to the
+    config file (or into ``snapshot_dir``) and kept in memory for the process.
+    A snapshot is only reused when the SHA-256 of the file content matches, so
+    any change to the file invalidates it; mtimes are not trusted because of
+    their coarse granularity on some filesystems.
+
+    marshal only stores literal values (strings, numbers, containers), so
+    reading a snapshot never runs code, and snapshot files not owned by the
+    current user or writable by others are ignored. Every load rebuilds the
+    values from the serialized form, so callers never share mutable values.
+    """
+
+    def __init__(self, snapshot_dir: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            snapshot_dir: Directory for snapshot files. Defaults to ``__pycache__``
+                next to each config file.
+        """
+        self.snapshot_dir = snapshot_dir
+        self._memory: Dict[Tuple[str, str], Tuple[str, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, config_file: str, mode: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the snapshot of a config file if its content is unchanged.
+
+        Args:
+            config_file: Path to the configuration file.
+            mode: Load mode the snapshot was taken with (``"exec"`` or ``"static"``).
+
+        Returns:
+            Dictionary of variables, or None when there is no valid snapshot.
+        """
+        snapshot = self.load_with_sections(config_file, mode)
+        return None if snapshot is None else snapshot[0]
+
+    def load_with_sections(self, config_file: str, mode: str, digest: Optional[str] = None
+                           ) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, str]]]]:
+        """
+        Like load, but returns (variables, section -> template map stored with them).
+
+        Pass the content_digest of content already read to skip hashing the file again.
+        """
+        path = os.path.abspath(config_file)
+        if digest is None:
+            try:
+                digest = self._hash_file(path)
+            except OSError:
+                return None
+
+        with self._lock:
+            cached = self._memory.get((path, mode))
+        if cached is not None and cached[0] == digest:
+            return marshal.loads(cached[1])
+
+        snapshot_path = self.snapshot_path(path, mode)
+        try:
+            with open(snapshot_path, 'rb') as f:
+                if not _is_trusted(os.fstat(f.fileno())):
+                    logger.warning(f"⚠️  Ignoring config snapshot '{snapshot_path}': "
+                                   f"not owned by this user or writable by others")
+                    return None
+                snapshot = marshal.loads(f.read())
+        except Exception:
+            return None
+
+        if (not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION
+                or snapshot.get('path') != path or snapshot.get('sha256') != digest
+                or not isinstance(snapshot.get('data'), bytes)):
+            return None
+
+        data = snapshot['data']
+        try:
+            loaded = marshal.loads(data)
+        except Exception:
+            return None
+        with self._lock:
+            self._memory[(path, mode)] = (digest, data)
+        return loaded
+
+    def store(self, config_file: str, mode: str, variables: Dict[str, Any],
+              sections: Optional[Dict[str, str]] = None, digest: Optional[str] = None) -> bool:
+        """
+        Save a snapshot of the variables loaded from a config file, and of its
+        section -> template map when given.
+
+        Pass digest, the content_digest of the exact bytes the variables were
+        parsed from: hashing the file again here would file the variables
+        under the content of a file replaced since it was parsed.
+
+        Values that marshal cannot store (e.g. imported classes, functions) make
+        the snapshot be skipped rather than fail the load.
+
+        Returns:
+            True if the snapshot was written to disk.
+        """
+        path = os.path.abspath(config_file)
+        if digest is None:
+            try:
+                digest = self._hash_file(path)
+            except OSError:
+                return False
+
+        try:
+            variables_data = marshal.dumps((dict(variables), None if sections is None else dict(sections)))
+        except ValueError as e:
+            logger.debug(f"Config snapshot skipped for '{path}': {e}")
+            return False
+        with self._lock:
+            self._memory[(path, mode)] = (digest, variables_data)
+
+        snapshot = {'version': SNAPSHOT_VERSION, 'path': path, 'sha256': digest, 'data': variables_data}
+        data = marshal.dumps(snapshot)
+
+        snapshot_path = self.snapshot_path(path, mode)
+        try:
+            os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(snapshot_path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, snapshot_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug(f"Could not write config snapshot '{snapshot_path}': {e}")
+            return False
+        return True
+
+    def invalidate(self, config_file: Optional[str] = None) -> None:
+        """Forget in-memory snapshots of one file, or of every file."""
+        with self._lock:
+            if config_file is None:
+                self._memory.clear()
+            else:
+                path = os.path.abspath(config_file)
+                for key in [key for key in self._memory if key[0] == path]:
+                    del self._memory[key]
+
+    def snapshot_path(self, config_file: str, mode: str) -> str:
+        """Path of the snapshot file for a config file and load mode."""
+        path = os.path.abspath(config_file)
+        name = os.path.basename(path)
+        if self.snapshot_dir:
+            path_hash = hashlib.sha1(path.encode('utf-8')).hexdigest()[:12]
+            return os.path.join(self.snapshot_dir, f"{name}.{path_hash}.{mode}.snapshot")
+        return os.path.join(os.path.dirname(path), "__pycache__", f"{name}.{mode}.snapshot")
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        with open(path, 'rb') as f:
+            return content_digest(f.read())
+
+
+def content_digest(data: bytes) -> str:
+    """SHA-256 that snapshots of a config file with this raw content are keyed by."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _is_trusted(st: os.stat_result) -> bool:
+    """Whether a snapshot file was written by this user and only they can change it"""
+    if hasattr(os, "geteuid") and st.st_uid != os.geteuid():
+        return False
+    return not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+# Shared by every AirflowConfig instance in this process
+snapshot_cache = ConfigSnapshotCache(os.environ.get("AIRFLOW_CONFIG_SNAPSHOT_DIR"))
@@ -0,0 +1,190 @@
+"""
+Static (AST-based) reading of configuration files without executing them
+"""
+
+import ast
+import sys
+import logging
+from typing import Any, Dict, NamedTuple, Optional
+
+from .exceptions import ConfigFileError
+from .runtime import convert_value
+
+logger = logging.getLogger(__name__)
+
+_NOT_LITERAL = object()
+_NON_LITERAL_NODES = (ast.Call, ast.Compare, ast.Name, ast.Attribute, ast.Subscript)
+_TYPE_CONVERTERS = {"int": "int", "float": "float", "str": "str"}
+
+
+class VariableSpec(NamedTuple):
+    """How a configuration variable is obtained, as written in the file"""
+
+    name: str
+    key: Optional[str]
+    default: Any
+    var_type: str = "str"
+
+    @property
+    def value(self) -> Any:
+        """Value the variable takes when the Airflow Variable is not set"""
+        if self.key is None or self.default is None:
+            return self.default
+        return convert_value(self.default, self.var_type)
+
+
+def parse_config_source(source: str, filename: str = "<config>") -> Dict[str, VariableSpec]:
+    """
+    Extract variable definitions from configuration source code.
+
+    Understands literal assignments and the lines written by TemplateGenerator
+    in every fetch mode: ``Variable.get(...)``, ``int(...)``/``float(...)``,
+    ``... .lower() == "true"``, ``json.loads(...)`` and lazy ``_VARIABLE_SPECS``
+    registrations. Names whose value cannot be determined statically are skipped.
+
+    Args:
+        source: Python source of the configuration file.
+        filename: Name used in syntax error messages.
+
+    Returns:
+        Dictionary of variable name -> VariableSpec, in file order.
+    """
+    try:
+        tree = ast.parse(source, filename=filename)
+    except SyntaxError as e:
+        raise ConfigFileError(f"Invalid syntax in config file '{filename}': {e}")
+
+    specs = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target, value = node.targets[0], node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            target, value = node.target, node.value
+        else:
+            continue
+
+        if isinstance(target, ast.Name):
+            if target.id.isupper() and not target.id.startswith('_'):
+                spec = _parse_expression(target.id, value)
+                if spec is not None:
+                    specs[target.id] = spec
+                else:
+                    logger.debug(f"Skipping '{target.id}': value is not statically known")
+        elif isinstance(target, ast.Subscript):
+            spec = _parse_lazy_registration(target, value)
+            if spec is not None:
+                specs[spec.name] = spec
+
+    return specs
+
+
+def load_config_specs(config_file: str) -> Dict[str, VariableSpec]:
+    """Read a configuration file and extract its variable definitions statically."""
+    return parse_config_source(read_config_source(config_file), config_file)
+
+
+def read_config_source(config_file: str) -> str:
+    """Source of a configuration file."""
+    return decode_config_source(read_config_bytes(config_file), config_file)
+
+
+def read_config_bytes(config_file: str) -> bytes:
+    """Raw content of a configuration file, e.g. to hash exactly what is parsed."""
+    try:
+        with open(config_file, 'rb') as f:
+            return f.read()
+    except OSError as e:
+        raise ConfigFileError(f"Error reading config file '{config_file}': {e}")
+
+
+def decode_config_source(data: bytes, config_file: str = "<config>") -> str:
+    """Source text of raw file content, with universal newlines as if read in text mode."""
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise ConfigFileError(f"Error reading config file '{config_file}': {e}")
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _parse_expression(name: str, node: ast.AST) -> Optional[VariableSpec]:
+    """Recognize a literal or a (possibly converted) variable fetch"""
+    literal = _literal(node)
+    if literal is not _NOT_LITERAL:
+        return VariableSpec(name, None, literal)
+
+    fetch = _parse_fetch(node)
+    if fetch is not None:
+        return VariableSpec(name, fetch[0], fetch[1], "str")
+
+    # int(...), float(...), str(...), json.loads(...)
+    if isinstance(node, ast.Call) and len(node.args) == 1 and not node.keywords:
+        fetch = _parse_fetch(node.args[0])
+        func = node.func
+        if fetch is not None:
+            if isinstance(func, ast.Name) and func.id in _TYPE_CONVERTERS:
+                return VariableSpec(name, fetch[0], fetch[1], _TYPE_CONVERTERS[func.id])
+            if (isinstance(func, ast.Attribute) and func.attr == "loads"
+                    and isinstance(func.value, ast.Name) and func.value.id == "json"):
+                return VariableSpec(name, fetch[0], fetch[1], "json")
+
+    # <fetch>.lower() == "true"
+    if (isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.ops[0], ast.Eq)
+            and _literal(node.comparators[0]) == "true"):
+        call = node.left
+        if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)
+                and call.func.attr == "lower" and not call.args):
+            fetch = _parse_fetch(call.func.value)
+            if fetch is not None:
+                return VariableSpec(name, fetch[0], fetch[1], "bool")
+
+    return None
+
+
+def _parse_fetch(node: ast.AST) -> Optional[tuple]:
+    """Recognize ``<anything>.get("key", default)`` and return (key, default)"""
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "get" and node.args):
+        return None
+
+    key = _literal(node.args[0])
+    if not isinstance(key, str):
+        return None
+
+    default = None
+    if len(node.args) > 1:
+        default = _literal(node.args[1])
+    for keyword in node.keywords:
+        if keyword.arg == "default_var":
+            default = _literal(keyword.value)
+
+    if default is _NOT_LITERAL:
+        return None
+    return key, default
+
+
+def _parse_lazy_registration(target: ast.Subscript, node: ast.AST) -> Optional[VariableSpec]:
+    """Recognize ``_VARIABLE_SPECS["NAME"] = ("key", "default", "type")``"""
+    if not (isinstance(target.value, ast.Name) and target.value.id == "_VARIABLE_SPECS"):
+        return None
+
+    slice_node = target.slice
+    if sys.version_info < (3, 9) and isinstance(slice_node, ast.Index):
+        slice_node = slice_node.value
+    name = _literal(slice_node)
+    spec = _literal(node)
+    if not isinstance(name, str) or not isinstance(spec, tuple) or len(spec) != 3:
+        return None
+    return VariableSpec(name, spec[0], spec[1], spec[2])
+
+
+def _literal(node: ast.AST) -> Any:
+    """Evaluate a literal node, or return _NOT_LITERAL"""
+    # Fast paths for the node types that make up almost every config line
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, _NON_LITERAL_NODES):
+        return _NOT_LITERAL
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return _NOT_LITERAL
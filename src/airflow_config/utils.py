@@ -2,22 +2,75 @@
 Template generation utilities with Strategy Pattern
 """
 
+import os
 import json
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, NamedTuple, Tuple, Union
 from abc import ABC, abstractmethod
 
 from .exceptions import (
-    TemplateGenerationError, TemplateNotFoundError,
+    TemplateGenerationError, TemplateNotFoundError, ConfigFileError,
     FileWriteError, ConfigurationError, VariableTypeError
 )
+from .freeze import Resolver, resolve_specs, write_frozen
+from .sections import split_sections
+from .static import VariableSpec
+from .writer import file_lock, write_chunks
 
 logger = logging.getLogger(__name__)
 
+# Modos de lectura de variables en los archivos generados
+FETCH_MODES = ("eager", "batched", "lazy")
+
+# Marca el punto donde va el prefijo de sección al precompilar las líneas
+_SECTION_SLOT = "\x00"
+
+VARIABLE_IMPORT = "from airflow.models import Variable"
+
+# Última línea de los archivos generados en modo profile
+_PROFILER_FOOTER = "\n_PROFILER.finish()\n"
+
+# Cabecera de las estrategias que no declaran sus imports
+DEFAULT_IMPORTS = ("import os", "import logging", "import json", VARIABLE_IMPORT)
+
+# Import que necesita cada expresión de las líneas generadas
+_EXPRESSION_IMPORTS = (("Variable.get(", VARIABLE_IMPORT), ("json.loads(", "import json"))
+
+
+class CompiledVariable(NamedTuple):
+    """Variable de un template con su línea ya renderizada"""
+
+    suffix: str
+    key: str
+    default: str
+    var_type: str
+    converter: str
+    fragment: str
+
+
+class CompiledTemplate(NamedTuple):
+    """
+    Template precompilado: cada línea es head + prefijo de sección + fragment
+    """
+
+    template_type: str
+    head: str
+    variables: Tuple[CompiledVariable, ...]
+    keys: Tuple[str, ...]
+    secret_keys: Tuple[str, ...]
+    imports: Tuple[str, ...]
+
+
 class TemplateStrategy(ABC):
     """Strategy interface para generación de templates"""
     
+    fetch_mode = "eager"
+    use_cache = False
+    batch_secrets = False
+    env_first = False
+    profile = False
+    
     @abstractmethod
     def generate_section(self, section_name: str, template_type: str) -> str:
         pass
@@ -25,6 +78,22 @@ class TemplateStrategy(ABC):
     @abstractmethod
     def get_available_templates(self) -> List[str]:
         pass
+    
+    def get_variable_keys(self, sections: Dict[str, str]) -> List[str]:
+        """Claves de Airflow Variable que necesitan las secciones"""
+        return []
+    
+    def get_secret_keys(self, sections: Dict[str, str]) -> List[str]:
+        """Claves de las variables secretas que resuelve el SecretResolver"""
+        return []
+    
+    def get_imports(self, sections: Dict[str, str]) -> List[str]:
+        """Imports que necesitan las secciones generadas"""
+        return list(DEFAULT_IMPORTS)
+    
+    def get_variable_specs(self, section_name: str, template_type: str) -> List[VariableSpec]:
+        """Variables de una sección (nombre, clave, default, tipo), necesarias para congelarla"""
+        raise TemplateGenerationError(f"{type(self).__name__} does not support frozen configurations")
 
 
 class DatabaseTemplateStrategy(TemplateStrategy):
@@ -107,36 +176,127 @@ class DatabaseTemplateStrategy(TemplateStrategy):
         }
     }
     
+    # Conversión aplicada al valor leído según el tipo declarado en el template
+    CONVERTERS = {"str": "", "int": "int", "bool": "bool", "secret": "", "float": "float", "json": "json.loads"}
+    
+    def __init__(self, fetch_mode: str = "eager", use_cache: bool = False, batch_secrets: bool = False,
+                 env_first: bool = False, profile: bool = False):
+        if fetch_mode not in FETCH_MODES:
+            raise ConfigurationError(f"Invalid fetch mode '{fetch_mode}', expected one of {FETCH_MODES}")
+        self.fetch_mode = fetch_mode
+        self.use_cache = use_cache
+        self.batch_secrets = batch_secrets
+        self.env_first = env_first
+        self.profile = profile
+        self._compiled: Dict[str, CompiledTemplate] = {}
+    
     def get_available_templates(self) -> List[str]:
         return list(self.TEMPLATES.keys())
     
-    def generate_section(self, section_name: str, template_type: str) -> str:
+    def get_variable_keys(self, sections: Dict[str, str]) -> List[str]:
+        keys = []
+        for template_type in sections.values():
+            keys.extend(self.compile_template(template_type).keys)
+        return list(dict.fromkeys(keys))
+    
+    def get_secret_keys(self, sections: Dict[str, str]) -> List[str]:
+        keys = []
+        for template_type in sections.values():
+            keys.extend(self.compile_template(template_type).secret_keys)
+        return list(dict.fromkeys(keys))
+    
+    def compile_template(self, template_type: str) -> CompiledTemplate:
+        """
+        Precompila un template una sola vez para el modo de lectura de la estrategia.
+        
+        Los cambios posteriores en TEMPLATES no se ven en los templates ya compilados.
+        """
+        compiled = self._compiled.get(template_type)
+        if compiled is not None:
+            return compiled
         if template_type not in self.TEMPLATES:
             raise TemplateNotFoundError(f"Template '{template_type}' not found")
         
-        template = self.TEMPLATES[template_type]
-        content = [f"\n# SECTION: {section_name.upper()} ({template_type.upper()})\n"]
+        heads = set()
+        variables = []
+        for suffix, var_config in self.TEMPLATES[template_type].items():
+            var_type = var_config[2] if len(var_config) > 2 else "str"
+            # Se renderiza con una marca en lugar del prefijo y se corta por ella
+            head, fragment = self._generate_variable(_SECTION_SLOT + suffix, var_config).split(_SECTION_SLOT, 1)
+            heads.add(head)
+            variables.append(CompiledVariable(
+                suffix, var_config[0], var_config[1], var_type, self.CONVERTERS.get(var_type) or "", fragment
+            ))
         
-        for var_name, var_config in template.items():
-            section_var = f"{section_name.upper()}_{var_name}"
-            content.append(self._generate_variable(section_var, var_config))
+        if len(heads) > 1:
+            raise TemplateGenerationError(f"Template '{template_type}' renders lines with different prefixes")
         
-        return "\n".join(content)
+        # Con batch_secrets los secretos no se leen con el resto de variables
+        secret = [v.key for v in variables if self.batch_secrets and v.var_type == "secret"]
+        compiled = CompiledTemplate(
+            template_type,
+            heads.pop() if heads else "",
+            tuple(variables),
+            tuple(dict.fromkeys(v.key for v in variables if v.key not in secret)),
+            tuple(dict.fromkeys(secret)),
+            tuple(line for expression, line in _EXPRESSION_IMPORTS
+                  if any(expression in variable.fragment for variable in variables)),
+        )
+        self._compiled[template_type] = compiled
+        return compiled
+    
+    def get_imports(self, sections: Dict[str, str]) -> List[str]:
+        imports = []
+        for template_type in sections.values():
+            imports.extend(self.compile_template(template_type).imports)
+        return list(dict.fromkeys(imports))
+    
+    def get_variable_specs(self, section_name: str, template_type: str) -> List[VariableSpec]:
+        prefix = f"{section_name.upper()}_"
+        return [
+            VariableSpec(prefix + variable.suffix, variable.key, variable.default, variable.var_type)
+            for variable in self.compile_template(template_type).variables
+        ]
+    
+    def generate_section(self, section_name: str, template_type: str) -> str:
+        compiled = self.compile_template(template_type)
+        marker = f"\n# SECTION: {section_name.upper()} ({template_type.upper()})\n"
+        if not compiled.variables:
+            return marker
+        
+        prefix = f"{compiled.head}{section_name.upper()}_"
+        return f"{marker}\n{prefix}" + f"\n{prefix}".join(variable.fragment for variable in compiled.variables)
     
     def _generate_variable(self, var_name: str, var_config: tuple) -> str:
         var_key, default_val = var_config[0], var_config[1]
         var_type = var_config[2] if len(var_config) > 2 else "str"
         
-        converters = {"str": "", "int": "int", "bool": "bool", "secret": "", "float": "float", "json": "json.loads"}
-        converter = converters.get(var_type)
+        if self.fetch_mode == "lazy":
+            return f'_VARIABLE_SPECS["{var_name}"] = ("{var_key}", "{default_val}", "{var_type}")'
+        
+        converter = self.CONVERTERS.get(var_type)
+        if var_type == "secret" and self.batch_secrets:
+            fetch = f'_SECRETS.get("{var_key}", "{default_val}")'
+        else:
+            fetch = self._fetch_expression(var_key, default_val)
         
         if not converter:
-            return f'{var_name} = Variable.get("{var_key}", default_var="{default_val}")'
+            return f'{var_name} = {fetch}'
         
         if var_type == "bool":
-            return f'{var_name} = Variable.get("{var_key}", default_var="{default_val}").lower() == "true"'
+            return f'{var_name} = {fetch}.lower() == "true"'
         
-        return f'{var_name} = {converter}(Variable.get("{var_key}", default_var="{default_val}"))'
+        return f'{var_name} = {converter}({fetch})'
+    
+    def _fetch_expression(self, var_key: str, default_val: str) -> str:
+        """Expresión que lee la variable según el modo de lectura"""
+        if self.fetch_mode == "batched":
+            return f'_VARIABLES.get("{var_key}", "{default_val}")'
+        if self.env_first:
+            return f'_ENV_VARIABLES.get("{var_key}", default_var="{default_val}")'
+        if self.use_cache:
+            return f'variable_cache.get("{var_key}", default_var="{default_val}")'
+        return f'Variable.get("{var_key}", default_var="{default_val}")'
 
 
 class TemplateGenerator:
@@ -144,8 +304,9 @@ class TemplateGenerator:
     Template generator usando Strategy Pattern
     """
     
-    def __init__(self, strategy: TemplateStrategy = None):
-        self._strategy = strategy or DatabaseTemplateStrategy()
+    def __init__(self, strategy: TemplateStrategy = None, fetch_mode: str = "eager", use_cache: bool = False,
+                 batch_secrets: bool = False, env_first: bool = False, profile: bool = False):
+        self._strategy = strategy or DatabaseTemplateStrategy(fetch_mode, use_cache, batch_secrets, env_first, profile)
     
     def set_strategy(self, strategy: TemplateStrategy) -> None:
         """Cambiar estrategia de generación"""
@@ -155,11 +316,69 @@ class TemplateGenerator:
         """Obtener templates disponibles"""
         return self._strategy.get_available_templates()
     
-    def create_config(self, sections: Dict[str, str], output_file: str) -> None:
-        """Crear archivo de configuración"""
+    def create_config(self, sections: Dict[str, str], output_file: str, incremental: bool = False) -> bool:
+        """
+        Crear archivo de configuración.
+
+        Con incremental=True las secciones pedidas se actualizan dentro del archivo
+        existente usando sus marcadores ``# SECTION:``: las demás secciones se
+        conservan tal cual y, si el contenido no cambia, el archivo no se reescribe
+        (su mtime se mantiene y Airflow no vuelve a parsear los DAGs que lo importan).
+
+        La escritura es atómica y se hace con un lock consultivo sobre el archivo,
+        así varios procesos pueden regenerar configuraciones en paralelo sin que
+        el scheduler lea un módulo truncado ni se pierdan actualizaciones.
+
+        Returns:
+            True si se escribió el archivo, False si ya estaba al día.
+        """
         self._validate_sections(sections)
-        content = self._generate_file_content(sections)
-        self._write_config_file(content, output_file)
+        self._ensure_parent_dir(output_file)
+        
+        with file_lock(output_file):
+            if incremental and os.path.exists(output_file):
+                existing = self._read_config_file(output_file)
+                content, changed = self._merge_sections(sections, existing)
+                if content == existing:
+                    logger.info(f"Configuration file unchanged: {output_file}")
+                    return False
+                logger.info(f"Updating sections {changed} in {output_file}")
+            else:
+                content = self._iter_file_content(sections)
+            
+            self._write_config_file(content, output_file)
+        return True
+    
+    def freeze_config(self, sections: Dict[str, str], output_file: str, resolver: Resolver = None,
+                      output_format: str = None) -> None:
+        """
+        Crear un archivo de configuración congelado.
+        
+        Todas las variables se resuelven una sola vez, con una única llamada a
+        resolver, y se escriben como constantes (módulo .py) o como un objeto
+        JSON compacto. Importarlo no hace imports de Airflow ni consultas a la
+        base de datos o al secrets backend.
+        
+        Args:
+            sections: Nombre de sección -> tipo de template.
+            output_file: Archivo a escribir; con extensión .json se usa formato JSON.
+            resolver: Función claves -> valores; por defecto secret_resolver.resolve.
+            output_format: "py" o "json" para no depender de la extensión.
+        """
+        self._validate_sections(sections)
+        
+        specs = {
+            section_name: self._strategy.get_variable_specs(section_name, template_type)
+            for section_name, template_type in sections.items()
+        }
+        values = resolve_specs((spec for section in specs.values() for spec in section), resolver)
+        
+        blocks = [
+            (f"# SECTION: {section_name.upper()} ({sections[section_name].upper()})",
+             {spec.name: values[spec.name] for spec in section_specs})
+            for section_name, section_specs in specs.items()
+        ]
+        write_frozen(output_file, blocks, output_format)
     
     def _validate_sections(self, sections: Dict[str, str]) -> None:
         """Validar secciones"""
@@ -173,35 +392,226 @@ class TemplateGenerator:
     
     def _generate_file_content(self, sections: Dict[str, str]) -> str:
         """Generar contenido del archivo"""
-        content = self._generate_header()
+        return "".join(self._iter_file_content(sections))
+    
+    def _iter_file_content(self, sections: Dict[str, str]) -> Iterator[str]:
+        """Generar el contenido del archivo sección a sección"""
+        yield self._generate_preamble(sections)
         
         for section_name, template_type in sections.items():
-            content += self._strategy.generate_section(section_name, template_type) + "\n"
+            yield self._generate_section_block(section_name, template_type)
+        
+        footer = self._generate_footer()
+        if footer:
+            yield footer
+    
+    def _generate_preamble(self, sections: Dict[str, str]) -> str:
+        """Generar todo lo que va antes de la primera sección"""
+        imports = self._strategy.get_imports(sections)
+        if self._strategy.env_first and not self._strategy.use_cache:
+            imports.append(VARIABLE_IMPORT)  # fallback de EnvVariables
+        content = self._generate_header(imports)
+        
+        if self._strategy.use_cache:
+            content += "from airflow_config.cache import variable_cache\n"
+        
+        if self._strategy.env_first:
+            content += self._generate_env_snapshot()
+        
+        if self._strategy.batch_secrets:
+            content += self._generate_secret_loader(self._strategy.get_secret_keys(sections))
+        
+        if self._strategy.fetch_mode == "batched":
+            content += self._generate_batch_loader(self._strategy.get_variable_keys(sections))
+        elif self._strategy.fetch_mode == "lazy":
+            content += self._generate_lazy_loader()
+        
+        if self._strategy.profile:
+            content += self._generate_instrumentation(imports)
         
         return content
     
-    def _generate_header(self) -> str:
-        """Generar cabecera del archivo"""
-        return '''"""
+    def _generate_footer(self) -> str:
+        """Generar lo que va después de la última sección"""
+        footer = ""
+        if self._strategy.fetch_mode == "lazy":
+            # `from config import *` no pasa por __getattr__: sin __all__ no exportaría nada
+            footer += "\n__all__ = list(_VARIABLE_SPECS)\n"
+        if self._strategy.profile:
+            footer += _PROFILER_FOOTER
+        return footer
+    
+    def _generate_section_block(self, section_name: str, template_type: str) -> str:
+        """Generar el bloque de una sección tal como se escribe en el archivo"""
+        return self._strategy.generate_section(section_name, template_type) + "\n"
+    
+    def _merge_sections(self, sections: Dict[str, str], existing: str) -> Tuple[str, List[str]]:
+        """
+        Actualizar las secciones pedidas dentro del contenido existente.
+        
+        Returns:
+            Tupla (contenido nuevo, nombres de las secciones que cambiaron).
+        """
+        footer = self._generate_footer()
+        if footer and existing.endswith(footer):
+            existing = existing[:-len(footer)]
+        elif self._strategy.profile and existing.endswith(_PROFILER_FOOTER):
+            # Archivos lazy generados antes de que el pie incluyera __all__
+            existing = existing[:-len(_PROFILER_FOOTER)]
+        preamble, existing_sections = split_sections(existing)
+        existing_types = {name: section.template_type for name, section in existing_sections.items()}
+        
+        # Si la cabecera no corresponde a esta configuración de generación (otro modo,
+        # cabecera editada) los bloques no se reutilizan tal cual: se regeneran desde
+        # el tipo de template de su marcador para no perder ninguna sección
+        available = self.get_available_templates()
+        unknown = {name: t for name, t in existing_types.items() if t not in available}
+        if unknown:
+            raise ConfigFileError(f"Cannot update sections with unknown templates {unknown}; "
+                                  f"regenerate the file without incremental")
+        if not existing_sections and preamble.strip() and preamble != self._generate_preamble({}):
+            raise ConfigFileError("Existing file has no '# SECTION:' markers; "
+                                  "regenerate it without incremental")
+        
+        if preamble == self._generate_preamble(existing_types):
+            blocks = {name: section.text for name, section in existing_sections.items()}
+        else:
+            blocks = {name: self._generate_section_block(name, template_type)
+                      for name, template_type in existing_types.items()}
+        changed = []
+        for section_name, template_type in sections.items():
+            name = section_name.upper()
+            block = self._generate_section_block(section_name, template_type)
+            if blocks.get(name) != block:
+                blocks[name] = block
+                changed.append(name)
+            existing_types[name] = template_type
+        
+        content = self._generate_preamble(existing_types) + "".join(blocks.values()) + footer
+        return content, changed
+    
+    def _generate_header(self, imports: Iterable[str] = DEFAULT_IMPORTS) -> str:
+        """
+        Generar cabecera del archivo.
+        
+        Solo se escriben los imports que usan las variables: cada import de más
+        se paga en cada parseo de los DAGs que cargan la configuración.
+        """
+        # Módulos de la librería estándar antes que los de Airflow
+        imports = sorted(dict.fromkeys(imports), key=lambda line: line.startswith("from "))
+        content = '''"""
 Airflow Configuration
 Auto-generated configuration file
 """
 
-import os
-import logging
-import json
-from airflow.models import Variable
+'''
+        if self._strategy.profile:
+            # Primera sentencia del módulo para que el tiempo de import incluya todo lo demás
+            content += '''from airflow_config.profiling import LoadProfiler
+
+_PROFILER = LoadProfiler(__name__)
+get_load_stats = _PROFILER.stats
 
-logger = logging.getLogger("airflow.task")
+'''
+        if imports:
+            content += "\n".join(imports) + "\n\n"
+        if "import logging" in imports:
+            content += 'logger = logging.getLogger("airflow.task")\n\n'
+        return content
+    
+    def _generate_batch_loader(self, keys: List[str]) -> str:
+        """Generar la carga única de todas las variables del archivo"""
+        lines = ["from airflow_config.runtime import load_variables", "", "_VARIABLE_KEYS = ["]
+        lines.extend(f'    "{key}",' for key in keys)
+        cache_arg = ", cache=variable_cache" if self._strategy.use_cache else ""
+        if self._strategy.env_first:
+            cache_arg += ", env=_ENV_VARIABLES"
+        lines.append("]")
+        lines.extend(self._profiled(f"_VARIABLES = load_variables(_VARIABLE_KEYS{cache_arg})", "load_variables"))
+        lines.append("")
+        return "\n".join(lines) + "\n"
+    
+    def _generate_env_snapshot(self) -> str:
+        """Generar la lectura única de las variables AIRFLOW_VAR_* del entorno"""
+        fetch = "variable_cache.get" if self._strategy.use_cache else "Variable.get"
+        return f'''from airflow_config.runtime import EnvVariables
 
+_ENV_VARIABLES = EnvVariables({fetch})
+get_lookup_stats = _ENV_VARIABLES.stats
 '''
     
-    def _write_config_file(self, content: str, output_file: str) -> None:
-        """Escribir archivo de configuración"""
+    def _generate_secret_loader(self, keys: List[str]) -> str:
+        """Generar la resolución en lote de los secretos del archivo"""
+        lines = ["from airflow_config.secrets import secret_resolver", ""]
+        if self._strategy.fetch_mode != "lazy":
+            # En modo lazy los secretos se resuelven juntos al primer acceso a uno de ellos
+            lines.append("_SECRET_KEYS = [")
+            lines.extend(f'    "{key}",' for key in keys)
+            lines.append("]")
+            lines.extend(self._profiled("_SECRETS = secret_resolver.resolve(_SECRET_KEYS)", "secrets"))
+            lines.append("")
+        return "\n".join(lines) + "\n"
+    
+    def _generate_lazy_loader(self) -> str:
+        """Generar el __getattr__ de módulo que resuelve variables al primer acceso"""
+        cache_arg = ", cache=variable_cache" if self._strategy.use_cache else ""
+        if self._strategy.batch_secrets:
+            cache_arg += ", secrets=secret_resolver"
+        if self._strategy.env_first:
+            cache_arg += ", env=_ENV_VARIABLES"
+        if self._strategy.profile:
+            cache_arg += ", profiler=_PROFILER"
+        return f'''from airflow_config.runtime import lazy_module
+
+_VARIABLE_SPECS = {{}}
+__getattr__, __dir__ = lazy_module(globals(), _VARIABLE_SPECS{cache_arg})
+'''
+    
+    def _profiled(self, statement: str, name: str) -> List[str]:
+        """Líneas de una carga en lote, medida con _PROFILER en modo profile"""
+        if not self._strategy.profile:
+            return [statement]
+        return [f'with _PROFILER.measure("{name}"):', f"    {statement}"]
+    
+    def _generate_instrumentation(self, imports: List[str]) -> str:
+        """Envolver el objeto del que leen las variables para medir cada lectura"""
+        if self._strategy.fetch_mode == "lazy":
+            return ""  # lazy_module mide cada lectura
+        
+        if self._strategy.fetch_mode == "batched":
+            sources = ["_VARIABLES"]
+        elif self._strategy.env_first:
+            sources = ["_ENV_VARIABLES"]
+        elif self._strategy.use_cache:
+            sources = ["variable_cache"]
+        else:
+            sources = ["Variable"] if VARIABLE_IMPORT in imports else []
+        if self._strategy.batch_secrets:
+            sources.append("_SECRETS")
+        
+        lines = [f"{source} = _PROFILER.instrument({source})" for source in sources]
+        return "\n".join(lines) + "\n" if lines else ""
+    
+    def _read_config_file(self, config_file: str) -> str:
+        """Leer un archivo de configuración existente"""
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                return f.read()
+        except Exception as e:
+            raise ConfigFileError(f"Error reading '{config_file}': {e}")
+    
+    def _ensure_parent_dir(self, output_file: str) -> None:
+        """Crear el directorio del archivo si no existe"""
+        try:
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            raise FileWriteError(f"Error writing '{output_file}': {e}")
+    
+    def _write_config_file(self, content: Union[str, Iterable[str]], output_file: str) -> None:
+        """Escribir archivo de configuración (texto completo o iterable de fragmentos)"""
         try:
             Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            write_chunks(output_file, content)
             logger.info(f"✅ Configuration file created: {output_file}")
         except Exception as e:
             raise FileWriteError(f"Error writing '{output_file}': {e}")
\ No newline at end of file
@@ -0,0 +1,375 @@
+"""
+Watching configuration files and hot-reloading the sections that changed
+"""
+
+import os
+import sys
+import errno
+import select
+import struct
+import hashlib
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from .diff import diff_variables
+from .freeze import split_frozen_json
+from .index import IndexedVariables
+from .sections import split_sections
+from .static import parse_config_source
+
+if TYPE_CHECKING:
+    from .core import AirflowConfig
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) flags
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class ConfigChange(NamedTuple):
+    """Variables that changed in one reload of a watched configuration file"""
+
+    config_file: str
+    sections: List[str]
+    added: List[str]
+    removed: List[str]
+    modified: List[str]
+    full_reload: bool = False
+
+    @property
+    def keys(self) -> List[str]:
+        """Every added, removed or modified variable name."""
+        return self.added + self.removed + self.modified
+
+
+ChangeCallback = Callable[[ConfigChange], Any]
+
+
+class _SectionState(NamedTuple):
+    """Fingerprint of a ``# SECTION:`` block and the variables it defines"""
+
+    digest: str
+    names: Tuple[str, ...]
+
+
+class ConfigWatcher:
+    """
+    Watches the file of an AirflowConfig and reloads it when it changes.
+
+    Changes are noticed with inotify on Linux and by polling the file's
+    mtime, size and inode elsewhere. On a change the content is split on its
+    ``# SECTION:`` markers and only the blocks whose text differs are parsed
+    again: in exec mode the preamble is executed with the changed blocks
+    only, statically each changed block is read with the AST parser. A
+    changed preamble (imports, fetch mode, the batched key list) or a JSON
+    frozen config reloads the whole file. So does any change to a file whose
+    executed variables are not all named by the static parser (e.g. values
+    computed with function calls), since removed names could not be told apart.
+
+    The new variables are built off to the side and swapped into
+    ``config.variables`` with a single assignment, so readers see either the
+    old values or the new ones. Callbacks then receive a ConfigChange.
+    """
+
+    def __init__(self, config: "AirflowConfig", interval: float = 1.0, use_inotify: Optional[bool] = None):
+        """
+        Initialize the watcher. It does not run until start is called.
+
+        Args:
+            config: Configuration to keep up to date.
+            interval: Seconds between polls, and the longest stop waits for the thread.
+            use_inotify: Use inotify; defaults to whenever it is available.
+        """
+        self.config = config
+        self.interval = interval
+        self.use_inotify = inotify_available() if use_inotify is None else use_inotify
+        self._callbacks: List[ChangeCallback] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._digest: Optional[str] = None
+        self._preamble: Optional[str] = None
+        self._sections: Dict[str, _SectionState] = {}
+        # Whether every loaded variable belongs to a known section (or the preamble)
+        self._attributed = True
+        self._fingerprint()
+
+    @property
+    def running(self) -> bool:
+        """Whether the watch thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_callback(self, callback: ChangeCallback) -> None:
+        """Call callback with a ConfigChange after every reload that changed variables."""
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: ChangeCallback) -> None:
+        """Stop calling a callback."""
+        self._callbacks.remove(callback)
+
+    def start(self) -> "ConfigWatcher":
+        """Start watching in a daemon thread."""
+        if self.running:
+            return self
+        self._stop.clear()
+        # The inotify watch exists before start returns, so no write after it is missed
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify(os.path.dirname(os.path.abspath(self.config.config_file)))
+            except OSError as e:
+                logger.warning(f"⚠️  inotify unavailable, polling '{self.config.config_file}' instead: {e}")
+        self._signature = self._stat()
+        self._thread = threading.Thread(target=self._run, args=(inotify,),
+                                        name=f"ConfigWatcher({self.config.config_file})", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> Optional[ConfigChange]:
+        """
+        Reload the file now if its content changed.
+
+        Returns:
+            The ConfigChange that was applied, or None when nothing changed or
+            the file could not be read or parsed (the old values are kept).
+        """
+        with self._lock:
+            try:
+                with open(self.config.config_file, 'r', encoding='utf-8', newline='') as f:
+                    content = f.read()
+            except OSError as e:
+                logger.warning(f"⚠️  Could not read watched config '{self.config.config_file}': {e}")
+                return None
+
+            digest = _digest(content)
+            if digest == self._digest:
+                return None
+            try:
+                change = self._reload(content)
+            except Exception as e:
+                logger.warning(f"⚠️  Keeping previous values of '{self.config.config_file}': {e}")
+                return None
+            self._digest = digest
+
+        if change.keys:
+            logger.info(f"✅ Reloaded {len(change.keys)} variables of {self.config.config_file}")
+            for callback in list(self._callbacks):
+                try:
+                    callback(change)
+                except Exception as e:
+                    logger.warning(f"⚠️  Config change callback {callback!r} failed: {e}")
+        return change
+
+    def _reload(self, content: str) -> ConfigChange:
+        """Parse what changed and swap the new variables in."""
+        config = self.config
+        old = config.variables
+        if config.config_file.endswith(".json"):
+            preamble, sections = content, {}
+        else:
+            preamble, sections = split_sections(content)
+        preamble_digest = _digest(preamble)
+        digests = {name: _digest(section.text) for name, section in sections.items()}
+
+        templates = {name: section.template_type for name, section in sections.items()}
+
+        full_reload = preamble_digest != self._preamble or not self._attributed
+        if full_reload:
+            changed = list(sections)
+            if config.config_file.endswith(".json"):
+                values, templates = split_frozen_json(content, config.config_file)
+            else:
+                values = config._parse_source(content)
+            new = IndexedVariables(values)
+        else:
+            changed = [name for name, digest in digests.items()
+                       if name not in self._sections or self._sections[name].digest != digest]
+            changed_names = set(changed)
+            stale = set()
+            for name, state in self._sections.items():
+                if name in changed_names or name not in sections:
+                    stale.update(state.names)
+            new = IndexedVariables((key, value) for key, value in old.items() if key not in stale)
+            changed_text = "".join(sections[name].text for name in changed)
+            if changed_text:
+                # Executed blocks need the imports and variable source set up by the preamble
+                new.update(config._parse_source(changed_text if config.static else preamble + changed_text))
+
+        removed_sections = [name for name in self._sections if name not in sections]
+        self._sections = {
+            name: self._sections[name] if self._sections.get(name, (None,))[0] == digests[name]
+            else _SectionState(digests[name], _section_names(section.text))
+            for name, section in sections.items()
+        }
+        self._preamble = preamble_digest
+        self._attributed = self._all_attributed(new, preamble)
+
+        diff = diff_variables(old, new)
+        new.docs.update((key, doc) for key, doc in old.docs.items() if key in new)
+        config.variables = new
+        config.sections = templates
+        return ConfigChange(config.config_file, changed + removed_sections, list(diff.added), list(diff.removed),
+                            list(diff.changed), full_reload)
+
+    def _fingerprint(self) -> None:
+        """Record the sections of the file as loaded by the config."""
+        try:
+            with open(self.config.config_file, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
+        except OSError:
+            return
+        self._digest = _digest(content)
+        if self.config.config_file.endswith(".json"):
+            self._preamble = self._digest
+            return
+        preamble, sections = split_sections(content)
+        self._preamble = _digest(preamble)
+        self._sections = {
+            name: _SectionState(_digest(section.text), _section_names(section.text))
+            for name, section in sections.items()
+        }
+        self._attributed = self._all_attributed(self.config.variables, preamble)
+
+    def _all_attributed(self, variables: Mapping[str, Any], preamble: str) -> bool:
+        """Whether the static names of the preamble and sections cover every loaded variable."""
+        if self.config.static or self.config.config_file.endswith(".json"):
+            return True
+        known = set(_section_names(preamble))
+        for state in self._sections.values():
+            known.update(state.names)
+        return all(name in known for name in variables)
+
+    def _run(self, inotify: Optional["_Inotify"]) -> None:
+        try:
+            name = os.path.basename(self.config.config_file)
+            while not self._stop.is_set():
+                if inotify is not None:
+                    if name not in inotify.read(self.interval):
+                        continue
+                else:
+                    self._stop.wait(self.interval)
+                    signature = self._stat()
+                    if signature == self._signature:
+                        continue
+                    self._signature = signature
+                if not self._stop.is_set():
+                    self.check()
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.config.config_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def __enter__(self) -> "ConfigWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        backend = "inotify" if self.use_inotify else "polling"
+        return f"ConfigWatcher(file='{self.config.config_file}', backend={backend}, running={self.running})"
+
+
+class _Inotify:
+    """Minimal inotify(7) watch on one directory through libc"""
+
+    def __init__(self, directory: str):
+        libc = _libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(_get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            error = _get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"inotify_add_watch failed for '{directory}'")
+
+    def read(self, timeout: float) -> List[str]:
+        """Names of the entries that had events, waiting up to timeout seconds."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        names = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            names.append(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+_LIBC: Any = False
+
+
+def _libc() -> Any:
+    """libc with the inotify functions, or None off Linux"""
+    global _LIBC
+    if _LIBC is False:
+        _LIBC = None
+        if sys.platform.startswith("linux"):
+            try:
+                import ctypes
+
+                libc = ctypes.CDLL(None, use_errno=True)
+                libc.inotify_init1
+                libc.inotify_add_watch
+                _LIBC = libc
+            except (OSError, AttributeError):
+                pass
+    return _LIBC
+
+
+def _get_errno() -> int:
+    import ctypes
+
+    return ctypes.get_errno()
+
+
+def inotify_available() -> bool:
+    """Whether file changes can be watched with inotify."""
+    return _libc() is not None
+
+
+def _section_names(text: str) -> Tuple[str, ...]:
+    """Variable names defined by a section block"""
+    try:
+        return tuple(parse_config_source(text))
+    except Exception:
+        return ()
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
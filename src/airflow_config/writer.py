@@ -0,0 +1,155 @@
+"""
+Streaming, atomic and lock-protected writes of generated configuration files
+"""
+
+import os
+import stat
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Union
+
+from .exceptions import FileWriteError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+DEFAULT_LOCK_TIMEOUT = 60.0
+
+
+def write_chunks(output_file: str, chunks: Union[str, Iterable[str]],
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, fsync: bool = True) -> int:
+    """
+    Stream text chunks into a file and commit it atomically.
+
+    Chunks go through a buffered writer into a temporary file in the same
+    directory, which then replaces output_file with ``os.replace``. Readers
+    see either the old file or the complete new one, never a truncated
+    module, and memory holds one chunk at a time rather than the whole file.
+    The data (and, on POSIX, the directory entry) is fsynced before and after
+    the rename so a crash cannot leave an empty file behind.
+
+    This does not serialize concurrent writers; wrap read-modify-write
+    sequences in file_lock.
+
+    Args:
+        output_file: Destination path. Parent directories must exist.
+        chunks: Text to write, as one string or an iterable of strings.
+        buffer_size: Size of the write buffer in bytes.
+        fsync: Flush file and directory to disk before returning.
+
+    Returns:
+        Number of characters written.
+    """
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+
+    directory = os.path.dirname(os.path.abspath(output_file))
+    tmp_path = os.path.join(directory, f".{os.path.basename(output_file)}.{uuid.uuid4().hex[:12]}.tmp")
+
+    # os.open honours the umask, unlike tempfile.mkstemp which always creates 0600 files
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        written = 0
+        with open(fd, 'w', encoding='utf-8', buffering=buffer_size) as f:
+            for chunk in chunks:
+                written += f.write(chunk)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        _copy_mode(output_file, tmp_path)
+        os.replace(tmp_path, output_file)
+        if fsync:
+            _fsync_directory(directory)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return written
+
+
+def _copy_mode(source: str, target: str) -> None:
+    """Keep the permissions of the file being replaced"""
+    try:
+        mode = stat.S_IMODE(os.stat(source).st_mode)
+    except FileNotFoundError:
+        return
+    os.chmod(target, mode)
+
+
+@contextmanager
+def file_lock(path: str, timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+              poll_interval: float = 0.05) -> Iterator[None]:
+    """
+    Hold an advisory exclusive lock for a config file.
+
+    The lock lives on a ``.<name>.lock`` file next to path, because the
+    config file itself is replaced on every write. Only cooperating writers
+    (TemplateGenerator, save) honour it; readers never need it since writes
+    are atomic. Where neither fcntl nor msvcrt is available the lock is a no-op.
+
+    Args:
+        path: Config file to lock.
+        timeout: Seconds to wait for the lock; None waits forever.
+        poll_interval: Seconds between attempts while waiting.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    lock_path = os.path.join(directory, f".{name}.lock")
+    try:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+    except OSError as e:
+        raise FileWriteError(f"Could not open lock file '{lock_path}': {e}")
+
+    try:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not _try_lock(fd):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise FileWriteError(f"Timed out after {timeout}s waiting for lock on '{path}'")
+            time.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _try_lock(fd: int) -> bool:
+    """Try to take the lock without blocking"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist a rename on POSIX; directories cannot be opened on Windows"""
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -17,6 +17,14 @@ sys.modules['airflow.models'].Variable = Variable
 
 from airflow_config import create_etl_pipeline, create_project_structure
 
+def rewrite(path, old, new):
+    """Replace text in a file"""
+    with open(path) as f:
+        content = f.read()
+    assert old in content
+    with open(path, "w") as f:
+        f.write(content.replace(old, new))
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for testing"""
@@ -0,0 +1,129 @@
+"""
+Tests for concurrent loading of config files
+"""
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from airflow_config import AirflowConfig, ConfigRegistry, generate_configs, load_configs
+from airflow_config.exceptions import ConfigFileError, ConfigurationError, TemplateNotFoundError
+
+
+@pytest.fixture
+def config_paths(temp_dir):
+    """Paths of four generated configs"""
+    paths = []
+    for i, source in enumerate(["postgresql", "mongodb", "sqlserver", "kafka"]):
+        path = os.path.join(temp_dir, f"pipeline_{i}.py")
+        AirflowConfig(path).create_etl_pipeline(source, "bigquery")
+        paths.append(path)
+    return paths
+
+
+class TestLoadConfigs:
+    """Test load_configs"""
+    
+    def test_threaded_exec_load(self, config_paths):
+        """Test executing many configs in a thread pool"""
+        result = load_configs(config_paths, max_workers=4)
+        
+        assert list(result.configs) == config_paths
+        assert result.errors == {}
+        assert result.configs[config_paths[0]].get_variable("SOURCE_POSTGRES_PORT") == 5432
+    
+    @pytest.mark.parametrize("use_processes", [False, True])
+    def test_static_load(self, config_paths, use_processes):
+        """Test static parsing in thread and process pools"""
+        result = load_configs(config_paths, static=True, snapshot=False, max_workers=2, use_processes=use_processes)
+        
+        assert result.errors == {}
+        for path in config_paths:
+            assert result.configs[path].variables == AirflowConfig(path).variables
+    
+    def test_errors_do_not_abort_batch(self, config_paths, temp_dir):
+        """Test that failing files are reported per file"""
+        broken = os.path.join(temp_dir, "broken.py")
+        with open(broken, "w") as f:
+            f.write("HOST = (\n")
+        missing = os.path.join(temp_dir, "missing.py")
+        
+        for static in (False, True):
+            result = load_configs(config_paths + [broken, missing], static=static)
+            
+            assert list(result.configs) == config_paths
+            assert set(result.errors) == {broken, missing}
+            assert isinstance(result.errors[broken], ConfigFileError)
+
+
+class TestRegistryParallelLoad:
+    """Test ConfigRegistry.load_directory with workers"""
+    
+    def test_load_directory_parallel(self, config_paths, temp_dir):
+        """Test that parallel and sequential loads agree"""
+        registry = ConfigRegistry()
+        configs = registry.load_directory(temp_dir, max_workers=4)
+        
+        assert [config.config_file for config in configs] == sorted(config_paths)
+        assert len(registry.files_with_variable("DESTINATION_BQ_PROJECT")) == 4
+    
+    def test_load_directory_reports_failures(self, config_paths, temp_dir):
+        """Test that good files are registered when another fails"""
+        with open(os.path.join(temp_dir, "zz_broken.py"), "w") as f:
+            f.write("HOST = (\n")
+        registry = ConfigRegistry()
+        
+        with pytest.raises(ConfigFileError, match="zz_broken"):
+            registry.load_directory(temp_dir, max_workers=2)
+        assert len(registry) == 4
+
+
+class TestGenerateConfigs:
+    """Test generate_configs"""
+    
+    def test_generates_every_pipeline(self, temp_dir):
+        """Test writing a manifest of pipelines"""
+        manifest = {
+            f"pipeline_{i}": {"source": source, "destination": "bigquery"}
+            for i, source in enumerate(["postgresql", "mongodb", "sqlserver", "kafka"])
+        }
+        result = generate_configs(manifest, output_dir=os.path.join(temp_dir, "dags"), max_workers=4)
+        
+        assert result.errors == {}
+        assert list(result.files) == list(manifest)
+        generated = result.files["pipeline_0"]
+        assert generated.path == os.path.join(temp_dir, "dags", "pipeline_0.py")
+        assert generated.bytes == os.path.getsize(generated.path)
+        assert generated.written
+        assert result.total_bytes == sum(f.bytes for f in result.files.values())
+        assert AirflowConfig(generated.path).get_variable("SOURCE_POSTGRES_PORT") == 5432
+    
+    def test_does_not_reload_written_files(self, temp_dir, monkeypatch):
+        """Test that generated files are not loaded back"""
+        reload = MagicMock()
+        monkeypatch.setattr(AirflowConfig, "_load_existing_config", reload)
+        
+        generate_configs({"pipeline": {"source": "redis"}}, output_dir=temp_dir)
+        
+        reload.assert_not_called()
+    
+    def test_collects_errors(self, temp_dir):
+        """Test that failing pipelines are reported without aborting the batch"""
+        manifest = {
+            "good": {"source": "postgresql"},
+            "bad_template": {"source": "invalid_template"},
+            "../escape": {"source": "postgresql"},
+        }
+        result = generate_configs(manifest, output_dir=temp_dir)
+        
+        assert list(result.files) == ["good"]
+        assert isinstance(result.errors["bad_template"], TemplateNotFoundError)
+        assert isinstance(result.errors["../escape"], ConfigurationError)
+    
+    def test_incremental_skips_unchanged_files(self, temp_dir):
+        """Test that an incremental rerun reports untouched files"""
+        manifest = {"pipeline": {"source": "postgresql"}}
+        generate_configs(manifest, output_dir=temp_dir)
+        
+        result = generate_configs(manifest, output_dir=temp_dir, incremental=True)
+        
+        assert result.files["pipeline"].written is False
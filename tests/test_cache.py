@@ -0,0 +1,128 @@
+"""
+Tests for the process-wide Variable cache
+"""
+from unittest.mock import MagicMock
+
+import pytest
+from airflow.models import Variable
+from airflow_config.cache import VariableCache, variable_cache
+from airflow_config.exceptions import ConfigurationError
+from airflow_config.runtime import load_variables
+from airflow_config.utils import TemplateGenerator
+
+
+class FakeClock:
+    """Manually advanced time source"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def stored_variables(monkeypatch):
+    """Variables stored in the mocked metadata DB"""
+    stored = {"postgres_host": "db.internal"}
+    monkeypatch.setattr(Variable, "get", MagicMock(side_effect=lambda k, default_var=None: stored.get(k, default_var)))
+    return stored
+
+
+class TestVariableCache:
+    """Test VariableCache"""
+    
+    def test_hits_and_misses(self, stored_variables):
+        """Test that repeated lookups are served from the cache"""
+        cache = VariableCache(ttl=60)
+        
+        assert cache.get("postgres_host") == "db.internal"
+        assert cache.get("postgres_host") == "db.internal"
+        
+        assert Variable.get.call_count == 1
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1}
+    
+    def test_missing_variable_uses_caller_default(self, stored_variables):
+        """Test that missing keys are cached without storing the default"""
+        cache = VariableCache(ttl=60)
+        
+        assert cache.get("postgres_port", default_var="5432") == "5432"
+        assert cache.get("postgres_port", default_var="6543") == "6543"
+        assert Variable.get.call_count == 1
+    
+    def test_ttl_expiry(self, stored_variables):
+        """Test that entries are refetched after the TTL"""
+        clock = FakeClock()
+        cache = VariableCache(ttl=10, clock=clock)
+        
+        cache.get("postgres_host")
+        clock.now = 11
+        stored_variables["postgres_host"] = "db2.internal"
+        
+        assert cache.get("postgres_host") == "db2.internal"
+        assert Variable.get.call_count == 2
+    
+    def test_lru_eviction(self, stored_variables):
+        """Test that the least recently used entry is evicted"""
+        cache = VariableCache(ttl=60, maxsize=2)
+        
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")
+        
+        _, missing = cache.get_many(["a", "b", "c"])
+        assert missing == ["b"]
+        assert cache.stats()["evictions"] == 1
+    
+    def test_zero_ttl_disables_caching(self, stored_variables):
+        """Test that a TTL of 0 always goes to Airflow"""
+        cache = VariableCache(ttl=0)
+        
+        cache.get("postgres_host")
+        cache.get("postgres_host")
+        
+        assert Variable.get.call_count == 2
+        assert len(cache) == 0
+    
+    def test_invalid_configuration(self):
+        """Test validation of TTL and maxsize"""
+        with pytest.raises(ConfigurationError):
+            VariableCache(ttl=-1)
+        with pytest.raises(ConfigurationError):
+            VariableCache(maxsize=0)
+    
+    def test_load_variables_only_fetches_misses(self, stored_variables):
+        """Test that the batch loader goes through the cache"""
+        cache = VariableCache(ttl=60)
+        cache.set("postgres_port", "6543")
+        
+        values = load_variables(["postgres_host", "postgres_port", "postgres_db"], cache=cache)
+        
+        assert values == {"postgres_host": "db.internal", "postgres_port": "6543"}
+        assert Variable.get.call_count == 2
+        assert load_variables(["postgres_host", "postgres_db"], cache=cache) == {"postgres_host": "db.internal"}
+        assert Variable.get.call_count == 2
+
+
+class TestCachedGeneration:
+    """Test generated files that use the shared cache"""
+    
+    def test_eager_config_reimport_hits_cache(self, tmp_path, stored_variables):
+        """Test that importing the same config twice only fetches once"""
+        variable_cache.clear()
+        config_file = tmp_path / "cached_config.py"
+        TemplateGenerator(use_cache=True).create_config({"source": "postgresql"}, str(config_file))
+        
+        content = config_file.read_text()
+        assert "from airflow_config.cache import variable_cache" in content
+        assert 'variable_cache.get("postgres_host", default_var="localhost")' in content
+        
+        for _ in range(2):
+            namespace = {}
+            exec(compile(content, str(config_file), "exec"), namespace)
+        
+        assert namespace["SOURCE_POSTGRES_HOST"] == "db.internal"
+        assert Variable.get.call_count == 7
+        assert variable_cache.stats()["hits"] == 7
+        variable_cache.clear()
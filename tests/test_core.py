@@ -55,7 +55,7 @@ import pytest
 import os
 import sys
 import importlib.util
-from airflow_config import AirflowConfig
+from airflow_config import AirflowConfig, TemplateGenerator
 
 class TestAirflowConfig:
     
@@ -114,4 +114,14 @@ class TestAirflowConfig:
         
         # Verify variables are present as globals
         assert hasattr(module, "SOURCE_POSTGRES_HOST")
-        assert hasattr(module, "DESTINATION_BQ_PROJECT")
\ No newline at end of file
+        assert hasattr(module, "DESTINATION_BQ_PROJECT")
+
+    def test_load_lazy_config(self, temp_dir):
+        """Test that lazily resolved variables are loaded"""
+        config_path = os.path.join(temp_dir, "lazy_config.py")
+        AirflowConfig(config_path, TemplateGenerator(fetch_mode="lazy")).create_etl_pipeline("postgresql", "redis")
+
+        config = AirflowConfig(config_path)
+
+        assert config.get_variable("SOURCE_POSTGRES_PORT") == 5432
+        assert config.get_connection_params("destination")["redis_host"] == "redis"
@@ -0,0 +1,161 @@
+"""
+Tests for structural diffs between configs and config files
+"""
+import os
+import shutil
+from collections import OrderedDict
+
+import pytest
+from airflow_config import AirflowConfig, TemplateGenerator, diff_directories, diff_files
+from airflow_config import diff
+from airflow_config.diff import diff_variables
+from airflow_config.exceptions import ConfigFileError
+from airflow_config.static import VariableSpec
+
+from .conftest import rewrite
+
+
+@pytest.fixture
+def config_pair(temp_dir):
+    """Two copies of a generated config with a source and a destination section"""
+    old = os.path.join(temp_dir, "old.py")
+    new = os.path.join(temp_dir, "new.py")
+    TemplateGenerator().create_config({"source": "postgresql", "destination": "bigquery"}, old)
+    shutil.copy(old, new)
+    return old, new
+
+
+class TestDiffVariables:
+    """Test diff_variables"""
+    
+    def test_added_removed_changed(self):
+        """Test every kind of change, with type-sensitive comparison"""
+        diff = diff_variables({"A": 1, "B": "x", "C": 5432}, {"A": 1, "C": "5432", "D": True})
+        
+        assert diff.added == {"D": True}
+        assert diff.removed == {"B": "x"}
+        assert diff.changed == {"C": (5432, "5432")}
+        assert diff.keys == ["D", "B", "C"]
+        assert diff.has_changes
+        assert not diff_variables({"A": 1}, {"A": 1}).has_changes
+    
+    def test_airflow_config_diff(self, config_pair):
+        """Test comparing loaded configs"""
+        old, new = config_pair
+        rewrite(new, 'default_var="5432"', 'default_var="6543"')
+        
+        diff = AirflowConfig(old).diff(AirflowConfig(new))
+        
+        assert diff.changed == {"SOURCE_POSTGRES_PORT": (5432, 6543)}
+        assert (diff.old_file, diff.new_file) == (old, new)
+
+
+class TestDiffFiles:
+    """Test diff_files"""
+    
+    def test_identical_files(self, config_pair):
+        """Test that identical files produce an empty diff"""
+        diff = diff_files(*config_pair)
+        
+        assert not diff.has_changes
+        assert diff.sections == []
+    
+    def test_only_differing_sections_are_compared(self, config_pair):
+        """Test that changed sections are reported with the specs of each side"""
+        old, new = config_pair
+        rewrite(new, '"bq_project", default_var=', '"bq_project_id", default_var=')
+        TemplateGenerator().create_config({"cache": "redis"}, new, incremental=True)
+        
+        diff = diff_files(old, new)
+        
+        assert diff.sections == ["DESTINATION", "CACHE"]
+        old_spec, new_spec = diff.changed["DESTINATION_BQ_PROJECT"]
+        assert (old_spec.key, new_spec.key) == ("bq_project", "bq_project_id")
+        assert old_spec.value == new_spec.value
+        assert "CACHE_REDIS_HOST" in diff.added
+        assert diff.removed == {}
+    
+    def test_removed_section(self, config_pair):
+        """Test that variables of a dropped section are removed"""
+        old, new = config_pair
+        TemplateGenerator().create_config({"source": "postgresql"}, new)
+        
+        diff = diff_files(old, new)
+        
+        assert diff.added == diff.changed == {}
+        assert all(name.startswith("DESTINATION_") for name in diff.removed)
+        assert isinstance(diff.removed["DESTINATION_BQ_PROJECT"], VariableSpec)
+    
+    def test_frozen_json(self, config_pair, temp_dir):
+        """Test comparing a config with its frozen JSON copy by value"""
+        old, _ = config_pair
+        frozen = os.path.join(temp_dir, "frozen.json")
+        AirflowConfig(old, static=True).freeze(frozen, resolver=lambda keys: {"postgres_host": "db.prod"})
+        
+        diff = diff_files(old, frozen)
+        
+        assert diff.changed == {"SOURCE_POSTGRES_HOST": ("localhost", "db.prod")}
+    
+    def test_frozen_py(self, config_pair, temp_dir):
+        """Test comparing a config with its frozen .py copy by value"""
+        old, _ = config_pair
+        frozen = os.path.join(temp_dir, "frozen.py")
+        AirflowConfig(old, static=True).freeze(frozen, resolver=lambda keys: {"postgres_host": "db.prod"})
+        
+        diff = diff_files(old, frozen)
+        
+        assert diff.keys == ["SOURCE_POSTGRES_HOST"]
+        assert diff.changed == {"SOURCE_POSTGRES_HOST": ("localhost", "db.prod")}
+    
+    def test_fingerprint_cache_is_bounded(self, config_pair, temp_dir, monkeypatch):
+        """Test that the least recently used fingerprints are dropped"""
+        monkeypatch.setattr(diff, "FINGERPRINT_CACHE_SIZE", 2)
+        monkeypatch.setattr(diff, "_fingerprints", OrderedDict())
+        other = os.path.join(temp_dir, "other.py")
+        shutil.copy(config_pair[0], other)
+        
+        diff_files(config_pair[0], config_pair[1])
+        diff_files(config_pair[0], other)
+        
+        assert [os.path.basename(path) for path in diff._fingerprints] == ["old.py", "other.py"]
+    
+    def test_missing_file(self, config_pair, temp_dir):
+        """Test that a missing file raises ConfigFileError"""
+        with pytest.raises(ConfigFileError):
+            diff_files(config_pair[0], os.path.join(temp_dir, "missing.py"))
+
+
+class TestDiffDirectories:
+    """Test diff_directories"""
+    
+    def test_many_files(self, temp_dir):
+        """Test diffing directories with changed, identical and one-sided files"""
+        old_dir = os.path.join(temp_dir, "old")
+        new_dir = os.path.join(temp_dir, "new")
+        os.makedirs(old_dir)
+        os.makedirs(new_dir)
+        generator = TemplateGenerator()
+        for i in range(20):
+            generator.create_config({"source": "postgresql"}, os.path.join(old_dir, f"pipeline_{i}.py"))
+            shutil.copy(os.path.join(old_dir, f"pipeline_{i}.py"), new_dir)
+        rewrite(os.path.join(new_dir, "pipeline_3.py"), 'default_var="5432"', 'default_var="5433"')
+        os.remove(os.path.join(new_dir, "pipeline_7.py"))
+        generator.create_config({"cache": "redis"}, os.path.join(new_dir, "extra.py"))
+        with open(os.path.join(new_dir, "broken.py"), "w") as f:
+            f.write("X = = 1\n")
+        with open(os.path.join(old_dir, "broken.py"), "w") as f:
+            f.write("X = 1\n")
+        
+        result = diff_directories(old_dir, new_dir, max_workers=4)
+        
+        assert len(result.diffs) == 21
+        assert set(result.changed) == {"pipeline_3.py", "pipeline_7.py", "extra.py"}
+        assert list(result.changed["pipeline_3.py"].changed) == ["SOURCE_POSTGRES_PORT"]
+        assert result.changed["pipeline_7.py"].new_file is None
+        assert "CACHE_REDIS_HOST" in result.changed["extra.py"].added
+        assert list(result.errors) == ["broken.py"]
+    
+    def test_missing_directory(self, temp_dir):
+        """Test that a missing directory raises ConfigFileError"""
+        with pytest.raises(ConfigFileError):
+            diff_directories(temp_dir, os.path.join(temp_dir, "missing"))
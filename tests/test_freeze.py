@@ -0,0 +1,102 @@
+"""
+Tests for frozen configuration export
+"""
+import json
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from airflow_config import AirflowConfig, TemplateGenerator
+from airflow_config.exceptions import ConfigurationError, TemplateNotFoundError
+from airflow_config.secrets import LocalFileSecretsBackend, secret_resolver
+
+
+@pytest.fixture
+def resolver():
+    """Resolver returning a few stored values"""
+    stored = {"postgres_host": "db.prod", "postgres_port": "6543", "bq_project": "prod-project"}
+    return MagicMock(side_effect=lambda keys: {k: stored[k] for k in keys if k in stored})
+
+
+class TestFreezeConfig:
+    """Test TemplateGenerator.freeze_config"""
+    
+    def test_constant_only_module(self, temp_dir, resolver):
+        """Test that the frozen module holds resolved constants and imports nothing"""
+        output = os.path.join(temp_dir, "config.py")
+        TemplateGenerator().freeze_config({"source": "postgresql", "destination": "bigquery"}, output, resolver)
+        
+        with open(output) as f:
+            content = f.read()
+        assert "import" not in content
+        assert "# SECTION: SOURCE (POSTGRESQL)" in content
+        assert "SOURCE_POSTGRES_PORT = 6543" in content
+        resolver.assert_called_once()
+        
+        namespace = {}
+        exec(compile(content, output, "exec"), namespace)
+        assert namespace["SOURCE_POSTGRES_HOST"] == "db.prod"
+        assert namespace["DESTINATION_BQ_PROJECT"] == "prod-project"
+        assert namespace["SOURCE_POSTGRES_DB"] == "airflow"
+    
+    def test_json_blob(self, temp_dir, resolver):
+        """Test freezing to JSON and loading it back"""
+        output = os.path.join(temp_dir, "config.json")
+        TemplateGenerator().freeze_config({"source": "postgresql"}, output, resolver)
+        
+        with open(output) as f:
+            assert json.load(f)["SOURCE_POSTGRES_PORT"] == 6543
+        config = AirflowConfig(output)
+        assert config.get_variable("SOURCE_POSTGRES_HOST") == "db.prod"
+        assert config.sections == {"SOURCE": "postgresql"}
+        assert not config.variable_exists("__sections__")
+    
+    def test_invalid_format(self, temp_dir, resolver):
+        """Test that unknown formats are rejected"""
+        with pytest.raises(ConfigurationError):
+            TemplateGenerator().freeze_config({"source": "postgresql"}, os.path.join(temp_dir, "c.py"),
+                                              resolver, output_format="msgpack")
+    
+    def test_invalid_template(self, temp_dir, resolver):
+        """Test that unknown templates are rejected before resolving"""
+        with pytest.raises(TemplateNotFoundError):
+            TemplateGenerator().freeze_config({"source": "invalid"}, os.path.join(temp_dir, "c.py"), resolver)
+        resolver.assert_not_called()
+    
+    def test_default_resolver_uses_secret_resolver(self, temp_dir):
+        """Test that the default resolver goes through the process-wide SecretResolver"""
+        secrets_file = os.path.join(temp_dir, "secrets.json")
+        with open(secrets_file, "w") as f:
+            json.dump({"postgres_password": "s3cr3t"}, f)
+        previous = secret_resolver.backend
+        secret_resolver.configure(backend=LocalFileSecretsBackend(secrets_file))
+        try:
+            output = os.path.join(temp_dir, "config.json")
+            TemplateGenerator().freeze_config({"source": "postgresql"}, output)
+        finally:
+            secret_resolver.configure(backend=previous)
+        
+        assert AirflowConfig(output).get_variable("SOURCE_POSTGRES_PASSWORD") == "s3cr3t"
+
+
+class TestAirflowConfigFreeze:
+    """Test AirflowConfig.freeze"""
+    
+    @pytest.mark.parametrize("fetch_mode", ["eager", "batched", "lazy"])
+    def test_freeze_generated_file(self, temp_dir, resolver, fetch_mode):
+        """Test freezing a generated config in every fetch mode"""
+        config_file = os.path.join(temp_dir, "config.py")
+        config = AirflowConfig(config_file, TemplateGenerator(fetch_mode=fetch_mode), static=True)
+        config.create_etl_pipeline("postgresql", "bigquery")
+        output = os.path.join(temp_dir, "frozen.py")
+        
+        config.freeze(output, resolver)
+        
+        frozen = AirflowConfig(output, static=True)
+        assert frozen.get_variable("SOURCE_POSTGRES_PORT") == 6543
+        assert frozen.get_variable("DESTINATION_BQ_PROJECT") == "prod-project"
+        assert set(frozen.variables) == set(config.variables)
+        with open(output) as f:
+            content = f.read()
+        assert "# SECTION: DESTINATION (BIGQUERY)" in content
+        assert "Variable" not in content
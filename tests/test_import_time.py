@@ -0,0 +1,81 @@
+"""
+Import-time regression tests for the airflow_config package
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+import airflow_config
+
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(airflow_config.__file__)))
+
+# Modules that must not be loaded by a plain ``import airflow_config``
+HEAVY_MODULES = [
+    "airflow_config.core",
+    "airflow_config.utils",
+    "airflow_config.bulk",
+    "airflow_config.diff",
+    "airflow_config.registry",
+    "airflow_config.scaffold",
+    "airflow_config.schema",
+    "airflow_config.watch",
+    "concurrent.futures.process",
+]
+
+
+def importtime(code):
+    """Run code with ``-X importtime`` and return {module: cumulative microseconds}"""
+    env = dict(os.environ, PYTHONPATH=PACKAGE_PARENT)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            env=env, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestPackageImportTime:
+    """Test that importing the package stays cheap"""
+    
+    def test_import_does_not_load_submodules(self):
+        """Test that public names are not imported eagerly"""
+        modules = importtime("import airflow_config")
+        
+        assert "airflow_config" in modules
+        loaded = [name for name in HEAVY_MODULES if name in modules]
+        assert loaded == []
+    
+    def test_attribute_loads_only_its_module(self):
+        """Test that resolving one public name imports its module and nothing heavier"""
+        env = dict(os.environ, PYTHONPATH=PACKAGE_PARENT)
+        code = "import sys, airflow_config; airflow_config.diff_files; print('\\n'.join(sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        modules = result.stdout.split()
+        
+        assert "airflow_config.diff" in modules
+        loaded = [name for name in HEAVY_MODULES if name in modules and name != "airflow_config.diff"]
+        assert loaded == []
+
+
+class TestLazyAttributes:
+    """Test PEP 562 access to the public names"""
+    
+    def test_public_names_resolve(self):
+        """Test that every name in __all__ is available"""
+        for name in airflow_config.__all__:
+            assert getattr(airflow_config, name) is not None
+        
+        from airflow_config.core import AirflowConfig
+        assert airflow_config.AirflowConfig is AirflowConfig
+        assert "AirflowConfig" in dir(airflow_config)
+    
+    def test_unknown_name(self):
+        """Test that unknown names still raise AttributeError"""
+        with pytest.raises(AttributeError):
+            airflow_config.DoesNotExist
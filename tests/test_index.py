@@ -0,0 +1,191 @@
+"""
+Tests for the variable prefix index
+"""
+import pickle
+
+from airflow_config import AirflowConfig
+from airflow_config.index import IndexedVariables, PrefixIndex, SectionClassifier
+from airflow_config.query import AirflowConfigQueryMixin
+
+
+class TestPrefixIndex:
+    """Test PrefixIndex"""
+    
+    def test_keys_with_prefix_keeps_insertion_order(self):
+        """Test prefix lookups return names in insertion order"""
+        index = PrefixIndex(["SOURCE_PORT", "DEST_HOST", "SOURCE_HOST", "SOURCES_X"])
+        
+        assert index.keys_with_prefix("SOURCE_") == ["SOURCE_PORT", "SOURCE_HOST"]
+        assert index.keys_with_prefix("MISSING_") == []
+    
+    def test_has_prefix(self):
+        """Test section existence checks"""
+        index = PrefixIndex(["MAIN_DB_POSTGRES_HOST"])
+        
+        assert index.has_prefix("MAIN_")
+        assert index.has_prefix("MAIN_DB_")
+        assert index.has_prefix("MAIN_D")
+        assert not index.has_prefix("DB_")
+        
+        index.discard("MAIN_DB_POSTGRES_HOST")
+        assert not index.has_prefix("MAIN_DB_")
+        assert len(index) == 0
+    
+    def test_readded_name_goes_last(self):
+        """Test that a removed and re-added name takes a new insertion position"""
+        index = PrefixIndex(["A_2", "A_1", "A_2"])
+        index.add("A_3")
+        index.add("A_1")
+        
+        assert index.keys_with_prefix("A_") == ["A_2", "A_1", "A_3"]
+        index.discard("A_2")
+        index.add("A_2")
+        assert index.keys_with_prefix("A_") == ["A_1", "A_3", "A_2"]
+        assert "A_2" in index and "A_4" not in index
+
+
+class TestIndexedVariables:
+    """Test IndexedVariables"""
+    
+    def test_mutations_update_index(self):
+        """Test that every dict mutator keeps the index in sync"""
+        variables = IndexedVariables({"A_1": 1})
+        variables["A_2"] = 2
+        variables.update({"B_1": 3}, C_1=4)
+        variables.setdefault("A_3", 5)
+        variables |= {"D_1": 6}
+        
+        assert variables.keys_with_prefix("A_") == ["A_1", "A_2", "A_3"]
+        assert variables.has_prefix("D_")
+        
+        del variables["A_1"]
+        variables.pop("B_1")
+        assert variables.keys_with_prefix("A_") == ["A_2", "A_3"]
+        assert not variables.has_prefix("B_")
+        
+        variables.clear()
+        assert not variables.has_prefix("A_")
+    
+    def test_bulk_update(self):
+        """Test that large updates rebuild the index with the same results as single inserts"""
+        variables = IndexedVariables({"A_0": 0, "B_0": 0})
+        tally = variables.tally(SectionClassifier({"A_": "a"}))
+        items = {f"A_{i}": i for i in range(100, 0, -1)}
+        items["__DOC_A_1"] = "First"
+        
+        variables.update(items)
+        
+        assert variables.keys_with_prefix("A_")[:3] == ["A_0", "A_100", "A_99"]
+        assert len(variables.keys_with_prefix("A_")) == 101
+        assert variables.get_doc("A_1") == "First"
+        assert "__DOC_A_1" not in variables
+        assert tally.counts == {"a": 101, "custom": 1}
+    
+    def test_pickle_round_trip(self):
+        """Test that the index and docs survive pickling"""
+        variables = IndexedVariables({"A_1": 1})
+        variables.set_doc("A_1", "First")
+        variables = pickle.loads(pickle.dumps(variables))
+        
+        assert variables.keys_with_prefix("A_") == ["A_1"]
+        assert variables.get_doc("A_1") == "First"
+    
+    def test_docs_are_not_variables(self):
+        """Test that documentation, including legacy __DOC_ keys, stays out of the dict"""
+        variables = IndexedVariables({"A_1": 1, "__DOC_A_1": "First"})
+        variables["A_2"] = 2
+        variables["__DOC_A_2"] = "Second"
+        
+        assert list(variables) == ["A_1", "A_2"]
+        assert variables.docs == {"A_1": "First", "A_2": "Second"}
+        assert variables.copy().get_doc("A_2") == "Second"
+        
+        del variables["A_1"]
+        variables.set_doc("A_2", None)
+        assert variables.docs == {}
+
+
+class TestSectionClassifier:
+    """Test SectionClassifier and the tallies kept by IndexedVariables"""
+    
+    def test_longest_prefix_wins(self):
+        """Test that nested prefixes resolve to the most specific section"""
+        classifier = SectionClassifier({"airflow": "core", "airflow_db": "database"}, ignore_case=True)
+        
+        assert classifier.classify("AIRFLOW_DB_HOST") == "database"
+        assert classifier.classify("AIRFLOW_HOME") == "core"
+        assert classifier.classify("SOURCE_HOST") == "custom"
+    
+    def test_tally_follows_mutations(self):
+        """Test that counts are updated on insert and delete"""
+        classifier = SectionClassifier({"DB_": "database"})
+        variables = IndexedVariables({"DB_HOST": "h", "OTHER": 1})
+        tally = variables.tally(classifier)
+        
+        assert tally.counts == {"database": 1, "custom": 1}
+        variables["DB_PORT"] = 5432
+        variables["DB_PORT"] = 5433
+        del variables["OTHER"]
+        
+        assert variables.tally(classifier) is tally
+        assert tally.counts == {"database": 2}
+        assert variables.pop("MISSING", None) is None
+        assert tally.counts == {"database": 2}
+        variables.clear()
+        assert tally.counts == {}
+
+
+class TestAirflowConfigIndex:
+    """Test indexed lookups in AirflowConfig"""
+    
+    def test_lookups_follow_mutations(self, generated_config_file):
+        """Test that queries see variables added after loading"""
+        config = AirflowConfig(generated_config_file)
+        config.variables["EXTRA_API_KEY"] = "secret"
+        
+        assert config.validate_section("extra")
+        assert config.get_connection_params("extra") == {"api_key": "secret"}
+        assert config.get_variables_by_prefix("SOURCE_POSTGRES_P") == {
+            "SOURCE_POSTGRES_PORT": 5432,
+            "SOURCE_POSTGRES_PASSWORD": "airflow",
+        }
+    
+    def test_config_summary(self, generated_config_file):
+        """Test that summary counts follow variables added after the first summary"""
+        config = AirflowConfig(generated_config_file)
+        summary = config.get_config_summary()
+        
+        assert list(summary) == ["database", "email", "scheduling", "monitoring", "dags", "custom"]
+        assert summary["custom"] == len(config.variables)
+        config.variables["AIRFLOW_DB_HOST"] = "db"
+        config.variables["AIRFLOW__SMTP__SMTP_HOST"] = "smtp"
+        
+        summary = config.get_config_summary()
+        assert summary["database"] == summary["email"] == 1
+        assert sum(summary.values()) == len(config.variables)
+
+
+class PlainDictConfig(AirflowConfigQueryMixin):
+    """Query mixin over a plain dict with legacy __DOC_ entries"""
+    
+    def __init__(self, variables):
+        self.variables = variables
+
+
+class TestPlainDictQueries:
+    """Test that the query mixin still works without an index"""
+    
+    def test_variables_by_prefix(self):
+        """Test prefix lookups scan a plain dict and skip doc entries"""
+        config = PlainDictConfig({"SOURCE_HOST": "db", "__DOC_SOURCE_HOST": "Host", "TARGET_HOST": "bq", "SOURCE_PORT": 5432})
+        
+        assert config.get_variables_by_prefix("SOURCE_") == {"SOURCE_HOST": "db", "SOURCE_PORT": 5432}
+        assert config.get_variables_by_prefix("__DOC_") == {}
+    
+    def test_config_summary(self):
+        """Test that the summary classifies a plain dict and skips doc entries"""
+        config = PlainDictConfig({"AIRFLOW_DB_HOST": "db", "__DOC_AIRFLOW_DB_HOST": "Host", "AIRFLOW__EMAIL__FROM": "a@b.c", "EXTRA": 1})
+        
+        assert config.get_config_summary() == {
+            "database": 1, "email": 1, "scheduling": 0, "monitoring": 0, "dags": 0, "custom": 1,
+        }
@@ -0,0 +1,145 @@
+"""
+Tests for import-time profiling of generated config modules
+"""
+import socket
+
+import pytest
+from airflow_config import AirflowConfig, TemplateGenerator
+from airflow_config.profiling import LoadProfiler, emit_statsd
+
+
+class FakeClock:
+    """Clock advancing one second per call"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+def exec_config(path, name="config"):
+    """Execute a generated config and return its namespace"""
+    namespace = {"__name__": name}
+    with open(path) as f:
+        exec(compile(f.read(), str(path), "exec"), namespace)
+    return namespace
+
+
+class TestLoadProfiler:
+    """Test LoadProfiler"""
+    
+    def test_instrument_records_each_fetch(self):
+        """Test per-key timings and lookup counts"""
+        profiler = LoadProfiler("config", statsd_target="", clock=FakeClock())
+        source = profiler.instrument({"postgres_host": "db"})
+        
+        assert source.get("postgres_host") == "db"
+        assert source.get("postgres_host") == "db"
+        assert source.get("postgres_port", "5432") == "5432"
+        with profiler.measure("load_variables"):
+            pass
+        profiler.finish()
+        
+        stats = profiler.stats()
+        assert stats["lookups"] == 3
+        assert stats["variables"]["postgres_host"] == {"count": 2, "time": 2.0}
+        assert stats["batches"] == {"load_variables": 1.0}
+        assert stats["fetch_time"] == 4.0
+        assert stats["import_time"] is not None
+    
+    def test_statsd_lines(self):
+        """Test the StatsD line format"""
+        profiler = LoadProfiler("dags.my-config", statsd_target="", clock=FakeClock())
+        profiler.record("postgres_host", 0.002)
+        profiler.finish()
+        
+        lines = profiler.statsd_lines()
+        assert lines[0].startswith("airflow_config.dags.my-config.import_time:")
+        assert "airflow_config.dags.my-config.lookups:1|c" in lines
+        assert "airflow_config.dags.my-config.variable.postgres_host:2.000|ms" in lines
+    
+    def test_emit_to_file(self, tmp_path):
+        """Test appending StatsD lines to a file"""
+        path = tmp_path / "stats.log"
+        profiler = LoadProfiler("config", statsd_target=f"file://{path}")
+        profiler.finish()
+        
+        assert "airflow_config.config.import_time:" in path.read_text()
+    
+    def test_emit_to_udp(self):
+        """Test sending StatsD lines to a local UDP socket"""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver:
+            receiver.bind(("127.0.0.1", 0))
+            receiver.settimeout(5)
+            port = receiver.getsockname()[1]
+            
+            emit_statsd(["a.b:1|c"], f"udp://127.0.0.1:{port}")
+            
+            assert receiver.recv(1024) == b"a.b:1|c"
+    
+    def test_emission_errors_do_not_break_import(self, tmp_path):
+        """Test that an unwritable target only logs a warning"""
+        profiler = LoadProfiler("config", statsd_target=str(tmp_path / "missing" / "stats.log"))
+        
+        profiler.finish()
+        
+        assert profiler.import_time is not None
+
+
+class TestProfiledConfigs:
+    """Test configs generated with profile=True"""
+    
+    @pytest.mark.parametrize("options", [
+        {},
+        {"fetch_mode": "batched"},
+        {"use_cache": True},
+        {"env_first": True},
+        {"batch_secrets": True},
+    ])
+    def test_get_load_stats(self, tmp_path, options):
+        """Test that the module reports its import time and every lookup"""
+        config_file = tmp_path / "config.py"
+        TemplateGenerator(profile=True, **options).create_config({"source": "postgresql"}, str(config_file))
+        
+        namespace = exec_config(config_file)
+        stats = namespace["get_load_stats"]()
+        
+        assert stats["module"] == "config"
+        assert stats["import_time"] > 0
+        assert "postgres_host" in stats["variables"]
+        assert stats["lookups"] >= 6
+        assert namespace["SOURCE_POSTGRES_PORT"] == 5432
+    
+    def test_lazy_config_records_fetches_on_access(self, tmp_path):
+        """Test that lazily resolved variables are recorded when first accessed"""
+        config_file = tmp_path / "config.py"
+        TemplateGenerator(fetch_mode="lazy", profile=True).create_config({"source": "postgresql"}, str(config_file))
+        
+        namespace = exec_config(config_file)
+        assert namespace["get_load_stats"]()["lookups"] == 0
+        namespace["__getattr__"]("SOURCE_POSTGRES_HOST")
+        
+        assert namespace["get_load_stats"]()["variables"]["postgres_host"]["count"] == 1
+    
+    def test_incremental_keeps_one_footer(self, tmp_path):
+        """Test that section updates keep the finish() call at the end"""
+        config_file = tmp_path / "config.py"
+        generator = TemplateGenerator(profile=True)
+        generator.create_config({"source": "postgresql"}, str(config_file))
+        
+        generator.create_config({"destination": "bigquery"}, str(config_file), incremental=True)
+        
+        content = config_file.read_text()
+        assert content.count("_PROFILER.finish()") == 1
+        assert content.endswith("_PROFILER.finish()\n")
+        assert content.index("# SECTION: DESTINATION") < content.index("_PROFILER.finish()")
+        assert not generator.create_config({"destination": "bigquery"}, str(config_file), incremental=True)
+    
+    def test_profiled_config_loads(self, tmp_path):
+        """Test that profiled configs load with exec and static parsing"""
+        config_file = str(tmp_path / "config.py")
+        TemplateGenerator(profile=True).create_config({"source": "postgresql"}, config_file)
+        
+        assert AirflowConfig(config_file).variables == AirflowConfig(config_file, static=True).variables
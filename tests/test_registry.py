@@ -0,0 +1,77 @@
+"""
+Tests for the multi-file config registry
+"""
+import os
+
+import pytest
+from airflow_config import AirflowConfig, ConfigRegistry
+from airflow_config.exceptions import ConfigFileError
+
+
+@pytest.fixture
+def config_dir(temp_dir):
+    """Directory with three generated pipeline configs"""
+    pipelines = {
+        "orders.py": ("postgresql", "bigquery"),
+        "events.py": ("kafka", "bigquery"),
+        "cache.py": ("postgresql", "redis"),
+    }
+    for file_name, (source, destination) in pipelines.items():
+        AirflowConfig(os.path.join(temp_dir, file_name)).create_etl_pipeline(source, destination)
+    open(os.path.join(temp_dir, "__init__.py"), "w").close()
+    return temp_dir
+
+
+class TestConfigRegistry:
+    """Test ConfigRegistry"""
+    
+    def test_load_directory(self, config_dir):
+        """Test loading every config of a directory"""
+        registry = ConfigRegistry()
+        configs = registry.load_directory(config_dir)
+        
+        assert len(configs) == 3
+        assert len(registry) == 3
+        assert os.path.join(config_dir, "orders.py") in registry
+        assert "SOURCE_POSTGRES_HOST" in registry.list_variables()
+    
+    def test_cross_file_lookups(self, config_dir):
+        """Test finding variables across files"""
+        registry = ConfigRegistry(static=True)
+        registry.load_directory(config_dir)
+        
+        hosts = registry.find("SOURCE_POSTGRES_HOST")
+        assert sorted(os.path.basename(path) for path in hosts) == ["cache.py", "orders.py"]
+        assert set(hosts.values()) == {"localhost"}
+        assert list(registry.find_prefix("DESTINATION_REDIS_")) == [os.path.join(config_dir, "cache.py")]
+        assert registry.find("MISSING") == {}
+    
+    def test_values_are_shared_between_files(self, config_dir):
+        """Test that equal values are stored once"""
+        registry = ConfigRegistry()
+        registry.load_directory(config_dir)
+        
+        orders = registry.get_config(os.path.join(config_dir, "orders.py"))
+        events = registry.get_config(os.path.join(config_dir, "events.py"))
+        
+        assert orders.variables["DESTINATION_BQ_PROJECT"] is events.variables["DESTINATION_BQ_PROJECT"]
+        assert orders.variables["SOURCE_POSTGRES_PORT"] is not True
+    
+    def test_reload_and_remove(self, config_dir):
+        """Test that reloading a file does not duplicate index entries"""
+        registry = ConfigRegistry()
+        path = os.path.join(config_dir, "events.py")
+        registry.add(path)
+        registry.add(path)
+        
+        assert registry.files_with_variable("SOURCE_KAFKA_TOPIC") == [path]
+        
+        registry.remove(path)
+        assert registry.files_with_variable("SOURCE_KAFKA_TOPIC") == []
+        with pytest.raises(ConfigFileError):
+            registry.get_config(path)
+    
+    def test_missing_directory(self, temp_dir):
+        """Test loading a directory that does not exist"""
+        with pytest.raises(ConfigFileError):
+            ConfigRegistry().load_directory(os.path.join(temp_dir, "missing"))
@@ -0,0 +1,96 @@
+"""
+Tests for runtime helpers used by generated configuration files
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from airflow.models import Variable
+from airflow_config.runtime import EnvVariables, convert_value, lazy_module, load_variables
+
+
+class TestLoadVariables:
+    """Test bulk variable loading"""
+    
+    def test_missing_keys_are_left_out(self):
+        """Test that keys without a value fall back to defaults"""
+        assert load_variables(["postgres_host", "postgres_port"]) == {}
+    
+    def test_fallback_uses_variable_get(self, monkeypatch):
+        """Test the per-key fallback when the DB cannot be queried"""
+        stored = {"postgres_host": "db.internal"}
+        monkeypatch.setattr(Variable, "get", MagicMock(side_effect=lambda k, default_var=None: stored.get(k, default_var)))
+        
+        values = load_variables(["postgres_host", "postgres_port", "postgres_host"])
+        
+        assert values == {"postgres_host": "db.internal"}
+        assert Variable.get.call_count == 2
+    
+    def test_environment_overrides(self, monkeypatch):
+        """Test that AIRFLOW_VAR_* environment variables take precedence"""
+        monkeypatch.setenv("AIRFLOW_VAR_POSTGRES_PORT", "6543")
+        
+        assert load_variables(["postgres_port"]) == {"postgres_port": "6543"}
+
+
+class TestEnvVariables:
+    """Test the environment-variable fast path"""
+    
+    def test_env_hit_skips_fetch(self):
+        """Test that keys set in the environment never reach the DB"""
+        fetch = MagicMock(side_effect=lambda k, default_var=None: default_var)
+        env = EnvVariables(fetch, environ={"AIRFLOW_VAR_POSTGRES_HOST": "db.env", "PATH": "/bin"})
+        
+        assert env.get("postgres_host", default_var="localhost") == "db.env"
+        assert env.get("postgres_port", default_var="5432") == "5432"
+        assert fetch.call_count == 1
+        assert env.stats() == {'env': 1, 'db': 1}
+    
+    def test_snapshot_is_taken_once(self, monkeypatch):
+        """Test that later environment changes are not seen"""
+        env = EnvVariables(MagicMock(return_value=None))
+        monkeypatch.setenv("AIRFLOW_VAR_POSTGRES_HOST", "late")
+        
+        assert env.get("postgres_host") is None
+    
+    def test_load_variables_queries_only_env_misses(self, monkeypatch):
+        """Test that batched loads skip keys found in the environment"""
+        monkeypatch.setattr(Variable, "get", MagicMock(side_effect=lambda k, default_var=None: f"db-{k}"))
+        env = EnvVariables(Variable.get, environ={"AIRFLOW_VAR_POSTGRES_PORT": "6543"})
+        
+        values = load_variables(["postgres_host", "postgres_port"], env=env)
+        
+        assert values == {"postgres_host": "db-postgres_host", "postgres_port": "6543"}
+        Variable.get.assert_called_once_with("postgres_host", default_var=None)
+        assert env.stats() == {'env': 1, 'db': 1}
+
+
+class TestLazyModule:
+    """Test on-first-access variable resolution"""
+    
+    def test_convert_value(self):
+        """Test conversions match the generated eager lines"""
+        assert convert_value("5432", "int") == 5432
+        assert convert_value("True", "bool") is True
+        assert convert_value('{"a": 1}', "json") == {"a": 1}
+        assert convert_value("secret", "secret") == "secret"
+    
+    def test_resolves_once_and_memoizes(self, monkeypatch):
+        """Test that a variable is fetched on first access only"""
+        monkeypatch.setattr(Variable, "get", MagicMock(side_effect=lambda k, default_var=None: default_var))
+        namespace = {"__name__": "config"}
+        specs = {"SOURCE_POSTGRES_PORT": ("postgres_port", "5432", "int")}
+        module_getattr, module_dir = lazy_module(namespace, specs)
+        
+        assert Variable.get.call_count == 0
+        assert module_getattr("SOURCE_POSTGRES_PORT") == 5432
+        assert namespace["SOURCE_POSTGRES_PORT"] == 5432
+        assert Variable.get.call_count == 1
+        assert "SOURCE_POSTGRES_PORT" in module_dir()
+    
+    def test_unknown_attribute(self):
+        """Test that unknown names raise AttributeError"""
+        module_getattr, _ = lazy_module({"__name__": "config"}, {})
+        
+        with pytest.raises(AttributeError):
+            module_getattr("MISSING")
@@ -0,0 +1,126 @@
+"""
+Tests for validating configs against the template definitions
+"""
+import os
+from unittest.mock import patch
+
+import pytest
+from airflow_config import AirflowConfig, TemplateGenerator, load_configs, validate_configs
+from airflow_config.exceptions import ConfigFileError, TemplateNotFoundError, VariableTypeError
+from airflow_config.schema import ConfigSchema
+
+
+class TestTemplateValidator:
+    """Test the compiled per-template validators"""
+    
+    def test_compiled_once(self):
+        """Test that validators are cached per template type"""
+        schema = ConfigSchema()
+        
+        assert schema.validator("redis") is schema.validator("redis")
+        with pytest.raises(TemplateNotFoundError):
+            schema.validator("invalid")
+    
+    def test_errors(self):
+        """Test missing, type, range and empty-secret errors"""
+        validator = ConfigSchema(require_secrets=True).validator("redis")
+        variables = {"CACHE_REDIS_HOST": "redis", "CACHE_REDIS_PORT": 70000,
+                     "CACHE_REDIS_DB": True, "CACHE_REDIS_PASSWORD": ""}
+        
+        errors = {error.variable: error for error in validator.validate(variables, "cache")}
+        
+        assert errors["CACHE_REDIS_PORT"].code == "range"
+        assert errors["CACHE_REDIS_DB"].code == "type"
+        assert errors["CACHE_REDIS_PASSWORD"].code == "empty"
+        assert "CACHE_REDIS_HOST" not in errors
+        assert isinstance(errors["CACHE_REDIS_PORT"].exception(), VariableTypeError)
+        
+        del variables["CACHE_REDIS_HOST"]
+        assert validator.validate(variables, "cache")[0].code == "missing"
+
+
+class TestAirflowConfigValidate:
+    """Test AirflowConfig.validate"""
+    
+    def test_generated_config_is_valid(self, generated_config_file):
+        """Test that a freshly generated config passes"""
+        result = AirflowConfig(generated_config_file).validate()
+        
+        assert result.valid
+        assert result.sections == {"SOURCE": "postgresql", "DESTINATION": "bigquery"}
+    
+    def test_invalid_values(self, generated_config_file):
+        """Test that wrong values are reported and can be raised"""
+        config = AirflowConfig(generated_config_file)
+        config.variables["SOURCE_POSTGRES_PORT"] = "5432"
+        del config.variables["DESTINATION_BQ_PROJECT"]
+        
+        result = config.validate()
+        
+        assert [(error.variable, error.code) for error in result.errors] == [
+            ("SOURCE_POSTGRES_PORT", "type"),
+            ("DESTINATION_BQ_PROJECT", "missing"),
+        ]
+        with pytest.raises(VariableTypeError):
+            config.validate(raise_errors=True)
+    
+    def test_explicit_sections(self, temp_dir):
+        """Test that a config without sections is never reported valid"""
+        path = os.path.join(temp_dir, "config.json")
+        with open(path, "w") as f:
+            f.write('{"DAGS_DAG_OWNER": "airflow", "DAGS_DAG_RETRIES": -1, '
+                    '"DAGS_DAG_RETRY_DELAY_MINUTES": 5, "DAGS_DAG_CATCHUP": false}')
+        config = AirflowConfig(path)
+        
+        with pytest.raises(ConfigFileError):
+            config.validate()
+        result = config.validate({"dags": "dag_config"})
+        assert [error.variable for error in result.errors] == ["DAGS_DAG_RETRIES"]
+    
+    def test_frozen_json(self, temp_dir):
+        """Test that a JSON frozen config keeps its sections and is validated against them"""
+        path = os.path.join(temp_dir, "config.json")
+        TemplateGenerator().freeze_config({"s1": "postgresql"}, path, resolver=lambda keys: {})
+        with open(path) as f:
+            content = f.read()
+        with open(path, "w") as f:
+            f.write(content.replace('"S1_POSTGRES_PORT":5432', '"S1_POSTGRES_PORT":"abc"'))
+        
+        result = AirflowConfig(path).validate()
+        
+        assert result.sections == {"S1": "postgresql"}
+        assert [(error.variable, error.code) for error in result.errors] == [("S1_POSTGRES_PORT", "type")]
+    
+    @pytest.mark.parametrize("static", [False, True])
+    def test_sections_recorded_at_load(self, generated_config_file, static):
+        """Test that the sections come from the file as loaded, not as it is now"""
+        config = AirflowConfig(generated_config_file, static=static, snapshot=False)
+        TemplateGenerator().create_config({"cache": "redis"}, generated_config_file)
+        
+        with patch("builtins.open", side_effect=AssertionError("file re-read")):
+            result = config.validate()
+        
+        assert result.sections == {"SOURCE": "postgresql", "DESTINATION": "bigquery"}
+
+
+class TestValidateConfigs:
+    """Test batch validation"""
+    
+    def test_many_configs(self, temp_dir):
+        """Test validating many configs with per-config results and failures"""
+        generator = TemplateGenerator()
+        paths = []
+        for i in range(30):
+            path = os.path.join(temp_dir, f"pipeline_{i}.py")
+            generator.create_config({"source": "mongodb", "cache": "redis"}, path)
+            paths.append(path)
+        configs = list(load_configs(paths, static=True).configs.values())
+        configs[4].variables["CACHE_REDIS_PORT"] = 0
+        configs[9].sections = {}
+        
+        result = validate_configs(configs)
+        
+        assert len(result.results) == 29
+        assert list(result.invalid) == [paths[4]]
+        assert list(result.errors) == [paths[9]]
+        assert isinstance(result.errors[paths[9]], ConfigFileError)
@@ -0,0 +1,205 @@
+"""
+Tests for batched secret resolution
+"""
+import json
+import os
+import signal
+import threading
+import time
+
+import pytest
+from airflow_config.cache import VariableCache
+from airflow_config.exceptions import ConfigFileError, ConfigurationError
+from airflow_config.secrets import LocalFileSecretsBackend, SecretResolver, SecretsBackend, secret_resolver
+from airflow_config.utils import DatabaseTemplateStrategy, TemplateGenerator
+
+
+class RecordingBackend(SecretsBackend):
+    """Backend that records calls and peak concurrency"""
+    
+    def __init__(self, secrets, delay=0.02):
+        self.secrets = secrets
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def get_secret(self, key):
+        with self._lock:
+            self.calls.append(key)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if key == "broken":
+            raise RuntimeError("backend down")
+        return self.secrets.get(key)
+
+
+@pytest.fixture
+def secrets_file(temp_dir):
+    """Local secrets file"""
+    path = f"{temp_dir}/secrets.json"
+    with open(path, "w") as f:
+        json.dump({"postgres_password": "s3cr3t", "bq_private_key": "key"}, f)
+    return path
+
+
+@pytest.fixture
+def local_resolver(secrets_file):
+    """Process-wide resolver pointed at the local secrets file"""
+    previous = secret_resolver.backend
+    secret_resolver.configure(backend=LocalFileSecretsBackend(secrets_file))
+    yield secret_resolver
+    secret_resolver.configure(backend=previous)
+
+
+class TestLocalFileSecretsBackend:
+    """Test LocalFileSecretsBackend"""
+    
+    def test_reads_secrets(self, secrets_file):
+        """Test reading existing and missing secrets"""
+        backend = LocalFileSecretsBackend(secrets_file)
+        
+        assert backend.get_secret("postgres_password") == "s3cr3t"
+        assert backend.get_secret("unknown") is None
+    
+    def test_invalid_file(self, temp_dir):
+        """Test that unreadable files raise ConfigFileError"""
+        path = f"{temp_dir}/secrets.json"
+        with open(path, "w") as f:
+            f.write("[1, 2]")
+        
+        with pytest.raises(ConfigFileError):
+            LocalFileSecretsBackend(path).get_secret("key")
+        with pytest.raises(ConfigFileError):
+            LocalFileSecretsBackend(f"{temp_dir}/missing.json").get_secret("key")
+
+
+class TestSecretResolver:
+    """Test SecretResolver"""
+    
+    def test_concurrent_fetch_is_bounded(self):
+        """Test that keys are fetched in parallel without exceeding max_workers"""
+        backend = RecordingBackend({f"key{i}": str(i) for i in range(8)})
+        resolver = SecretResolver(backend, max_workers=3, ttl=60)
+        
+        values = resolver.resolve(f"key{i}" for i in range(10))
+        resolver.close()
+        
+        assert values == {f"key{i}": str(i) for i in range(8)}
+        assert 1 < backend.peak <= 3
+    
+    def test_cached_within_ttl(self):
+        """Test that resolved and missing secrets are cached"""
+        backend = RecordingBackend({"a": "1"}, delay=0)
+        resolver = SecretResolver(backend, ttl=60)
+        
+        resolver.resolve(["a", "missing"])
+        resolver.resolve(["a", "missing"])
+        
+        assert sorted(backend.calls) == ["a", "missing"]
+        assert resolver.stats()["hits"] == 2
+    
+    def test_ttl_expiry(self):
+        """Test that secrets are fetched again after the TTL"""
+        now = [0.0]
+        backend = RecordingBackend({"a": "1"}, delay=0)
+        resolver = SecretResolver(backend, cache=VariableCache(ttl=10, clock=lambda: now[0]))
+        
+        resolver.resolve(["a"])
+        now[0] = 11
+        resolver.resolve(["a"])
+        
+        assert backend.calls == ["a", "a"]
+    
+    def test_failures_are_not_cached(self):
+        """Test that a failing key is left out and retried"""
+        backend = RecordingBackend({"a": "1"}, delay=0)
+        resolver = SecretResolver(backend, ttl=60)
+        
+        assert resolver.resolve(["a", "broken"]) == {"a": "1"}
+        resolver.resolve(["a", "broken"])
+        resolver.close()
+        
+        assert backend.calls.count("broken") == 2
+        assert backend.calls.count("a") == 1
+    
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="fork not available")
+    def test_resolve_after_fork(self):
+        """Test that a forked child gets its own pool instead of the parent's dead threads"""
+        backend = RecordingBackend({f"key{i}": str(i) for i in range(8)})
+        resolver = SecretResolver(backend, max_workers=3, ttl=0)
+        resolver.resolve(["key0", "key1", "key2"])
+        time.sleep(0.05)  # every worker idle, so the child's submits would not start threads
+        
+        pid = os.fork()
+        if pid == 0:
+            ok = False
+            try:
+                ok = resolver.resolve(["key3", "key4"]) == {"key3": "3", "key4": "4"}
+            finally:
+                os._exit(0 if ok else 1)
+        
+        deadline = time.monotonic() + 10
+        while True:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            if time.monotonic() > deadline:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                pytest.fail("resolve() hung in the forked child")
+            time.sleep(0.01)
+        resolver.close()
+        
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    
+    def test_invalid_max_workers(self):
+        """Test that the pool needs at least one worker"""
+        with pytest.raises(ConfigurationError):
+            SecretResolver(RecordingBackend({}), max_workers=0)
+
+
+class TestSecretGeneration:
+    """Test configs generated with batch_secrets"""
+    
+    def test_secret_keys(self):
+        """Test that secret keys are split from the Variable keys"""
+        strategy = DatabaseTemplateStrategy(fetch_mode="batched", batch_secrets=True)
+        sections = {"source": "postgresql", "destination": "bigquery"}
+        
+        assert strategy.get_secret_keys(sections) == ["postgres_password", "bq_private_key"]
+        assert "postgres_password" not in strategy.get_variable_keys(sections)
+    
+    @pytest.mark.parametrize("fetch_mode", ["eager", "batched"])
+    def test_generated_config_resolves_secrets(self, tmp_path, local_resolver, fetch_mode):
+        """Test that secrets come from the resolver in one batch"""
+        config_file = tmp_path / "config.py"
+        TemplateGenerator(fetch_mode=fetch_mode, batch_secrets=True).create_config(
+            {"source": "postgresql", "destination": "bigquery"}, str(config_file)
+        )
+        
+        content = config_file.read_text()
+        assert content.count("secret_resolver.resolve(") == 1
+        assert 'SOURCE_POSTGRES_PASSWORD = _SECRETS.get("postgres_password", "airflow")' in content
+        
+        namespace = {}
+        exec(compile(content, str(config_file), "exec"), namespace)
+        assert namespace["SOURCE_POSTGRES_PASSWORD"] == "s3cr3t"
+        assert namespace["SOURCE_POSTGRES_HOST"] == "localhost"
+    
+    def test_lazy_config_resolves_secrets_together(self, tmp_path, local_resolver):
+        """Test that the first secret access resolves every secret of the module"""
+        config_file = tmp_path / "config.py"
+        TemplateGenerator(fetch_mode="lazy", batch_secrets=True).create_config(
+            {"source": "postgresql", "destination": "bigquery"}, str(config_file)
+        )
+        
+        namespace = {"__name__": "config"}
+        exec(compile(config_file.read_text(), str(config_file), "exec"), namespace)
+        
+        assert namespace["__getattr__"]("SOURCE_POSTGRES_PASSWORD") == "s3cr3t"
+        assert namespace["DESTINATION_BQ_PRIVATE_KEY"] == "key"
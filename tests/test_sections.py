@@ -0,0 +1,112 @@
+"""
+Tests for section splitting and incremental regeneration
+"""
+import os
+
+import pytest
+from airflow_config import AirflowConfig, TemplateGenerator
+from airflow_config.exceptions import ConfigFileError
+from airflow_config.sections import split_sections
+
+
+class TestSplitSections:
+    """Test split_sections"""
+    
+    def test_round_trip(self):
+        """Test that preamble and blocks join back into the content"""
+        content = TemplateGenerator()._generate_file_content({"source": "postgresql", "cache": "redis"})
+        
+        preamble, sections = split_sections(content)
+        
+        assert list(sections) == ["SOURCE", "CACHE"]
+        assert sections["CACHE"].template_type == "redis"
+        assert sections["CACHE"].text.startswith("\n# SECTION: CACHE (REDIS)\n")
+        assert preamble + "".join(s.text for s in sections.values()) == content
+    
+    def test_no_sections(self):
+        """Test content without markers"""
+        preamble, sections = split_sections('HOST = "localhost"\n')
+        
+        assert preamble == 'HOST = "localhost"\n'
+        assert not sections
+
+
+class TestIncrementalGeneration:
+    """Test TemplateGenerator.create_config(incremental=True)"""
+    
+    def test_identical_content_skips_write(self, tmp_path):
+        """Test that an unchanged config is not rewritten"""
+        generator = TemplateGenerator()
+        config_file = tmp_path / "config.py"
+        generator.create_config({"source": "postgresql"}, str(config_file))
+        os.utime(config_file, (1, 1))
+        
+        assert generator.create_config({"source": "postgresql"}, str(config_file), incremental=True) is False
+        assert os.stat(config_file).st_mtime == 1
+    
+    def test_updates_only_requested_sections(self, tmp_path):
+        """Test that other sections are kept verbatim"""
+        generator = TemplateGenerator()
+        config_file = tmp_path / "config.py"
+        generator.create_config({"source": "postgresql", "cache": "redis"}, str(config_file))
+        content = config_file.read_text().replace('default_var="redis"', 'default_var="redis.internal"')
+        config_file.write_text(content)
+        
+        assert generator.create_config({"source": "mongodb", "events": "kafka"}, str(config_file), incremental=True)
+        
+        sections = split_sections(config_file.read_text())[1]
+        assert list(sections) == ["SOURCE", "CACHE", "EVENTS"]
+        assert sections["SOURCE"].template_type == "mongodb"
+        assert 'default_var="redis.internal"' in sections["CACHE"].text
+    
+    def test_batched_header_tracks_all_sections(self, tmp_path):
+        """Test that the batched key list covers kept and new sections"""
+        generator = TemplateGenerator(fetch_mode="batched")
+        config_file = tmp_path / "config.py"
+        generator.create_config({"cache": "redis"}, str(config_file))
+        
+        generator.create_config({"events": "kafka"}, str(config_file), incremental=True)
+        
+        content = config_file.read_text()
+        assert content == generator._generate_file_content({"cache": "redis", "events": "kafka"})
+    
+    def test_mode_change_regenerates_file(self, tmp_path):
+        """Test that blocks from another fetch mode are regenerated, not dropped"""
+        config_file = tmp_path / "config.py"
+        TemplateGenerator().create_config({"cache": "redis"}, str(config_file))
+        
+        lazy = TemplateGenerator(fetch_mode="lazy")
+        lazy.create_config({"events": "kafka"}, str(config_file), incremental=True)
+        
+        assert list(split_sections(config_file.read_text())[1]) == ["CACHE", "EVENTS"]
+        assert config_file.read_text() == lazy._generate_file_content({"cache": "redis", "events": "kafka"})
+    
+    def test_flag_change_keeps_sections(self, tmp_path):
+        """Test that adding a section with other generation flags keeps the existing ones"""
+        config_file = tmp_path / "config.py"
+        TemplateGenerator().create_config({"source": "postgresql", "destination": "bigquery"}, str(config_file))
+        
+        TemplateGenerator(use_cache=True).create_config({"cache": "redis"}, str(config_file), incremental=True)
+        
+        assert list(split_sections(config_file.read_text())[1]) == ["SOURCE", "DESTINATION", "CACHE"]
+    
+    def test_unknown_sections_raise(self, tmp_path):
+        """Test that sections that cannot be regenerated are never dropped"""
+        config_file = tmp_path / "config.py"
+        config_file.write_text('"""Hand-written"""\n\nHOST = "localhost"\n')
+        
+        with pytest.raises(ConfigFileError):
+            TemplateGenerator().create_config({"cache": "redis"}, str(config_file), incremental=True)
+        
+        config_file.write_text('\n# SECTION: LEGACY (ORACLE)\nLEGACY_HOST = "x"\n')
+        with pytest.raises(ConfigFileError):
+            TemplateGenerator().create_config({"cache": "redis"}, str(config_file), incremental=True)
+        assert "LEGACY_HOST" in config_file.read_text()
+    
+    def test_airflow_config_incremental(self, generated_config_file):
+        """Test incremental updates through AirflowConfig"""
+        config = AirflowConfig(generated_config_file)
+        config.create_data_pipeline({"cache": "redis"}, incremental=True)
+        
+        assert config.validate_section("cache")
+        assert AirflowConfig(generated_config_file).validate_section("source")
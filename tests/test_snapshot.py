@@ -0,0 +1,134 @@
+"""
+Tests for on-disk config snapshots
+"""
+import os
+import pickle
+from unittest.mock import patch
+
+from airflow_config import AirflowConfig, load_configs
+from airflow_config.snapshot import ConfigSnapshotCache, snapshot_cache
+from airflow_config.static import parse_config_source
+
+
+def write_config(path, content):
+    """Write a plain config file"""
+    with open(path, "w") as f:
+        f.write(content)
+
+
+class Exploit:
+    """Pickle payload that records whether it was unpickled"""
+    
+    ran = False
+    
+    def __reduce__(self):
+        return setattr, (Exploit, "ran", True)
+
+
+class TestConfigSnapshotCache:
+    """Test ConfigSnapshotCache"""
+    
+    def test_store_and_load(self, temp_dir):
+        """Test that a snapshot is reused while the file is unchanged"""
+        config_path = os.path.join(temp_dir, "config.py")
+        write_config(config_path, 'HOST = "localhost"\n')
+        
+        ConfigSnapshotCache().store(config_path, "static", {"HOST": "localhost"}, {"DB": "postgresql"})
+        
+        # A fresh cache has no in-memory copy and must read the sidecar file
+        assert ConfigSnapshotCache().load(config_path, "static") == {"HOST": "localhost"}
+        assert ConfigSnapshotCache().load_with_sections(config_path, "static")[1] == {"DB": "postgresql"}
+        assert ConfigSnapshotCache().load(config_path, "exec") is None
+    
+    def test_invalidated_on_change(self, temp_dir):
+        """Test that changing the content invalidates the snapshot"""
+        config_path = os.path.join(temp_dir, "config.py")
+        write_config(config_path, 'HOST = "localhost"\n')
+        cache = ConfigSnapshotCache()
+        cache.store(config_path, "static", {"HOST": "localhost"})
+        
+        write_config(config_path, 'HOST = "otherhost"\n')
+        
+        assert cache.load(config_path, "static") is None
+    
+    def test_unserializable_values_are_skipped(self, temp_dir):
+        """Test that non-literal variables do not break storing"""
+        config_path = os.path.join(temp_dir, "config.py")
+        write_config(config_path, "")
+        cache = ConfigSnapshotCache(snapshot_dir=os.path.join(temp_dir, "snapshots"))
+        
+        assert cache.store(config_path, "exec", {"FUNC": lambda: None}) is False
+        assert not os.path.exists(cache.snapshot_path(config_path, "exec"))
+    
+    def test_loads_do_not_share_values(self, temp_dir):
+        """Test that mutable values are rebuilt for every load"""
+        config_path = os.path.join(temp_dir, "config.py")
+        write_config(config_path, 'EXTRA = {"hosts": ["a"]}\n')
+        cache = ConfigSnapshotCache()
+        cache.store(config_path, "static", {"EXTRA": {"hosts": ["a"]}})
+        
+        cache.load(config_path, "static")["EXTRA"]["hosts"].append("b")
+        
+        assert cache.load(config_path, "static") == {"EXTRA": {"hosts": ["a"]}}
+    
+    def test_untrusted_files_are_ignored(self, temp_dir):
+        """Test that pickles and files others can write are never loaded"""
+        config_path = os.path.join(temp_dir, "config.py")
+        write_config(config_path, 'HOST = "localhost"\n')
+        cache = ConfigSnapshotCache()
+        cache.store(config_path, "static", {"HOST": "localhost"})
+        snapshot_path = cache.snapshot_path(config_path, "static")
+        
+        os.chmod(snapshot_path, 0o666)
+        assert ConfigSnapshotCache().load(config_path, "static") is None
+        
+        with open(snapshot_path, "wb") as f:
+            f.write(pickle.dumps(Exploit()))
+        os.chmod(snapshot_path, 0o600)
+        assert ConfigSnapshotCache().load(config_path, "static") is None
+        assert not Exploit.ran
+
+
+class TestAirflowConfigSnapshots:
+    """Test snapshot use in AirflowConfig"""
+    
+    def test_static_load_skips_parsing(self, generated_config_file):
+        """Test that a second static load is served from the snapshot"""
+        snapshot_cache.invalidate()
+        first = AirflowConfig(generated_config_file, static=True)
+        
+        with patch("airflow_config.core.parse_config_source") as parse:
+            second = AirflowConfig(generated_config_file, static=True)
+        
+        parse.assert_not_called()
+        assert second.variables == first.variables
+    
+    def test_stored_under_parsed_content(self, temp_dir):
+        """Test that a file replaced between parse and store does not get the old values"""
+        config_path = os.path.join(temp_dir, "config.py")
+        write_config(config_path, 'HOST = "v1"\n')
+        
+        def parse_then_replace(source, filename):
+            specs = parse_config_source(source, filename)
+            write_config(config_path, 'HOST = "v2"\n')
+            return specs
+        
+        with patch("airflow_config.core.parse_config_source", side_effect=parse_then_replace):
+            assert AirflowConfig(config_path, static=True).get_variable("HOST") == "v1"
+        with patch("airflow_config.bulk.parse_config_source", side_effect=parse_then_replace):
+            write_config(config_path, 'HOST = "v1"\n')
+            os.remove(snapshot_cache.snapshot_path(config_path, "static"))
+            snapshot_cache.invalidate()
+            load_configs([config_path], static=True, use_processes=False)
+        snapshot_cache.invalidate()
+        
+        assert AirflowConfig(config_path, static=True).get_variable("HOST") == "v2"
+        assert load_configs([config_path], static=True).configs[config_path].get_variable("HOST") == "v2"
+    
+    def test_snapshot_can_be_disabled(self, generated_config_file):
+        """Test the flag that disables snapshots"""
+        with patch("airflow_config.core.parse_config_source", return_value={}) as parse:
+            AirflowConfig(generated_config_file, static=True, snapshot=False)
+            AirflowConfig(generated_config_file, static=True, snapshot=False)
+        
+        assert parse.call_count == 2
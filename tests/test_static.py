@@ -0,0 +1,77 @@
+"""
+Tests for static (AST-based) config parsing
+"""
+import os
+import sys
+
+import pytest
+from airflow_config import AirflowConfig, TemplateGenerator
+from airflow_config.exceptions import ConfigFileError
+from airflow_config.static import VariableSpec, parse_config_source
+
+
+class TestParseConfigSource:
+    """Test parse_config_source"""
+    
+    def test_converters(self):
+        """Test that generated converters are recognized"""
+        specs = parse_config_source('''
+import json
+from airflow.models import Variable
+HOST = Variable.get("host", default_var="localhost")
+PORT = int(Variable.get("port", default_var="5432"))
+RATIO = float(_VARIABLES.get("ratio", "0.5"))
+CATCHUP = Variable.get("catchup", default_var="False").lower() == "true"
+EXTRA = json.loads(Variable.get("extra", default_var='{"a": 1}'))
+TIMEOUT = 30
+_PRIVATE = 1
+lower_case = 2
+COMPUTED = os.environ["HOME"]
+''')
+        
+        assert list(specs) == ["HOST", "PORT", "RATIO", "CATCHUP", "EXTRA", "TIMEOUT"]
+        assert specs["PORT"] == VariableSpec("PORT", "port", "5432", "int")
+        assert specs["PORT"].value == 5432
+        assert specs["RATIO"].value == 0.5
+        assert specs["CATCHUP"].value is False
+        assert specs["EXTRA"].value == {"a": 1}
+        assert specs["TIMEOUT"] == VariableSpec("TIMEOUT", None, 30)
+    
+    def test_lazy_registrations(self):
+        """Test that lazy _VARIABLE_SPECS registrations are recognized"""
+        specs = parse_config_source('_VARIABLE_SPECS["DB_PORT"] = ("db_port", "5432", "int")\n')
+        
+        assert specs["DB_PORT"].key == "db_port"
+        assert specs["DB_PORT"].value == 5432
+    
+    def test_syntax_error(self):
+        """Test that invalid files raise ConfigFileError"""
+        with pytest.raises(ConfigFileError):
+            parse_config_source("HOST = (")
+
+
+class TestStaticAirflowConfig:
+    """Test AirflowConfig(static=True)"""
+    
+    @pytest.mark.parametrize("fetch_mode", ["eager", "batched", "lazy"])
+    def test_matches_executed_config(self, temp_dir, fetch_mode):
+        """Test that static loading sees the same defaults as executing the file"""
+        config_path = os.path.join(temp_dir, "config.py")
+        AirflowConfig(config_path, TemplateGenerator(fetch_mode=fetch_mode)).create_etl_pipeline("postgresql", "bigquery")
+        
+        static_config = AirflowConfig(config_path, static=True)
+        
+        assert static_config.variables == AirflowConfig(config_path).variables
+        assert static_config.get_connection_params("source")["postgres_port"] == 5432
+    
+    def test_does_not_execute_module(self, temp_dir):
+        """Test that nothing is imported or executed"""
+        config_path = os.path.join(temp_dir, "config.py")
+        with open(config_path, "w") as f:
+            f.write('raise RuntimeError("executed")\nHOST = "localhost"\n')
+        sys.modules.pop("airflow_config_module", None)
+        
+        config = AirflowConfig(config_path, static=True)
+        
+        assert config.variables == {"HOST": "localhost"}
+        assert "airflow_config_module" not in sys.modules
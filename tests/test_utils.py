@@ -167,3 +167,148 @@ class TestTemplateGenerator:
         assert "import os" in header
         assert "import logging" in header
         assert "from airflow.models import Variable" in header
+    
+    def test_preamble_imports_only_what_is_used(self):
+        """Test that generated files import only what their variables need"""
+        preamble = TemplateGenerator()._generate_preamble({"source": "postgresql"})
+        
+        assert "from airflow.models import Variable" in preamble
+        assert "import os" not in preamble
+        assert "import json" not in preamble
+        assert "logger" not in preamble
+        
+        cached = TemplateGenerator(use_cache=True)._generate_preamble({"source": "postgresql"})
+        assert "from airflow.models import Variable" not in cached
+    
+    def test_preamble_imports_json_for_json_variables(self):
+        """Test that json is imported when a json-typed variable is rendered"""
+        class JsonStrategy(DatabaseTemplateStrategy):
+            TEMPLATES = {"json_tpl": {"OPTIONS": ("options", "{}", "json")}}
+        
+        generator = TemplateGenerator(JsonStrategy())
+        preamble = generator._generate_preamble({"source": "json_tpl"})
+        
+        assert "import json\n" in preamble
+        assert "from airflow.models import Variable" in preamble
+        assert "import json" not in TemplateGenerator(JsonStrategy(fetch_mode="lazy"))._generate_preamble(
+            {"source": "json_tpl"})
+
+
+class TestFetchModes:
+    """Test generation modes for variable fetching"""
+    
+    def test_invalid_fetch_mode(self):
+        """Test that unknown fetch modes are rejected"""
+        with pytest.raises(ConfigurationError):
+            DatabaseTemplateStrategy(fetch_mode="invalid")
+    
+    def test_batched_variable_reads_from_loader(self):
+        """Test that batched variables read from the in-memory dict"""
+        strategy = DatabaseTemplateStrategy(fetch_mode="batched")
+        
+        var_int = strategy._generate_variable("TEST_PORT", ("test_port", "5432", "int"))
+        assert var_int == 'TEST_PORT = int(_VARIABLES.get("test_port", "5432"))'
+        assert "Variable.get" not in strategy.generate_section("source", "postgresql")
+    
+    def test_get_variable_keys(self):
+        """Test collecting the keys needed by a set of sections"""
+        strategy = DatabaseTemplateStrategy()
+        keys = strategy.get_variable_keys({"source": "postgresql", "destination": "postgresql"})
+        
+        assert keys.count("postgres_host") == 1
+        assert len(keys) == len(DatabaseTemplateStrategy.TEMPLATES["postgresql"])
+    
+    def test_create_config_batched(self, tmp_path):
+        """Test that a batched config loads all keys once and is importable"""
+        generator = TemplateGenerator(fetch_mode="batched")
+        config_file = tmp_path / "batched_config.py"
+        
+        generator.create_config({"source": "postgresql", "cache": "redis"}, str(config_file))
+        
+        content = config_file.read_text()
+        assert content.count("load_variables(") == 1
+        assert '"redis_port",' in content
+        
+        namespace = {}
+        exec(compile(content, str(config_file), "exec"), namespace)
+        assert namespace["SOURCE_POSTGRES_HOST"] == "localhost"
+        assert namespace["CACHE_REDIS_PORT"] == 6379
+    
+    def test_create_config_lazy(self, tmp_path):
+        """Test that a lazy config registers variables instead of fetching them"""
+        generator = TemplateGenerator(fetch_mode="lazy")
+        config_file = tmp_path / "lazy_config.py"
+        
+        generator.create_config({"source": "postgresql"}, str(config_file))
+        
+        content = config_file.read_text()
+        assert "__getattr__, __dir__ = lazy_module(" in content
+        assert '_VARIABLE_SPECS["SOURCE_POSTGRES_PORT"] = ("postgres_port", "5432", "int")' in content
+        assert "# SECTION: SOURCE (POSTGRESQL)" in content
+    
+    def test_lazy_config_star_import(self, tmp_path, monkeypatch):
+        """Test that a star import of a lazy config brings in every variable, as in eager mode"""
+        generator = TemplateGenerator(fetch_mode="lazy")
+        generator.create_config({"source": "postgresql", "cache": "redis"}, str(tmp_path / "lazy_star_config.py"))
+        monkeypatch.syspath_prepend(str(tmp_path))
+        
+        namespace = {}
+        exec("from lazy_star_config import *", namespace)
+        
+        names = [name for name in namespace if name.isupper()]
+        assert "SOURCE_POSTGRES_HOST" in names and "CACHE_REDIS_PORT" in names
+        assert namespace["CACHE_REDIS_PORT"] == 6379
+        assert len(names) == len(generator._strategy.get_variable_keys({"source": "postgresql", "cache": "redis"}))
+
+    @pytest.mark.parametrize("fetch_mode", ["eager", "batched", "lazy"])
+    def test_create_config_env_first(self, tmp_path, monkeypatch, fetch_mode):
+        """Test that env_first configs read AIRFLOW_VAR_* before the DB and report it"""
+        monkeypatch.setenv("AIRFLOW_VAR_POSTGRES_HOST", "db.env")
+        generator = TemplateGenerator(fetch_mode=fetch_mode, env_first=True)
+        config_file = tmp_path / "env_config.py"
+        
+        generator.create_config({"source": "postgresql"}, str(config_file))
+        
+        namespace = {"__name__": "env_config"}
+        exec(compile(config_file.read_text(), str(config_file), "exec"), namespace)
+        if fetch_mode == "lazy":
+            namespace["__getattr__"]("SOURCE_POSTGRES_HOST")
+            namespace["__getattr__"]("SOURCE_POSTGRES_PORT")
+        
+        assert namespace["SOURCE_POSTGRES_HOST"] == "db.env"
+        assert namespace["SOURCE_POSTGRES_PORT"] == 5432
+        stats = namespace["get_lookup_stats"]()
+        assert stats["env"] == 1
+        assert stats["db"] >= 1
+
+
+class TestCompiledTemplates:
+    """Test precompiled template tables"""
+    
+    def test_compile_template_is_cached(self):
+        """Test that each template is compiled once per strategy"""
+        strategy = DatabaseTemplateStrategy()
+        compiled = strategy.compile_template("postgresql")
+        
+        assert strategy.compile_template("postgresql") is compiled
+        assert compiled.keys[0] == "postgres_host"
+        port = next(v for v in compiled.variables if v.suffix == "POSTGRES_PORT")
+        assert (port.var_type, port.converter) == ("int", "int")
+    
+    def test_compile_invalid_template(self):
+        """Test compiling an unknown template"""
+        with pytest.raises(TemplateNotFoundError):
+            DatabaseTemplateStrategy().compile_template("invalid_template")
+    
+    @pytest.mark.parametrize("fetch_mode", ["eager", "batched", "lazy"])
+    def test_generate_section_matches_per_variable_rendering(self, fetch_mode):
+        """Test that compiled sections render the same lines as _generate_variable"""
+        strategy = DatabaseTemplateStrategy(fetch_mode=fetch_mode)
+        
+        for template_type, template in strategy.TEMPLATES.items():
+            expected = [f"\n# SECTION: SOURCE ({template_type.upper()})\n"]
+            expected.extend(
+                strategy._generate_variable(f"SOURCE_{name}", var_config)
+                for name, var_config in template.items()
+            )
+            assert strategy.generate_section("source", template_type) == "\n".join(expected)
@@ -0,0 +1,151 @@
+"""
+Tests for watching and hot-reloading configuration files
+"""
+import os
+import threading
+
+import pytest
+from airflow.models import Variable
+from airflow_config import AirflowConfig, TemplateGenerator
+from airflow_config.watch import ConfigWatcher, inotify_available
+
+from .conftest import rewrite
+
+
+@pytest.fixture
+def config_file(temp_dir):
+    """Generated config with a source and a destination section"""
+    path = os.path.join(temp_dir, "config.py")
+    TemplateGenerator().create_config({"source": "postgresql", "destination": "bigquery"}, path)
+    return path
+
+
+class TestConfigWatcherCheck:
+    """Test ConfigWatcher.check"""
+    
+    @pytest.mark.parametrize("static", [False, True])
+    def test_reloads_only_changed_section(self, config_file, static):
+        """Test that unchanged sections keep their values and only changed keys are reported"""
+        config = AirflowConfig(config_file, static=static, snapshot=False)
+        watcher = ConfigWatcher(config)
+        before = config.variables
+        
+        TemplateGenerator().create_config({"destination": "redis"}, config_file, incremental=True)
+        change = watcher.check()
+        
+        assert change.sections == ["DESTINATION"]
+        assert not change.full_reload
+        assert "DESTINATION_REDIS_HOST" in change.added
+        assert "DESTINATION_BQ_PROJECT" in change.removed
+        assert not any(key.startswith("SOURCE_") for key in change.keys)
+        assert config.variables is not before
+        assert "DESTINATION_BQ_PROJECT" in before
+        assert config.get_variable("SOURCE_POSTGRES_PORT") == 5432
+        assert config.variables.has_prefix("DESTINATION_REDIS_")
+        assert watcher.check() is None
+    
+    def test_executes_only_changed_section(self, config_file):
+        """Test that an exec reload fetches only the keys of the changed section"""
+        config = AirflowConfig(config_file, snapshot=False)
+        watcher = ConfigWatcher(config)
+        rewrite(config_file, '"postgres_host", default_var="localhost"', '"postgres_host", default_var="db.internal"')
+        Variable.get.reset_mock()
+        
+        change = watcher.check()
+        
+        assert change.modified == ["SOURCE_POSTGRES_HOST"]
+        assert change.added == change.removed == []
+        fetched = {call.args[0] for call in Variable.get.call_args_list}
+        assert "postgres_host" in fetched
+        assert "bq_project" not in fetched
+        assert config.get_variable("SOURCE_POSTGRES_HOST") == "db.internal"
+    
+    def test_removes_computed_variable(self, config_file):
+        """Test that deleting a variable the static parser cannot evaluate removes it"""
+        rewrite(config_file, "\n# SECTION: DESTINATION", 'SOURCE_EXTRA = str(len("ab"))\n\n# SECTION: DESTINATION')
+        config = AirflowConfig(config_file, snapshot=False)
+        watcher = ConfigWatcher(config)
+        assert config.get_variable("SOURCE_EXTRA") == "2"
+        
+        rewrite(config_file, 'SOURCE_EXTRA = str(len("ab"))\n', "")
+        change = watcher.check()
+        
+        assert change.full_reload
+        assert change.removed == ["SOURCE_EXTRA"]
+        assert not config.variable_exists("SOURCE_EXTRA")
+        assert config.variables == AirflowConfig(config_file, snapshot=False).variables
+    
+    def test_preamble_change_reloads_everything(self, config_file):
+        """Test that regenerating with another fetch mode is a full reload"""
+        config = AirflowConfig(config_file, snapshot=False)
+        watcher = ConfigWatcher(config)
+        variables = dict(config.variables)
+        
+        TemplateGenerator(fetch_mode="batched").create_config(
+            {"source": "postgresql", "destination": "bigquery"}, config_file)
+        change = watcher.check()
+        
+        assert change.full_reload
+        assert change.keys == []
+        assert config.variables == variables
+    
+    def test_callbacks(self, config_file):
+        """Test that callbacks get the change and failing callbacks do not stop the others"""
+        config = AirflowConfig(config_file, static=True)
+        received = []
+        watcher = config.watch(lambda change: 1 / 0, start=False)
+        watcher.add_callback(received.append)
+        
+        rewrite(config_file, 'default_var="5432"', 'default_var="6543"')
+        change = watcher.check()
+        
+        assert received == [change]
+        assert change.keys == ["SOURCE_POSTGRES_PORT"]
+    
+    def test_invalid_file_keeps_values(self, config_file):
+        """Test that a broken file leaves the previous variables in place"""
+        config = AirflowConfig(config_file, static=True)
+        watcher = ConfigWatcher(config)
+        variables = config.variables
+        
+        rewrite(config_file, "SOURCE_POSTGRES_PORT = ", "SOURCE_POSTGRES_PORT = = ")
+        
+        assert watcher.check() is None
+        assert config.variables is variables
+    
+    def test_frozen_json(self, temp_dir):
+        """Test reloading a JSON frozen config"""
+        path = os.path.join(temp_dir, "config.json")
+        with open(path, "w") as f:
+            f.write('{"SOURCE_HOST": "a", "SOURCE_PORT": 1}')
+        config = AirflowConfig(path)
+        watcher = ConfigWatcher(config)
+        
+        with open(path, "w") as f:
+            f.write('{"SOURCE_HOST": "b", "SOURCE_PORT": 1}')
+        change = watcher.check()
+        
+        assert change.full_reload
+        assert change.modified == ["SOURCE_HOST"]
+        assert config.get_variable("SOURCE_HOST") == "b"
+
+
+class TestConfigWatcherThread:
+    """Test the background watch thread"""
+    
+    @pytest.mark.parametrize("use_inotify", [
+        False,
+        pytest.param(True, marks=pytest.mark.skipif(not inotify_available(), reason="inotify not available")),
+    ])
+    def test_notices_regenerated_file(self, config_file, use_inotify):
+        """Test that regenerating the file fires the callback"""
+        config = AirflowConfig(config_file, static=True)
+        changed = threading.Event()
+        
+        with config.watch(lambda change: changed.set(), interval=0.05, use_inotify=use_inotify) as watcher:
+            assert watcher.running
+            TemplateGenerator().create_config({"destination": "kafka"}, config_file, incremental=True)
+            assert changed.wait(10)
+        
+        assert not watcher.running
+        assert config.variables.has_prefix("DESTINATION_KAFKA_")
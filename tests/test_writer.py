@@ -0,0 +1,144 @@
+"""
+Tests for streaming, atomic config writes
+"""
+import os
+import stat
+import threading
+
+import pytest
+from airflow_config.exceptions import FileWriteError
+from airflow_config.generator import AirflowConfigGeneratorMixin
+from airflow_config.sections import split_sections
+from airflow_config.utils import TemplateGenerator
+from airflow_config.writer import file_lock, write_chunks
+
+
+class TestWriteChunks:
+    """Test write_chunks"""
+    
+    def test_streams_iterable(self, tmp_path):
+        """Test writing a generator of chunks"""
+        output = tmp_path / "config.py"
+        
+        written = write_chunks(str(output), (f"VAR_{i} = {i}\n" for i in range(3)))
+        
+        assert output.read_text() == "VAR_0 = 0\nVAR_1 = 1\nVAR_2 = 2\n"
+        assert written == len(output.read_text())
+    
+    def test_failure_keeps_previous_file(self, tmp_path):
+        """Test that a failing producer leaves the old file and no temp file"""
+        output = tmp_path / "config.py"
+        output.write_text("OLD = 1\n")
+        
+        def chunks():
+            yield "NEW = 1\n"
+            raise RuntimeError("generation failed")
+        
+        with pytest.raises(RuntimeError):
+            write_chunks(str(output), chunks())
+        
+        assert output.read_text() == "OLD = 1\n"
+        assert os.listdir(tmp_path) == ["config.py"]
+    
+    def test_keeps_permissions(self, tmp_path):
+        """Test that replacing a file keeps its mode"""
+        output = tmp_path / "config.py"
+        output.write_text("OLD = 1\n")
+        os.chmod(output, 0o640)
+        
+        write_chunks(str(output), "NEW = 1\n")
+        
+        assert stat.S_IMODE(os.stat(output).st_mode) == 0o640
+
+
+class TestStreamingGeneration:
+    """Test chunked generation in TemplateGenerator and the generator mixin"""
+    
+    def test_iter_file_content_yields_sections(self):
+        """Test that content is produced one section per chunk"""
+        generator = TemplateGenerator()
+        sections = {"source": "postgresql", "cache": "redis"}
+        
+        chunks = list(generator._iter_file_content(sections))
+        
+        assert len(chunks) == 3
+        assert chunks[2].startswith("\n# SECTION: CACHE (REDIS)")
+        assert "".join(chunks) == generator._generate_file_content(sections)
+    
+    def test_mixin_save(self, tmp_path):
+        """Test that save streams variables grouped by section"""
+        class Config(AirflowConfigGeneratorMixin):
+            _default_sections = {'airflow_db': 'Database'}
+            
+            def __init__(self, config_file):
+                self.config_file = config_file
+                self.variables = {'AIRFLOW_DB_HOST': 'db', '__DOC_AIRFLOW_DB_HOST': 'Database host', 'EXTRA': [1, 2]}
+        
+        output = tmp_path / "saved.py"
+        Config(str(output)).save()
+        
+        content = output.read_text()
+        assert "# Database\n#====" in content
+        assert "# Database host\nAIRFLOW_DB_HOST = 'db'\n" in content
+        assert "EXTRA = [1, 2]\n" in content
+        assert content.endswith("        return default\n")
+
+
+class TestConcurrentWrites:
+    """Test locking and atomic replacement under concurrency"""
+    
+    def test_lock_timeout(self, tmp_path):
+        """Test that a held lock makes other writers wait and time out"""
+        output = str(tmp_path / "config.py")
+        
+        with file_lock(output):
+            with pytest.raises(FileWriteError):
+                with file_lock(output, timeout=0.1):
+                    pass
+        
+        with file_lock(output, timeout=0.1):
+            pass
+    
+    def test_parallel_incremental_updates_are_not_lost(self, tmp_path):
+        """Test that concurrent generators adding sections keep every section"""
+        output = str(tmp_path / "config.py")
+        TemplateGenerator().create_config({"base": "dag_config"}, output)
+        templates = ["postgresql", "redis", "kafka", "mongodb", "sqlserver", "trino", "bigquery", "api_keys"]
+        errors = []
+        
+        def add_section(i, template):
+            try:
+                TemplateGenerator().create_config({f"pipeline{i}": template}, output, incremental=True)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+        
+        threads = [threading.Thread(target=add_section, args=(i, t)) for i, t in enumerate(templates)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        sections = split_sections(open(output).read())[1]
+        assert len(sections) == len(templates) + 1
+    
+    def test_readers_never_see_partial_files(self, tmp_path):
+        """Test that a file being rewritten is always complete for readers"""
+        output = str(tmp_path / "config.py")
+        generator = TemplateGenerator()
+        sections = {f"section{i}": "postgresql" for i in range(50)}
+        generator.create_config(sections, output)
+        expected = open(output).read()
+        done = threading.Event()
+        
+        def rewrite():
+            for _ in range(20):
+                generator.create_config(sections, output)
+            done.set()
+        
+        writer = threading.Thread(target=rewrite)
+        writer.start()
+        while not done.is_set():
+            with open(output) as f:
+                assert f.read() == expected
+        writer.join()